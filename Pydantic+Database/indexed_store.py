@@ -0,0 +1,162 @@
+"""
+Indexed In-Memory Store
+Drop-in replacement for the bare ``Dict[int, Model]`` databases used by the
+restaurant APIs.
+
+Features:
+- Secondary index per category value
+- Secondary index per boolean flag (e.g. is_active, is_available)
+- Sorted indexes for numeric fields (e.g. price, rating) with range queries
+- Incrementally maintained aggregates (counts, sum/avg/min/max, category breakdown)
+- Sorted IDs for keyset pagination
+
+Every index is updated on insert, update and delete, so filter and summary
+endpoints run in O(result) instead of scanning the whole collection.
+Stored models must be replaced rather than mutated in place, otherwise the
+indexes cannot find the old values to remove.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import MutableMapping
+from itertools import islice
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+class IndexedStore(MutableMapping):
+    """Dict-like store of models keyed by ID with secondary indexes and aggregates"""
+
+    def __init__(self, category_field: str, flag_fields: Sequence[str] = (),
+                 sorted_fields: Sequence[str] = ()):
+        self.category_field = category_field
+        self._items: Dict[int, Any] = {}
+        self._keys: List[int] = []  # IDs in ascending order
+        # Dicts are used as insertion-ordered sets of IDs
+        self._by_category: Dict[Any, Dict[int, None]] = {}
+        self._by_flag: Dict[str, Dict[int, None]] = {field: {} for field in flag_fields}
+        self._sorted: Dict[str, List[Tuple[Any, int]]] = {field: [] for field in sorted_fields}
+        self._sums: Dict[str, Decimal] = {field: Decimal("0") for field in sorted_fields}
+
+    # ===== MAPPING PROTOCOL =====
+
+    def __getitem__(self, key: int) -> Any:
+        return self._items[key]
+
+    def __setitem__(self, key: int, value: Any):
+        old_value = self._items.get(key)
+        if old_value is not None:
+            self._unindex(key, old_value)
+        elif not self._keys or key > self._keys[-1]:
+            self._keys.append(key)
+        else:
+            insort(self._keys, key)
+        self._items[key] = value
+        self._index(key, value)
+
+    def __delitem__(self, key: int):
+        value = self._items.pop(key)
+        del self._keys[bisect_left(self._keys, key)]
+        self._unindex(key, value)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __reversed__(self) -> Iterator[int]:
+        return reversed(self._items)
+
+    # ===== INDEX MAINTENANCE =====
+
+    def _index(self, key: int, value: Any):
+        category = getattr(value, self.category_field)
+        self._by_category.setdefault(category, {})[key] = None
+
+        for field, members in self._by_flag.items():
+            if getattr(value, field):
+                members[key] = None
+
+        for field, entries in self._sorted.items():
+            field_value = getattr(value, field)
+            if field_value is not None:
+                insort(entries, (field_value, key))
+                self._sums[field] += Decimal(str(field_value))
+
+    def _unindex(self, key: int, value: Any):
+        category = getattr(value, self.category_field)
+        members = self._by_category[category]
+        del members[key]
+        if not members:
+            del self._by_category[category]
+
+        for members in self._by_flag.values():
+            members.pop(key, None)
+
+        for field, entries in self._sorted.items():
+            field_value = getattr(value, field)
+            if field_value is not None:
+                del entries[bisect_left(entries, (field_value, key))]
+                self._sums[field] -= Decimal(str(field_value))
+
+    def _resolve(self, ids) -> List[Any]:
+        """Return models for the given IDs in ID order, matching a full scan"""
+        return [self._items[key] for key in sorted(ids)]
+
+    # ===== QUERIES =====
+
+    def filter_by_category(self, category: Any) -> List[Any]:
+        """All models in a category"""
+        return self._resolve(self._by_category.get(category, ()))
+
+    def filter_by_flag(self, field: str) -> List[Any]:
+        """All models whose boolean ``field`` is true"""
+        return self._resolve(self._by_flag[field])
+
+    def sorted_by(self, field: str, descending: bool = False,
+                  limit: Optional[int] = None) -> List[Any]:
+        """Models ordered by a sorted field, skipping those where it is None"""
+        entries = self._sorted[field]
+        if descending:
+            entries = reversed(entries)
+        # islice stops after `limit` entries, so top-N queries stay O(limit)
+        return [self._items[key] for _, key in islice(entries, limit)]
+
+    def keys_after(self, after_id: int, limit: int) -> List[int]:
+        """Up to ``limit`` IDs greater than ``after_id``, ascending, in O(log N + limit)"""
+        start = bisect_right(self._keys, after_id)
+        return self._keys[start:start + limit]
+
+    def range_by(self, field: str, low: Any = None, high: Any = None) -> List[Any]:
+        """Models with ``low <= field <= high`` in ascending field order"""
+        entries = self._sorted[field]
+        start = 0 if low is None else bisect_left(entries, (low,))
+        end = len(entries) if high is None else bisect_right(entries, (high, float("inf")))
+        return [self._items[key] for _, key in entries[start:end]]
+
+    # ===== AGGREGATES =====
+
+    def count_by_flag(self, field: str) -> int:
+        return len(self._by_flag[field])
+
+    def category_counts(self) -> Dict[str, int]:
+        """Number of models per category, keyed by the category value"""
+        return {
+            getattr(category, "value", category): len(members)
+            for category, members in self._by_category.items()
+        }
+
+    def count_non_null(self, field: str) -> int:
+        return len(self._sorted[field])
+
+    def minimum(self, field: str) -> Optional[Any]:
+        entries = self._sorted[field]
+        return entries[0][0] if entries else None
+
+    def maximum(self, field: str) -> Optional[Any]:
+        entries = self._sorted[field]
+        return entries[-1][0] if entries else None
+
+    def average(self, field: str) -> Optional[Decimal]:
+        count = len(self._sorted[field])
+        return self._sums[field] / count if count else None
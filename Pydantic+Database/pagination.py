@@ -0,0 +1,97 @@
+"""
+Keyset (Cursor) Pagination and NDJSON Streaming
+Shared by the restaurant, menu and order list endpoints.
+
+Pages are fetched by ID with ``db_page(db, after_id, limit)``, so a list
+request only ever materialises one page, and NDJSON exports serialize records
+lazily from a generator instead of building the full response in memory.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Callable, Iterator, List, Mapping, Optional, Tuple
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the last ID of a page as an opaque cursor"""
+    payload = json.dumps({"after": last_id}).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """Decode a cursor back to the ID to resume after (0 for the first page)"""
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        after_id = json.loads(base64.urlsafe_b64decode(padded))["after"]
+        if not isinstance(after_id, int) or after_id < 0:
+            raise ValueError(after_id)
+        return after_id
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def db_page(db: Mapping[int, Any], after_id: int, limit: int) -> List[Any]:
+    """Return up to ``limit`` records with ID greater than ``after_id``.
+
+    An ``IndexedStore`` keeps its IDs sorted, so the page starts at a bisect:
+    O(log N + limit) however many records were deleted. Plain dicts are only
+    used for append-only databases with auto-incremented IDs (orders), whose
+    pages are collected by probing the gap-free ID range directly.
+    """
+    keys_after = getattr(db, "keys_after", None)
+    if keys_after is not None:
+        return [db[key] for key in keys_after(after_id, limit)]
+    max_id = next(reversed(db), 0)
+    page = []
+    record_id = after_id + 1
+    while record_id <= max_id and len(page) < limit:
+        record = db.get(record_id)
+        if record is not None:
+            page.append(record)
+        record_id += 1
+    return page
+
+
+def paginate(db: Mapping[int, Any], cursor: Optional[str], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Return one page of records and the cursor of the next page (None on the last page)"""
+    page = db_page(db, decode_cursor(cursor), limit + 1)
+    if len(page) <= limit:
+        return page, None
+    page = page[:limit]
+    return page, encode_cursor(page[-1].id)
+
+
+def iter_records(db: Mapping[int, Any], after_id: int, batch_size: int = MAX_PAGE_SIZE) -> Iterator[Any]:
+    """Lazily yield every record after ``after_id``, one batch in memory at a time"""
+    while True:
+        page = db_page(db, after_id, batch_size)
+        yield from page
+        if len(page) < batch_size:
+            return
+        after_id = page[-1].id
+
+
+def ndjson_response(db: Mapping[int, Any], cursor: Optional[str],
+                    serialize: Callable[[Any], Any]) -> StreamingResponse:
+    """Stream every record from the cursor onwards as newline-delimited JSON"""
+    after_id = decode_cursor(cursor)
+
+    def generate() -> Iterator[str]:
+        for record in iter_records(db, after_id):
+            yield json.dumps(jsonable_encoder(serialize(record))) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
@@ -10,10 +10,10 @@ Features:
 - Cache management endpoints
 """
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Query, status
 from pydantic import BaseModel, Field, field_validator, model_validator
 from enum import Enum
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Awaitable, Callable, NamedTuple, Set, Tuple
 from decimal import Decimal
 import re
 import time
@@ -22,7 +22,13 @@ import logging
 from datetime import datetime
 import asyncio
 import json
+import math
+import random
+import uuid
+from collections import OrderedDict
 from contextlib import asynccontextmanager
+from indexed_store import IndexedStore
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, ndjson_response, paginate
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -205,9 +211,15 @@ class CacheStats(BaseModel):
     total_keys: int
     namespace_breakdown: Dict[str, int]
     redis_info: Dict[str, Any]
+    local_cache: Dict[str, Any] = Field(default_factory=dict)
 
 # ===== IN-MEMORY DATABASE =====
-restaurants_db: Dict[int, Restaurant] = {}
+# Indexed by cuisine, flags, price and rating so filters and stats avoid full scans
+restaurants_db: IndexedStore = IndexedStore(
+    category_field="cuisine_type",
+    flag_fields=("is_active", "is_vegetarian_friendly", "is_spicy"),
+    sorted_fields=("price_range", "rating")
+)
 next_restaurant_id = 1
 
 def get_next_restaurant_id() -> int:
@@ -232,52 +244,321 @@ async def get_redis_client():
     return redis_client
 
 # ===== CACHE UTILITIES =====
+# Tag sets must outlive every entry registered in them (max entry TTL is 600s)
+CACHE_TAG_TTL = 3600
+# Pub/sub channel used to evict L1 entries in every worker process
+CACHE_INVALIDATION_CHANNEL = "restaurant-cache:invalidations"
+LOCAL_CACHE_MAX_SIZE = 1024
+# Upper bound on how long a worker trusts its L1 copy if an invalidation message is lost
+LOCAL_CACHE_MAX_TTL = 30
+# XFetch beta: > 1 favours earlier refreshes, < 1 later ones
+EARLY_REFRESH_BETA = 1.0
+# Stored in every Redis value; values in any other format are treated as misses
+CACHE_FORMAT_VERSION = 2
+
+class CacheEntry(NamedTuple):
+    """Cached value with the metadata needed for early refresh"""
+    data: Any
+    expires_at: float  # time.monotonic() deadline of the Redis entry
+    delta: float  # seconds it took to build the value
+
+class LocalCache:
+    """In-process LRU cache with per-entry TTL, used as L1 in front of Redis"""
+
+    def __init__(self, max_size: int = LOCAL_CACHE_MAX_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, CacheEntry]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, cache_key: str) -> Optional[CacheEntry]:
+        """Return the entry if present and not expired, refreshing its LRU position"""
+        item = self._entries.get(cache_key)
+        if item is None or item[0] <= time.monotonic():
+            if item is not None:
+                del self._entries[cache_key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(cache_key)
+        self.hits += 1
+        return item[1]
+
+    def set(self, cache_key: str, entry: CacheEntry):
+        """Store an entry, evicting the least recently used ones beyond max_size"""
+        local_expires_at = min(entry.expires_at, time.monotonic() + LOCAL_CACHE_MAX_TTL)
+        self._entries[cache_key] = (local_expires_at, entry)
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, *cache_keys: str):
+        for cache_key in cache_keys:
+            self._entries.pop(cache_key, None)
+
+    def delete_prefix(self, prefix: str):
+        for cache_key in [k for k in self._entries if k.startswith(prefix)]:
+            del self._entries[cache_key]
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0
+        }
+
 class CacheManager:
-    """Manage Redis caching operations"""
+    """Manage two-tier (in-process L1 + Redis L2) caching operations"""
+    
+    local_cache = LocalCache()
+    worker_id = uuid.uuid4().hex
+    _in_flight: Dict[str, asyncio.Future] = {}
+    _background_tasks: Set[asyncio.Task] = set()
+    # Bumped on every invalidation so builds that raced with it are not stored
+    _invalidation_epoch = 0
     
     @staticmethod
     async def get_cache_key(namespace: str, key: str) -> str:
         """Generate cache key with namespace"""
         return f"restaurant-cache:{namespace}:{key}"
     
+    @staticmethod
+    async def get_tag_key(tag: str) -> str:
+        """Generate the key of the set holding every cache key registered under a tag"""
+        return f"restaurant-cache:tag:{tag}"
+    
+    @staticmethod
+    def _copy(data: Any) -> Any:
+        """Shallow-copy dict payloads so callers can annotate them without touching L1"""
+        return dict(data) if isinstance(data, dict) else data
+    
+    @staticmethod
+    async def _lookup(cache_key: str) -> Optional[CacheEntry]:
+        """Look a key up in L1, falling back to Redis and promoting the result into L1"""
+        entry = CacheManager.local_cache.get(cache_key)
+        if entry is not None:
+            return entry
+        
+        redis_conn = await get_redis_client()
+        try:
+            async with redis_conn.pipeline(transaction=False) as pipe:
+                pipe.get(cache_key)
+                pipe.pttl(cache_key)
+                cached_data, pttl = await pipe.execute()
+            if not cached_data or pttl <= 0:
+                return None
+            envelope = json.loads(cached_data)
+        except Exception as e:
+            logger.error(f"Cache get error: {e}")
+            return None
+        # Values written before the versioned envelope are bare payloads (which
+        # may have their own "data" key): treat them as misses until they expire
+        if not isinstance(envelope, dict) or envelope.get("v") != CACHE_FORMAT_VERSION:
+            return None
+        
+        entry = CacheEntry(
+            data=envelope["data"],
+            expires_at=time.monotonic() + pttl / 1000,
+            delta=envelope["delta"]
+        )
+        CacheManager.local_cache.set(cache_key, entry)
+        return entry
+    
+    @staticmethod
+    def _should_refresh_early(entry: CacheEntry) -> bool:
+        """Probabilistic early expiration (XFetch): refresh more eagerly as expiry nears"""
+        if entry.delta <= 0:
+            return False
+        jitter = -entry.delta * EARLY_REFRESH_BETA * math.log(1.0 - random.random())
+        return time.monotonic() + jitter >= entry.expires_at
+    
     @staticmethod
     async def get_cached_data(namespace: str, key: str):
         """Get data from cache"""
+        cache_key = await CacheManager.get_cache_key(namespace, key)
+        entry = await CacheManager._lookup(cache_key)
+        return CacheManager._copy(entry.data) if entry is not None else None
+    
+    @staticmethod
+    async def set_cached_data(namespace: str, key: str, data: Any, ttl: int = 300,
+                              tags: Optional[List[str]] = None, delta: float = 0.0):
+        """Set data in both cache tiers with TTL and register the key under its dependency tags"""
+        cache_key = await CacheManager.get_cache_key(namespace, key)
+        await CacheManager._store(cache_key, data, ttl, tags, delta)
+    
+    @staticmethod
+    async def _store(cache_key: str, data: Any, ttl: int, tags: Optional[List[str]], delta: float):
         redis_conn = await get_redis_client()
+        
+        try:
+            serialized_data = json.dumps({"v": CACHE_FORMAT_VERSION, "data": data, "delta": delta}, default=str)
+            async with redis_conn.pipeline(transaction=True) as pipe:
+                pipe.setex(cache_key, ttl, serialized_data)
+                for tag in tags or []:
+                    tag_key = await CacheManager.get_tag_key(tag)
+                    pipe.sadd(tag_key, cache_key)
+                    pipe.expire(tag_key, CACHE_TAG_TTL)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Cache set error: {e}")
+            return
+        
+        # Round-trip through JSON so L1 holds exactly what other workers read from Redis
+        entry = CacheEntry(
+            data=json.loads(serialized_data)["data"],
+            expires_at=time.monotonic() + ttl,
+            delta=delta
+        )
+        CacheManager.local_cache.set(cache_key, entry)
+    
+    @staticmethod
+    async def get_or_build(namespace: str, key: str, builder: Callable[[], Awaitable[Any]],
+                           ttl: int = 300, tags: Optional[List[str]] = None) -> Tuple[Any, str]:
+        """Return (data, cache_status), building the value on a miss.
+
+        Concurrent misses on the same key share a single in-flight build
+        (status "SHARED"), and hot keys are refreshed in the background shortly
+        before they expire so they never fall out of the cache under load.
+        """
         cache_key = await CacheManager.get_cache_key(namespace, key)
+        entry = await CacheManager._lookup(cache_key)
+        
+        if entry is not None:
+            if cache_key not in CacheManager._in_flight and CacheManager._should_refresh_early(entry):
+                task = asyncio.create_task(
+                    CacheManager._refresh_in_background(cache_key, builder, ttl, tags)
+                )
+                CacheManager._background_tasks.add(task)
+                task.add_done_callback(CacheManager._background_tasks.discard)
+            return CacheManager._copy(entry.data), "HIT"
+        
+        in_flight = CacheManager._in_flight.get(cache_key)
+        if in_flight is not None:
+            data = await asyncio.shield(in_flight)
+            return CacheManager._copy(data), "SHARED"
+        
+        data = await CacheManager._build(cache_key, builder, ttl, tags)
+        return CacheManager._copy(data), "MISS"
+    
+    @staticmethod
+    async def _build(cache_key: str, builder: Callable[[], Awaitable[Any]],
+                     ttl: int, tags: Optional[List[str]]) -> Any:
+        """Run the builder once, publishing its outcome to every waiter on the key"""
+        future = asyncio.get_running_loop().create_future()
+        # Avoid "exception was never retrieved" warnings when nobody else was waiting
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        CacheManager._in_flight[cache_key] = future
+        epoch = CacheManager._invalidation_epoch
+        started = time.monotonic()
         
         try:
-            cached_data = await redis_conn.get(cache_key)
-            if cached_data:
-                return json.loads(cached_data)
-            return None
+            data = await builder()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
         except Exception as e:
-            logger.error(f"Cache get error: {e}")
-            return None
+            future.set_exception(e)
+            raise
+        finally:
+            CacheManager._in_flight.pop(cache_key, None)
+        
+        future.set_result(data)
+        if epoch == CacheManager._invalidation_epoch:
+            await CacheManager._store(cache_key, data, ttl, tags, time.monotonic() - started)
+        return data
     
     @staticmethod
-    async def set_cached_data(namespace: str, key: str, data: Any, ttl: int = 300):
-        """Set data in cache with TTL"""
+    async def _refresh_in_background(cache_key: str, builder: Callable[[], Awaitable[Any]],
+                                     ttl: int, tags: Optional[List[str]]):
+        try:
+            await CacheManager._build(cache_key, builder, ttl, tags)
+            logger.info(f"♻️ Refreshed '{cache_key}' ahead of expiry")
+        except Exception as e:
+            logger.error(f"Cache early refresh error for '{cache_key}': {e}")
+    
+    @staticmethod
+    async def _publish_invalidation(**payload: Any):
+        """Evict locally and tell the other workers to evict from their L1 caches"""
+        CacheManager._invalidation_epoch += 1
+        CacheManager._evict_local(payload)
+        redis_conn = await get_redis_client()
+        try:
+            payload["origin"] = CacheManager.worker_id
+            await redis_conn.publish(CACHE_INVALIDATION_CHANNEL, json.dumps(payload))
+        except Exception as e:
+            logger.error(f"Cache invalidation publish error: {e}")
+    
+    @staticmethod
+    def _evict_local(payload: Dict[str, Any]):
+        if "prefix" in payload:
+            CacheManager.local_cache.delete_prefix(payload["prefix"])
+        else:
+            CacheManager.local_cache.delete(*payload.get("keys", []))
+    
+    @staticmethod
+    async def listen_for_invalidations():
+        """Apply invalidations published by other workers to this worker's L1 cache"""
+        while True:
+            redis_conn = await get_redis_client()
+            pubsub = redis_conn.pubsub()
+            try:
+                await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    payload = json.loads(message["data"])
+                    if payload.get("origin") == CacheManager.worker_id:
+                        continue
+                    CacheManager._invalidation_epoch += 1
+                    CacheManager._evict_local(payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Messages may have been missed while disconnected, so L1 can't be trusted
+                logger.error(f"Cache invalidation listener error: {e}")
+                CacheManager.local_cache.delete_prefix("restaurant-cache:")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+    
+    @staticmethod
+    async def invalidate_tags(*tags: str) -> int:
+        """Delete only the cache keys registered under the given tags (no keyspace scan)"""
+        if not tags:
+            return 0
         redis_conn = await get_redis_client()
-        cache_key = await CacheManager.get_cache_key(namespace, key)
         
         try:
-            serialized_data = json.dumps(data, default=str)
-            await redis_conn.setex(cache_key, ttl, serialized_data)
+            tag_keys = [await CacheManager.get_tag_key(tag) for tag in set(tags)]
+            async with redis_conn.pipeline(transaction=False) as pipe:
+                for tag_key in tag_keys:
+                    pipe.smembers(tag_key)
+                members = await pipe.execute()
+            
+            keys = set().union(*members)
+            await redis_conn.delete(*keys, *tag_keys)
+            await CacheManager._publish_invalidation(keys=sorted(keys))
+            if keys:
+                logger.info(f"🗑️ Invalidated {len(keys)} keys for tags {sorted(set(tags))}")
+            return len(keys)
         except Exception as e:
-            logger.error(f"Cache set error: {e}")
+            logger.error(f"Cache invalidate error: {e}")
+            return 0
     
     @staticmethod
     async def clear_namespace(namespace: str):
         """Clear all keys in a namespace"""
         redis_conn = await get_redis_client()
-        pattern = f"restaurant-cache:{namespace}:*"
+        prefix = f"restaurant-cache:{namespace}:"
         
         try:
-            keys = await redis_conn.keys(pattern)
+            keys = [key async for key in redis_conn.scan_iter(match=f"{prefix}*", count=500)]
             if keys:
                 await redis_conn.delete(*keys)
                 logger.info(f"🗑️ Cleared {len(keys)} keys from namespace '{namespace}'")
+            await CacheManager._publish_invalidation(prefix=prefix)
         except Exception as e:
             logger.error(f"Cache clear error: {e}")
     
@@ -285,23 +566,37 @@ class CacheManager:
     async def clear_all_cache():
         """Clear all cache data"""
         redis_conn = await get_redis_client()
-        pattern = "restaurant-cache:*"
+        prefix = "restaurant-cache:"
         
         try:
-            keys = await redis_conn.keys(pattern)
+            keys = [key async for key in redis_conn.scan_iter(match=f"{prefix}*", count=500)]
             if keys:
                 await redis_conn.delete(*keys)
                 logger.info(f"🗑️ Cleared {len(keys)} total cache keys")
-                return len(keys)
-            return 0
+            await CacheManager._publish_invalidation(prefix=prefix)
+            return len(keys)
         except Exception as e:
             logger.error(f"Cache clear all error: {e}")
             return 0
 
+# ===== CACHE TAGS =====
+TAG_ALL_RESTAURANTS = "restaurants:all"
+TAG_ACTIVE_RESTAURANTS = "restaurants:active"
+TAG_RESTAURANT_SUMMARY = "restaurants:summary"
+
+def restaurant_tag(restaurant_id: int) -> str:
+    """Tag for every cache entry built from a single restaurant"""
+    return f"restaurant:{restaurant_id}"
+
+def cuisine_tag(cuisine_type: FoodCategory) -> str:
+    """Tag for the cuisine search list"""
+    return f"cuisine:{cuisine_type.value}"
+
 # ===== LIFESPAN MANAGEMENT =====
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan"""
+    invalidation_listener = None
     # Startup
     try:
         redis_conn = redis.Redis(
@@ -319,6 +614,10 @@ async def lifespan(app: FastAPI):
         seed_sample_restaurants()
         logger.info("✅ Sample restaurants data seeded")
         
+        # Keep this worker's L1 cache coherent with writes made by other workers
+        invalidation_listener = asyncio.create_task(CacheManager.listen_for_invalidations())
+        logger.info("✅ Subscribed to cache invalidations")
+        
         yield
         
     except Exception as e:
@@ -326,6 +625,12 @@ async def lifespan(app: FastAPI):
         raise
     finally:
         # Shutdown
+        if invalidation_listener is not None:
+            invalidation_listener.cancel()
+            try:
+                await invalidation_listener
+            except asyncio.CancelledError:
+                pass
         global redis_client
         if redis_client:
             await redis_client.close()
@@ -421,6 +726,21 @@ async def clear_restaurant_cache():
     except Exception as e:
         logger.error(f"❌ Failed to clear cache: {e}")
 
+async def invalidate_restaurant_cache(*restaurants: Restaurant):
+    """Invalidate only the caches that depend on the given restaurant versions.
+
+    Pass both the old and the new version on update so that a cuisine or
+    active-flag change drops the list it moved out of as well as the one it
+    moved into.
+    """
+    tags = {TAG_ALL_RESTAURANTS, TAG_RESTAURANT_SUMMARY}
+    for restaurant in restaurants:
+        tags.add(restaurant_tag(restaurant.id))
+        tags.add(cuisine_tag(restaurant.cuisine_type))
+        if restaurant.is_active:
+            tags.add(TAG_ACTIVE_RESTAURANTS)
+    await CacheManager.invalidate_tags(*tags)
+
 # ===== CORE API ENDPOINTS WITH CACHING =====
 
 @app.get("/")
@@ -443,36 +763,37 @@ async def root():
     return result
 
 @app.get("/restaurants")
-async def get_all_restaurants():
-    """Get all restaurants with caching (TTL: 300 seconds)"""
+async def get_all_restaurants(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = Query(False, description="Stream every restaurant from the cursor onwards as NDJSON (uncached)")
+):
+    """Get restaurants one page at a time with caching (TTL: 300 seconds per page)"""
     start_time = time.time()
-    cache_key = "all_restaurants"
     
-    # Try to get from cache first
-    cached_data = await CacheManager.get_cached_data("restaurants", cache_key)
+    if stream:
+        log_performance("BYPASS", start_time, "GET /restaurants?stream=true")
+        return ndjson_response(restaurants_db, cursor, lambda restaurant: restaurant.to_dict())
     
-    if cached_data:
-        duration = log_performance("HIT", start_time, "GET /restaurants")
-        cached_data["cache_status"] = "HIT"
-        cached_data["response_time_ms"] = duration
-        return cached_data
-    
-    # Cache miss - get from database
-    await asyncio.sleep(0.1)  # Simulate processing time
-    
-    restaurants_data = [restaurant.to_dict() for restaurant in restaurants_db.values()]
-    duration = log_performance("MISS", start_time, "GET /restaurants")
-    
-    result = {
-        "data": restaurants_data,
-        "cache_status": "MISS",
-        "response_time_ms": duration,
-        "total_count": len(restaurants_data)
-    }
+    async def build():
+        # Cache miss - get from database
+        await asyncio.sleep(0.1)  # Simulate processing time
+        restaurants, next_cursor = paginate(restaurants_db, cursor, limit)
+        restaurants_data = [restaurant.to_dict() for restaurant in restaurants]
+        return {
+            "data": restaurants_data,
+            "total_count": len(restaurants_db),
+            "next_cursor": next_cursor
+        }
     
-    # Store in cache
-    await CacheManager.set_cached_data("restaurants", cache_key, result, ttl=300)
+    result, cache_status = await CacheManager.get_or_build(
+        "restaurants", f"all_restaurants:{cursor or 'start'}:{limit}", build, ttl=300,
+        tags=[TAG_ALL_RESTAURANTS]
+    )
     
+    duration = log_performance(cache_status, start_time, "GET /restaurants")
+    result["cache_status"] = cache_status
+    result["response_time_ms"] = duration
     return result
 
 @app.get("/restaurants/{restaurant_id}")
@@ -486,115 +807,101 @@ async def get_restaurant(restaurant_id: int):
             detail=f"Restaurant with ID {restaurant_id} not found"
         )
     
-    cache_key = f"restaurant_{restaurant_id}"
-    
-    # Try to get from cache first
-    cached_data = await CacheManager.get_cached_data("restaurants", cache_key)
-    
-    if cached_data:
-        duration = log_performance("HIT", start_time, f"GET /restaurants/{restaurant_id}")
-        cached_data["cache_status"] = "HIT"
-        cached_data["response_time_ms"] = duration
-        return cached_data
+    async def build():
+        # Cache miss - get from database
+        await asyncio.sleep(0.05)  # Simulate processing time
+        return {"data": restaurants_db[restaurant_id].to_dict()}
     
-    # Cache miss - get from database
-    await asyncio.sleep(0.05)  # Simulate processing time
-    
-    restaurant_data = restaurants_db[restaurant_id].to_dict()
-    duration = log_performance("MISS", start_time, f"GET /restaurants/{restaurant_id}")
-    
-    result = {
-        "data": restaurant_data,
-        "cache_status": "MISS",
-        "response_time_ms": duration
-    }
-    
-    # Store in cache
-    await CacheManager.set_cached_data("restaurants", cache_key, result, ttl=600)
+    result, cache_status = await CacheManager.get_or_build(
+        "restaurants", f"restaurant_{restaurant_id}", build, ttl=600,
+        tags=[restaurant_tag(restaurant_id)]
+    )
     
+    duration = log_performance(cache_status, start_time, f"GET /restaurants/{restaurant_id}")
+    result["cache_status"] = cache_status
+    result["response_time_ms"] = duration
     return result
 
 @app.get("/restaurants/cuisine/{cuisine_type}")
 async def get_restaurants_by_cuisine(cuisine_type: FoodCategory):
     """Get restaurants filtered by cuisine type with caching (TTL: 180 seconds)"""
     start_time = time.time()
-    cache_key = f"cuisine_{cuisine_type.value}"
-    
-    # Try to get from cache first
-    cached_data = await CacheManager.get_cached_data("search", cache_key)
-    
-    if cached_data:
-        duration = log_performance("HIT", start_time, f"GET /restaurants/cuisine/{cuisine_type}")
-        cached_data["cache_status"] = "HIT"
-        cached_data["response_time_ms"] = duration
-        return cached_data
-    
-    # Cache miss - get from database
-    await asyncio.sleep(0.08)  # Simulate processing time
-    
-    filtered_restaurants = [
-        restaurant.to_dict() for restaurant in restaurants_db.values()
-        if restaurant.cuisine_type == cuisine_type
-    ]
-    
-    if not filtered_restaurants:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"No restaurants found for cuisine: {cuisine_type}"
-        )
     
-    duration = log_performance("MISS", start_time, f"GET /restaurants/cuisine/{cuisine_type}")
-    
-    result = {
-        "data": filtered_restaurants,
-        "cache_status": "MISS",
-        "response_time_ms": duration,
-        "cuisine_type": cuisine_type.value,
-        "count": len(filtered_restaurants)
-    }
+    async def build():
+        # Cache miss - get from database
+        await asyncio.sleep(0.08)  # Simulate processing time
+        
+        filtered_restaurants = [
+            restaurant.to_dict() for restaurant in restaurants_db.filter_by_category(cuisine_type)
+        ]
+        
+        if not filtered_restaurants:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No restaurants found for cuisine: {cuisine_type}"
+            )
+        
+        return {
+            "data": filtered_restaurants,
+            "cuisine_type": cuisine_type.value,
+            "count": len(filtered_restaurants)
+        }
     
-    # Store in cache
-    await CacheManager.set_cached_data("search", cache_key, result, ttl=180)
+    result, cache_status = await CacheManager.get_or_build(
+        "search", f"cuisine_{cuisine_type.value}", build, ttl=180,
+        tags=[cuisine_tag(cuisine_type)]
+    )
     
+    duration = log_performance(cache_status, start_time, f"GET /restaurants/cuisine/{cuisine_type}")
+    result["cache_status"] = cache_status
+    result["response_time_ms"] = duration
     return result
 
 @app.get("/restaurants/active/list")
 async def get_active_restaurants():
     """Get only active restaurants with caching (TTL: 240 seconds)"""
     start_time = time.time()
-    cache_key = "active_restaurants"
     
-    # Try to get from cache first
-    cached_data = await CacheManager.get_cached_data("restaurants", cache_key)
+    async def build():
+        # Cache miss - get from database
+        await asyncio.sleep(0.06)  # Simulate processing time
+        
+        active_restaurants = [
+            restaurant.to_dict() for restaurant in restaurants_db.filter_by_flag("is_active")
+        ]
+        
+        return {
+            "data": active_restaurants,
+            "active_count": len(active_restaurants),
+            "total_count": len(restaurants_db)
+        }
     
-    if cached_data:
-        duration = log_performance("HIT", start_time, "GET /restaurants/active/list")
-        cached_data["cache_status"] = "HIT"
-        cached_data["response_time_ms"] = duration
-        return cached_data
+    result, cache_status = await CacheManager.get_or_build(
+        "restaurants", "active_restaurants", build, ttl=240, tags=[TAG_ACTIVE_RESTAURANTS]
+    )
     
-    # Cache miss - get from database
-    await asyncio.sleep(0.06)  # Simulate processing time
+    duration = log_performance(cache_status, start_time, "GET /restaurants/active/list")
+    result["cache_status"] = cache_status
+    result["response_time_ms"] = duration
+    return result
+
+@app.get("/restaurants/rating/top")
+async def get_top_rated_restaurants(limit: int = 10):
+    """Get the highest rated restaurants straight from the rating index"""
+    start_time = time.time()
     
-    active_restaurants = [
-        restaurant.to_dict() for restaurant in restaurants_db.values()
-        if restaurant.is_active
+    top_restaurants = [
+        restaurant.to_dict()
+        for restaurant in restaurants_db.sorted_by("rating", descending=True, limit=limit)
     ]
     
-    duration = log_performance("MISS", start_time, "GET /restaurants/active/list")
-    
-    result = {
-        "data": active_restaurants,
-        "cache_status": "MISS",
+    duration = log_performance("BYPASS", start_time, "GET /restaurants/rating/top")
+    return {
+        "data": top_restaurants,
+        "cache_status": "BYPASS",
         "response_time_ms": duration,
-        "active_count": len(active_restaurants),
-        "total_count": len(restaurants_db)
+        "count": len(top_restaurants)
     }
-    
-    # Store in cache
-    await CacheManager.set_cached_data("restaurants", cache_key, result, ttl=240)
-    
-    return result
 
 # ===== WRITE OPERATIONS WITH CACHE INVALIDATION =====
 
@@ -608,8 +915,8 @@ async def create_restaurant(restaurant: RestaurantCreate):
         new_restaurant = Restaurant(id=restaurant_id, **restaurant.model_dump())
         restaurants_db[restaurant_id] = new_restaurant
         
-        # Clear restaurant-related caches
-        await clear_restaurant_cache()
+        # Invalidate the lists and stats the new restaurant belongs to
+        await invalidate_restaurant_cache(new_restaurant)
         
         duration = log_performance("INVALIDATE", start_time, "POST /restaurants")
         
@@ -645,8 +952,8 @@ async def update_restaurant(restaurant_id: int, restaurant: RestaurantUpdate):
         updated_restaurant = Restaurant(**current_data)
         restaurants_db[restaurant_id] = updated_restaurant
         
-        # Clear specific cache and related caches
-        await clear_restaurant_cache()
+        # Invalidate the restaurant entry plus the lists it left or joined
+        await invalidate_restaurant_cache(current_restaurant, updated_restaurant)
         
         duration = log_performance("INVALIDATE", start_time, f"PUT /restaurants/{restaurant_id}")
         
@@ -675,8 +982,8 @@ async def delete_restaurant(restaurant_id: int):
     
     deleted_restaurant = restaurants_db.pop(restaurant_id)
     
-    # Clear all restaurant-related caches
-    await clear_restaurant_cache()
+    # Invalidate the restaurant entry and the lists it appeared in
+    await invalidate_restaurant_cache(deleted_restaurant)
     
     duration = log_performance("INVALIDATE", start_time, f"DELETE /restaurants/{restaurant_id}")
     
@@ -696,7 +1003,7 @@ async def get_cache_stats():
         redis_conn = await get_redis_client()
         
         # Get all cache keys
-        keys = await redis_conn.keys("restaurant-cache:*")
+        keys = [key async for key in redis_conn.scan_iter(match="restaurant-cache:*", count=500)]
         total_keys = len(keys)
         
         # Analyze namespace breakdown
@@ -706,6 +1013,8 @@ async def get_cache_stats():
                 namespace_breakdown["restaurants"] = namespace_breakdown.get("restaurants", 0) + 1
             elif ":search:" in key:
                 namespace_breakdown["search"] = namespace_breakdown.get("search", 0) + 1
+            elif ":tag:" in key:
+                namespace_breakdown["tags"] = namespace_breakdown.get("tags", 0) + 1
             else:
                 namespace_breakdown["other"] = namespace_breakdown.get("other", 0) + 1
         
@@ -719,7 +1028,8 @@ async def get_cache_stats():
                 "used_memory": redis_info.get("used_memory_human", "N/A"),
                 "connected_clients": redis_info.get("connected_clients", 0),
                 "total_commands_processed": redis_info.get("total_commands_processed", 0)
-            }
+            },
+            local_cache=CacheManager.local_cache.stats()
         )
         
     except Exception as e:
@@ -804,7 +1114,8 @@ async def demo_cache_performance(restaurant_id: int):
         }
         
         # Store in cache for future requests
-        await CacheManager.set_cached_data("restaurants", cache_key, result, ttl=300)
+        await CacheManager.set_cached_data("restaurants", cache_key, result, ttl=300,
+                                           tags=[restaurant_tag(restaurant_id)])
         
         return result
 
@@ -847,15 +1158,16 @@ async def populate_sample_data():
         }
     ]
     
-    count_added = 0
+    added_restaurants = []
     for restaurant_data in additional_restaurants:
         restaurant_id = get_next_restaurant_id()
         restaurant = Restaurant(id=restaurant_id, **restaurant_data)
         restaurants_db[restaurant_id] = restaurant
-        count_added += 1
+        added_restaurants.append(restaurant)
+    count_added = len(added_restaurants)
     
-    # Clear caches after adding new data
-    await clear_restaurant_cache()
+    # Invalidate the caches affected by the new data
+    await invalidate_restaurant_cache(*added_restaurants)
     
     return {
         "message": f"Added {count_added} sample restaurants",
@@ -870,74 +1182,58 @@ async def populate_sample_data():
 async def get_restaurant_summary():
     """Get restaurant statistics and summary with caching"""
     start_time = time.time()
-    cache_key = "restaurant_summary"
-    
-    # Try to get from cache first
-    cached_data = await CacheManager.get_cached_data("restaurants", cache_key)
-    
-    if cached_data:
-        duration = log_performance("HIT", start_time, "GET /restaurants/stats/summary")
-        cached_data["cache_status"] = "HIT"
-        cached_data["response_time_ms"] = duration
-        return cached_data
     
     if not restaurants_db:
         return {"message": "No restaurants available"}
     
-    # Simulate processing time
-    await asyncio.sleep(0.1)
-    
-    restaurants = list(restaurants_db.values())
-    
-    # Calculate statistics
-    total_restaurants = len(restaurants)
-    active_restaurants = sum(1 for r in restaurants if r.is_active)
-    vegetarian_friendly = sum(1 for r in restaurants if r.is_vegetarian_friendly)
-    spicy_options = sum(1 for r in restaurants if r.is_spicy)
-    
-    # Price statistics
-    prices = [float(r.price_range) for r in restaurants]
-    avg_price = sum(prices) / len(prices) if prices else 0
-    min_price = min(prices) if prices else 0
-    max_price = max(prices) if prices else 0
-    
-    # Rating statistics
-    rated_restaurants = [r for r in restaurants if r.rating is not None]
-    avg_rating = sum(float(r.rating) for r in rated_restaurants if r.rating is not None) / len(rated_restaurants) if rated_restaurants else 0
-    
-    # Cuisine breakdown
-    cuisine_counts = {}
-    for restaurant in restaurants:
-        cuisine_counts[restaurant.cuisine_type.value] = cuisine_counts.get(restaurant.cuisine_type.value, 0) + 1
-    
-    duration = log_performance("MISS", start_time, "GET /restaurants/stats/summary")
-    
-    summary_data = {
-        "total_restaurants": total_restaurants,
-        "active_restaurants": active_restaurants,
-        "vegetarian_friendly": vegetarian_friendly,
-        "spicy_options": spicy_options,
-        "price_stats": {
-            "average": round(avg_price, 2),
-            "minimum": min_price,
-            "maximum": max_price
-        },
-        "rating_stats": {
-            "average": round(avg_rating, 2),
-            "rated_count": len(rated_restaurants)
-        },
-        "cuisine_breakdown": cuisine_counts
-    }
-    
-    result = {
-        "data": summary_data,
-        "cache_status": "MISS",
-        "response_time_ms": duration
-    }
+    async def build():
+        # Simulate processing time
+        await asyncio.sleep(0.1)
+        
+        # Statistics come from incrementally maintained aggregates
+        total_restaurants = len(restaurants_db)
+        active_restaurants = restaurants_db.count_by_flag("is_active")
+        vegetarian_friendly = restaurants_db.count_by_flag("is_vegetarian_friendly")
+        spicy_options = restaurants_db.count_by_flag("is_spicy")
+        
+        # Price statistics
+        avg_price = float(restaurants_db.average("price_range") or 0)
+        min_price = float(restaurants_db.minimum("price_range") or 0)
+        max_price = float(restaurants_db.maximum("price_range") or 0)
+        
+        # Rating statistics
+        rated_count = restaurants_db.count_non_null("rating")
+        avg_rating = float(restaurants_db.average("rating") or 0)
+        
+        # Cuisine breakdown
+        cuisine_counts = restaurants_db.category_counts()
+        
+        summary_data = {
+            "total_restaurants": total_restaurants,
+            "active_restaurants": active_restaurants,
+            "vegetarian_friendly": vegetarian_friendly,
+            "spicy_options": spicy_options,
+            "price_stats": {
+                "average": round(avg_price, 2),
+                "minimum": min_price,
+                "maximum": max_price
+            },
+            "rating_stats": {
+                "average": round(avg_rating, 2),
+                "rated_count": rated_count
+            },
+            "cuisine_breakdown": cuisine_counts
+        }
+        
+        return {"data": summary_data}
     
-    # Store in cache
-    await CacheManager.set_cached_data("restaurants", cache_key, result, ttl=300)
+    result, cache_status = await CacheManager.get_or_build(
+        "restaurants", "restaurant_summary", build, ttl=300, tags=[TAG_RESTAURANT_SUMMARY]
+    )
     
+    duration = log_performance(cache_status, start_time, "GET /restaurants/stats/summary")
+    result["cache_status"] = cache_status
+    result["response_time_ms"] = duration
     return result
 
 # ===== APPLICATION STARTUP =====
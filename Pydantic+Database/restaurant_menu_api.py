@@ -4,13 +4,16 @@ A fully functional restaurant menu management system with custom validations
 and computed properties using in-memory dictionary storage.
 """
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Query, Response, status
 from pydantic import BaseModel, Field, field_validator, model_validator
 from enum import Enum
 from typing import List, Optional, Dict, Any
 from decimal import Decimal
 import re
 from datetime import datetime
+from functools import cached_property
+from indexed_store import IndexedStore
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, ndjson_response, paginate
 
 # Enum for food categories
 class FoodCategory(str, Enum):
@@ -232,9 +235,9 @@ class Order(BaseModel):
     status: OrderStatus = Field(default=OrderStatus.PENDING, description="Order status")
     created_at: Optional[datetime] = Field(default_factory=datetime.now, description="Order creation timestamp")
 
-    @property
+    @cached_property
     def order_total(self) -> Decimal:
-        """Computed property: total cost for the entire order"""
+        """Computed property: total cost for the entire order (computed once, items are immutable after creation)"""
         return sum((item.item_total for item in self.items), Decimal('0'))
 
     def dict(self, *args, **kwargs) -> Dict[str, Any]:
@@ -308,14 +311,42 @@ class ErrorResponse(BaseModel):
 
 # ===== IN-MEMORY DATABASES =====
 
-# Menu database (existing)
-menu_db: Dict[int, FoodItem] = {}
+# Menu database (existing), indexed by category, flags and price
+menu_db: IndexedStore = IndexedStore(
+    category_field="category",
+    flag_fields=("is_available", "is_vegetarian", "is_spicy"),
+    sorted_fields=("price",)
+)
 next_menu_id = 1
 
 # Orders database (new)
 orders_db: Dict[int, Order] = {}
 next_order_id = 1
 
+class OrderStats:
+    """Running order aggregates, updated on create and status change instead of rescanning orders_db"""
+
+    def __init__(self):
+        self.total_orders = 0
+        self.total_revenue = Decimal('0')
+        self.status_counts: Dict[str, int] = {}
+        self.hourly_revenue: Dict[str, Decimal] = {}
+
+    def record_created(self, order: Order):
+        hour = order.created_at.strftime("%Y-%m-%dT%H:00")  # type: ignore
+        self.total_orders += 1
+        self.total_revenue += order.order_total
+        self.hourly_revenue[hour] = self.hourly_revenue.get(hour, Decimal('0')) + order.order_total
+        self.status_counts[order.status.value] = self.status_counts.get(order.status.value, 0) + 1
+
+    def record_status_change(self, old_status: OrderStatus, new_status: OrderStatus):
+        self.status_counts[old_status.value] -= 1
+        if not self.status_counts[old_status.value]:
+            del self.status_counts[old_status.value]
+        self.status_counts[new_status.value] = self.status_counts.get(new_status.value, 0) + 1
+
+order_stats = OrderStats()
+
 # Auto-increment ID logic for menu items
 def get_next_menu_id() -> int:
     global next_menu_id
@@ -423,9 +454,20 @@ def root():
     }
 
 @app.get("/menu", response_model=List[Dict[str, Any]])
-def get_all_menu_items():
-    """Get all menu items with computed properties"""
-    return [item.dict() for item in menu_db.values()]
+def get_all_menu_items(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = Query(False, description="Stream every item from the cursor onwards as NDJSON")
+):
+    """Get menu items with computed properties, one page at a time (next page cursor in X-Next-Cursor)"""
+    if stream:
+        return ndjson_response(menu_db, cursor, lambda item: item.dict())
+    
+    items, next_cursor = paginate(menu_db, cursor, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return [item.dict() for item in items]
 
 @app.get("/menu/{item_id}", response_model=Dict[str, Any])
 def get_menu_item(item_id: int):
@@ -502,10 +544,7 @@ def delete_menu_item(item_id: int):
 @app.get("/menu/category/{category}", response_model=List[Dict[str, Any]])
 def get_menu_items_by_category(category: FoodCategory):
     """Get all menu items filtered by category"""
-    filtered_items = [
-        item.dict() for item in menu_db.values() 
-        if item.category == category
-    ]
+    filtered_items = [item.dict() for item in menu_db.filter_by_category(category)]
     
     if not filtered_items:
         raise HTTPException(
@@ -515,6 +554,11 @@ def get_menu_items_by_category(category: FoodCategory):
     
     return filtered_items
 
+@app.get("/menu/price/range", response_model=List[Dict[str, Any]])
+def get_menu_items_by_price_range(min_price: Optional[Decimal] = None, max_price: Optional[Decimal] = None):
+    """Get menu items within a price range, cheapest first"""
+    return [item.dict() for item in menu_db.range_by("price", min_price, max_price)]
+
 # Additional utility endpoints
 
 @app.get("/menu/stats/summary")
@@ -523,24 +567,19 @@ def get_menu_summary():
     if not menu_db:
         return {"message": "No menu items available"}
     
-    items = list(menu_db.values())
-    
-    # Calculate statistics
-    total_items = len(items)
-    available_items = sum(1 for item in items if item.is_available)
-    vegetarian_items = sum(1 for item in items if item.is_vegetarian)
-    spicy_items = sum(1 for item in items if item.is_spicy)
+    # Statistics come from incrementally maintained aggregates
+    total_items = len(menu_db)
+    available_items = menu_db.count_by_flag("is_available")
+    vegetarian_items = menu_db.count_by_flag("is_vegetarian")
+    spicy_items = menu_db.count_by_flag("is_spicy")
     
     # Price statistics
-    prices = [float(item.price) for item in items]
-    avg_price = sum(prices) / len(prices)
-    min_price = min(prices)
-    max_price = max(prices)
+    avg_price = float(menu_db.average("price"))
+    min_price = float(menu_db.minimum("price"))
+    max_price = float(menu_db.maximum("price"))
     
     # Category breakdown
-    category_counts = {}
-    for item in items:
-        category_counts[item.category.value] = category_counts.get(item.category.value, 0) + 1
+    category_counts = menu_db.category_counts()
     
     return {
         "total_items": total_items,
@@ -575,8 +614,9 @@ def create_order(order_data: OrderCreate):
             items=order_items
         )
         
-        # Store in database
+        # Store in database and update running aggregates
         orders_db[order_id] = new_order
+        order_stats.record_created(new_order)
         
         # Return response
         return OrderResponse(
@@ -594,24 +634,32 @@ def create_order(order_data: OrderCreate):
             detail=str(e)
         )
 
+def to_order_summary(order: Order) -> OrderSummaryResponse:
+    """Build the summary view of an order"""
+    return OrderSummaryResponse(
+        id=order.id,  # type: ignore
+        customer_name=order.customer.name,
+        order_total=float(order.order_total),
+        status=order.status,
+        created_at=order.created_at,  # type: ignore
+        item_count=len(order.items)
+    )
+
 @app.get("/orders", response_model=List[OrderSummaryResponse])
-def get_all_orders():
-    """Get list of all orders with summary information"""
-    if not orders_db:
-        return []
-    
-    summaries = []
-    for order in orders_db.values():
-        summaries.append(OrderSummaryResponse(
-            id=order.id,  # type: ignore
-            customer_name=order.customer.name,
-            order_total=float(order.order_total),
-            status=order.status,
-            created_at=order.created_at,  # type: ignore
-            item_count=len(order.items)
-        ))
+def get_all_orders(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = Query(False, description="Stream every order from the cursor onwards as NDJSON")
+):
+    """Get orders with summary information, one page at a time (next page cursor in X-Next-Cursor)"""
+    if stream:
+        return ndjson_response(orders_db, cursor, to_order_summary)
     
-    return summaries
+    orders, next_cursor = paginate(orders_db, cursor, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return [to_order_summary(order) for order in orders]
 
 @app.get("/orders/{order_id}", response_model=OrderResponse)
 def get_order(order_id: int):
@@ -662,6 +710,7 @@ def update_order_status(order_id: int, status_update: OrderStatusUpdate):
     # Update the status
     order.status = new_status
     orders_db[order_id] = order
+    order_stats.record_status_change(current_status, new_status)
     
     return OrderResponse(
         id=order.id,  # type: ignore
@@ -680,18 +729,9 @@ def get_orders_summary():
     if not orders_db:
         return {"message": "No orders available"}
     
-    orders = list(orders_db.values())
-    
-    # Calculate statistics
-    total_orders = len(orders)
-    status_counts = {}
-    total_revenue = Decimal('0')
-    
-    for order in orders:
-        # Count by status
-        status_counts[order.status.value] = status_counts.get(order.status.value, 0) + 1
-        # Sum revenue
-        total_revenue += order.order_total
+    # Statistics come from running aggregates maintained on create/status update
+    total_orders = order_stats.total_orders
+    total_revenue = order_stats.total_revenue
     
     # Average order value
     avg_order_value = float(total_revenue / total_orders) if total_orders > 0 else 0
@@ -700,7 +740,10 @@ def get_orders_summary():
         "total_orders": total_orders,
         "total_revenue": float(total_revenue),
         "average_order_value": round(avg_order_value, 2),
-        "status_breakdown": status_counts
+        "status_breakdown": dict(order_stats.status_counts),
+        "hourly_revenue": {
+            hour: float(revenue) for hour, revenue in sorted(order_stats.hourly_revenue.items())
+        }
     }
 
 # Run the application
@@ -0,0 +1,124 @@
+"""
+Test Cases for the IndexedStore secondary indexes and aggregates
+
+Each check compares the store's indexed answer with a full scan, after
+inserts, updates and deletes:
+1. Category and flag indexes follow updates and deletes
+2. sorted_by orders and honours limit (ascending and descending)
+3. range_by returns the inclusive range in field order
+4. Aggregates (counts, min/max/average, category breakdown) stay in step
+5. keys_after pages over the IDs left after deletes
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal
+from enum import Enum
+from typing import Optional
+
+from indexed_store import IndexedStore
+
+
+class Course(str, Enum):
+    STARTER = "starter"
+    MAIN = "main"
+    DESSERT = "dessert"
+
+
+@dataclass(frozen=True)
+class Dish:
+    id: int
+    category: Course
+    is_available: bool
+    price: Decimal
+    rating: Optional[float] = None
+
+
+def _store() -> IndexedStore:
+    store = IndexedStore("category", flag_fields=("is_available",), sorted_fields=("price", "rating"))
+    for dish in (
+        Dish(1, Course.STARTER, True, Decimal("6.50"), 4.0),
+        Dish(2, Course.MAIN, True, Decimal("14.00"), 4.5),
+        Dish(3, Course.MAIN, False, Decimal("18.25")),
+        Dish(4, Course.DESSERT, True, Decimal("7.00"), 3.5),
+        Dish(5, Course.MAIN, True, Decimal("11.75"), 5.0),
+    ):
+        store[dish.id] = dish
+    return store
+
+
+def _ids(dishes) -> list:
+    return [dish.id for dish in dishes]
+
+
+def _edit(store: IndexedStore):
+    # Models are replaced, never mutated in place
+    store[2] = Dish(2, Course.DESSERT, False, Decimal("9.00"), 4.5)
+    store[3] = Dish(3, Course.MAIN, True, Decimal("18.25"), 2.0)
+    del store[5]
+    store[6] = Dish(6, Course.STARTER, True, Decimal("6.50"), 4.0)
+
+
+def test_indexes_follow_updates_and_deletes():
+    store = _store()
+    _edit(store)
+    for category in Course:
+        assert _ids(store.filter_by_category(category)) == [k for k, v in store.items() if v.category == category]
+    assert _ids(store.filter_by_flag("is_available")) == [1, 3, 4, 6]
+    assert store.filter_by_category("missing") == []
+
+
+def test_sorted_by_honours_limit():
+    store = _store()
+    assert _ids(store.sorted_by("price")) == [1, 4, 5, 2, 3]
+    assert _ids(store.sorted_by("price", limit=2)) == [1, 4]
+    assert _ids(store.sorted_by("price", descending=True, limit=2)) == [3, 2]
+    assert store.sorted_by("price", limit=0) == []
+    assert _ids(store.sorted_by("price", limit=100)) == [1, 4, 5, 2, 3]
+    # Dishes without a rating are skipped
+    assert _ids(store.sorted_by("rating", descending=True)) == [5, 2, 1, 4]
+
+    _edit(store)
+    assert _ids(store.sorted_by("price", limit=3)) == [1, 6, 4]
+    assert _ids(store.sorted_by("rating")) == [3, 4, 1, 6, 2]
+
+
+def test_range_by_is_inclusive():
+    store = _store()
+    assert _ids(store.range_by("price", Decimal("7.00"), Decimal("14.00"))) == [4, 5, 2]
+    assert _ids(store.range_by("price", low=Decimal("14.00"))) == [2, 3]
+    assert _ids(store.range_by("price", high=Decimal("6.50"))) == [1]
+
+
+def test_aggregates_stay_in_step():
+    store = _store()
+    _edit(store)
+    dishes = list(store.values())
+    rated = [dish.rating for dish in dishes if dish.rating is not None]
+
+    assert store.count_by_flag("is_available") == sum(dish.is_available for dish in dishes)
+    assert store.category_counts() == {"starter": 2, "main": 1, "dessert": 2}
+    assert store.count_non_null("rating") == len(rated)
+    assert store.minimum("price") == min(dish.price for dish in dishes)
+    assert store.maximum("price") == max(dish.price for dish in dishes)
+    assert store.average("price") == sum(dish.price for dish in dishes) / len(dishes)
+    assert store.average("rating") == Decimal(str(sum(rated))) / len(rated)
+
+    for key in list(store):
+        del store[key]
+    assert store.average("price") is None
+    assert store.minimum("rating") is None
+    assert store.category_counts() == {}
+
+
+def test_keys_after_skips_deleted_ids():
+    store = IndexedStore("category")
+    for key in range(1, 1001):
+        store[key] = Dish(key, Course.MAIN, True, Decimal("1.00"))
+    for key in range(2, 1000):
+        del store[key]
+
+    assert store.keys_after(0, 5) == [1, 1000]
+    assert store.keys_after(1, 5) == [1000]
+    assert store.keys_after(1000, 5) == []
+    store[500] = Dish(500, Course.MAIN, True, Decimal("1.00"))
+    assert store.keys_after(0, 5) == [1, 500, 1000]
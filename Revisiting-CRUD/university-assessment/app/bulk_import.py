@@ -0,0 +1,112 @@
+"""
+Bulk CSV / JSONL import for the University Assessment API.
+
+Rows are validated with the entity's Create model and written through the
+repository in batches, one transaction per batch, instead of one request and
+one commit per record. Rows that fail validation are reported (up to
+MAX_REPORTED_ERRORS) and skipped; rows that violate a unique index, such as a
+duplicate enrollment, are skipped by the storage engine. Imported enrollments
+are not capacity-checked; the seat counters of the affected courses are
+re-seeded afterwards.
+"""
+
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, List, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+from models.course import CourseCreate, courses_repo
+from models.enrollment import EnrollmentCreate, enrollments_repo, seat_counters
+from models.professor import ProfessorCreate, professors_repo
+from models.student import StudentCreate, students_repo
+from repository import Repository
+
+DEFAULT_BATCH_SIZE = 1000
+MAX_BATCH_SIZE = 10_000
+MAX_REPORTED_ERRORS = 20
+SUPPORTED_FORMATS = ("csv", "jsonl")
+
+IMPORTABLE_ENTITIES: Dict[str, Tuple[Type[BaseModel], Repository]] = {
+    "students": (StudentCreate, students_repo),
+    "courses": (CourseCreate, courses_repo),
+    "professors": (ProfessorCreate, professors_repo),
+    "enrollments": (EnrollmentCreate, enrollments_repo),
+}
+
+
+def detect_format(filename: str) -> str:
+    """Guess the file format from its extension (.csv, .jsonl or .ndjson)"""
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    return "jsonl" if extension == "ndjson" else extension
+
+
+def iter_rows(stream: io.TextIOBase, file_format: str) -> Iterator[Tuple[int, Any]]:
+    """Yield (line number, raw row) pairs without reading the whole file into memory"""
+    if file_format == "csv":
+        # Empty cells are treated as missing so optional fields fall back to their defaults
+        for line_number, row in enumerate(csv.DictReader(stream), start=2):
+            yield line_number, {key: value for key, value in row.items() if value != ""}
+    elif file_format == "jsonl":
+        for line_number, line in enumerate(stream, start=1):
+            if line.strip():
+                yield line_number, line
+    else:
+        raise ValueError(f"Unsupported import format '{file_format}', expected one of {SUPPORTED_FORMATS}")
+
+
+def import_records(entity: str, stream: io.TextIOBase, file_format: str,
+                   batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+    """Validate and store every row of an uploaded file in batched transactions"""
+    create_model, repo = IMPORTABLE_ENTITIES[entity]
+    imported = 0
+    invalid = 0
+    duplicates = 0
+    errors: List[Dict[str, Any]] = []
+    batch: List[Dict[str, Any]] = []
+
+    def flush():
+        nonlocal imported, duplicates
+        inserted = repo.insert_many(batch)
+        imported += inserted
+        duplicates += len(batch) - inserted
+        if entity == "enrollments":
+            seat_counters.resync(row["course_id"] for row in batch)
+        batch.clear()
+
+    for line_number, raw in iter_rows(stream, file_format):
+        try:
+            if isinstance(raw, str):
+                record = create_model.model_validate_json(raw)
+            else:
+                record = create_model.model_validate(raw)
+        except ValidationError as e:
+            invalid += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"line": line_number, "errors": e.errors(include_url=False, include_context=False)})
+            continue
+        batch.append(record.model_dump())
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    return {
+        "entity": entity,
+        "imported": imported,
+        "skipped_invalid": invalid,
+        "skipped_duplicates": duplicates,
+        "errors": errors
+    }
+
+
+__all__ = [
+    "DEFAULT_BATCH_SIZE",
+    "MAX_BATCH_SIZE",
+    "SUPPORTED_FORMATS",
+    "IMPORTABLE_ENTITIES",
+    "detect_format",
+    "iter_rows",
+    "import_records"
+]
@@ -0,0 +1,160 @@
+"""
+Per-course seat counters for enrollment capacity checks.
+
+Each course keeps a running count of taken seats, seeded once from the
+enrollment index the first time the course is touched, so checking
+``max_capacity`` never counts enrollments on the hot path. Reserving a seat is
+a single compare-and-increment, done inside the same per-course critical
+section as the enrollment insert:
+
+- SQLite: ``UPDATE course_seats SET taken = taken + 1 WHERE taken < capacity``
+  inside an IMMEDIATE transaction that also writes the enrollment, so the
+  check holds across several worker processes sharing the database.
+- Memory: a plain counter guarded by a per-course lock, so registrations for
+  different courses never wait on each other.
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+from repository import STORAGE_ENGINE, ConnectionPool, get_pool
+
+
+class SeatCounters(ABC):
+    """Running count of taken seats per course"""
+
+    @abstractmethod
+    def guard(self, course_id: int) -> Iterator[None]:
+        """Critical section for one course; seat changes and the matching
+        enrollment/waitlist writes inside it commit together"""
+
+    @abstractmethod
+    def try_reserve(self, course_id: int, capacity: Optional[int]) -> bool:
+        """Take a seat if fewer than `capacity` are taken (None means unlimited)"""
+
+    @abstractmethod
+    def release(self, course_id: int):
+        """Give a seat back"""
+
+    @abstractmethod
+    def taken(self, course_id: int) -> int:
+        """Number of seats currently taken"""
+
+    @abstractmethod
+    def resync(self, course_ids: Iterable[int]):
+        """Forget the counters of these courses so they are re-seeded from the enrollments"""
+
+
+class MemorySeatCounters(SeatCounters):
+    """Dictionary of counters with one lock per course"""
+
+    def __init__(self, count_enrolled: Callable[[int], int]):
+        self._count_enrolled = count_enrolled
+        self._taken: Dict[int, int] = {}
+        self._locks: Dict[int, threading.RLock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, course_id: int) -> threading.RLock:
+        lock = self._locks.get(course_id)
+        if lock is None:
+            with self._locks_guard:
+                lock = self._locks.setdefault(course_id, threading.RLock())
+        return lock
+
+    def _seed(self, course_id: int) -> int:
+        if course_id not in self._taken:
+            self._taken[course_id] = self._count_enrolled(course_id)
+        return self._taken[course_id]
+
+    @contextmanager
+    def guard(self, course_id: int) -> Iterator[None]:
+        with self._lock(course_id):
+            yield
+
+    def try_reserve(self, course_id: int, capacity: Optional[int]) -> bool:
+        with self._lock(course_id):
+            if capacity is not None and self._seed(course_id) >= capacity:
+                return False
+            self._taken[course_id] = self._seed(course_id) + 1
+            return True
+
+    def release(self, course_id: int):
+        with self._lock(course_id):
+            self._taken[course_id] = max(self._seed(course_id) - 1, 0)
+
+    def taken(self, course_id: int) -> int:
+        with self._lock(course_id):
+            return self._seed(course_id)
+
+    def resync(self, course_ids: Iterable[int]):
+        for course_id in set(course_ids):
+            with self._lock(course_id):
+                self._taken.pop(course_id, None)
+
+
+class SQLiteSeatCounters(SeatCounters):
+    """Counters kept in a course_seats table next to the enrollments"""
+
+    # Only counts the enrollments when the course has no counter yet
+    SQL_SEED = ("INSERT OR IGNORE INTO course_seats (course_id, taken) "
+                "SELECT ?, (SELECT COUNT(*) FROM enrollments WHERE course_id = ?) "
+                "WHERE NOT EXISTS (SELECT 1 FROM course_seats WHERE course_id = ?)")
+    SQL_RESERVE = "UPDATE course_seats SET taken = taken + 1 WHERE course_id = ? AND taken < ?"
+    SQL_RESERVE_UNLIMITED = "UPDATE course_seats SET taken = taken + 1 WHERE course_id = ?"
+    SQL_RELEASE = "UPDATE course_seats SET taken = MAX(taken - 1, 0) WHERE course_id = ?"
+    SQL_TAKEN = "SELECT taken FROM course_seats WHERE course_id = ?"
+    SQL_RESYNC = "DELETE FROM course_seats WHERE course_id = ?"
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+        with pool.transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS course_seats "
+                "(course_id INTEGER PRIMARY KEY, taken INTEGER NOT NULL)"
+            )
+
+    @contextmanager
+    def guard(self, course_id: int) -> Iterator[None]:
+        # SQLite has a single writer, so the IMMEDIATE lock doubles as the course lock
+        with self.pool.transaction(immediate=True):
+            yield
+
+    def try_reserve(self, course_id: int, capacity: Optional[int]) -> bool:
+        with self.pool.transaction() as conn:
+            conn.execute(self.SQL_SEED, (course_id, course_id, course_id))
+            if capacity is None:
+                cursor = conn.execute(self.SQL_RESERVE_UNLIMITED, (course_id,))
+            else:
+                cursor = conn.execute(self.SQL_RESERVE, (course_id, capacity))
+            return cursor.rowcount == 1
+
+    def release(self, course_id: int):
+        with self.pool.transaction() as conn:
+            conn.execute(self.SQL_SEED, (course_id, course_id, course_id))
+            conn.execute(self.SQL_RELEASE, (course_id,))
+
+    def taken(self, course_id: int) -> int:
+        with self.pool.transaction() as conn:
+            conn.execute(self.SQL_SEED, (course_id, course_id, course_id))
+            return conn.execute(self.SQL_TAKEN, (course_id,)).fetchone()[0]
+
+    def resync(self, course_ids: Iterable[int]):
+        with self.pool.transaction() as conn:
+            conn.executemany(self.SQL_RESYNC, [(course_id,) for course_id in set(course_ids)])
+
+
+def create_seat_counters(count_enrolled: Callable[[int], int]) -> SeatCounters:
+    """Build seat counters for the configured storage engine"""
+    if STORAGE_ENGINE == "memory":
+        return MemorySeatCounters(count_enrolled)
+    return SQLiteSeatCounters(get_pool())
+
+
+__all__ = [
+    "SeatCounters",
+    "MemorySeatCounters",
+    "SQLiteSeatCounters",
+    "create_seat_counters"
+]
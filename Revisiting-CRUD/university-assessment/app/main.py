@@ -1,14 +1,20 @@
-from fastapi import APIRouter, FastAPI, HTTPException, status
-from typing import List
-from models.professor import (Professor, ProfessorUpdate, create_professor, delete_professor, get_all_professors, update_professor, get_professor)
-from models.course import (Course, CourseUpdate, create_course, delete_course, get_all_courses, update_course, get_course)
+import csv
+import io
+from fastapi import APIRouter, FastAPI, File, HTTPException, Query, Response, UploadFile, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from typing import List, Literal, Optional
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, list_response
+from bulk_import import DEFAULT_BATCH_SIZE, MAX_BATCH_SIZE, SUPPORTED_FORMATS, detect_format, import_records
+from models.professor import (Professor, ProfessorUpdate, create_professor, delete_professor, get_professors_page, update_professor, get_professor)
+from models.course import (Course, CourseUpdate, create_course, delete_course, get_courses_page, update_course, get_course)
 from models.student import (
     Student, 
     StudentCreate, 
     StudentUpdate,
     create_student,
     get_student,
-    get_all_students,
+    get_students_page,
     update_student,
     delete_student
 )
@@ -16,14 +22,21 @@ from models.enrollment import (
     Enrollment,
     EnrollmentCreate,
     EnrollmentUpdate,
+    WaitlistEntry,
+    CourseSeats,
+    CourseFullError,
     create_enrollment,
     get_enrollment,
-    get_all_enrollments,
+    get_enrollments_page,
     get_enrollments_by_student,
     get_enrollments_by_course,
     update_enrollment,
     delete_enrollment,
-    get_enrollment_by_student_course
+    get_enrollment_by_student_course,
+    promote_waitlist,
+    get_waitlist,
+    leave_waitlist,
+    get_seat_status
 )
 
 app = FastAPI(
@@ -49,9 +62,14 @@ def create_new_student(student: StudentCreate):
 
 
 @student_router.get("/", response_model=List[Student])
-def read_students():
-    """Get all students"""
-    return get_all_students()
+def read_students(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = Query(False, description="Stream every student from the cursor onwards as NDJSON")
+):
+    """Get students one page at a time (next page cursor in the X-Next-Cursor header)"""
+    return list_response(get_students_page, cursor, limit, stream, response)
 
 
 @student_router.get("/{student_id}", response_model=Student)
@@ -93,9 +111,14 @@ def delete_existing_student(student_id: int):
 course_router = APIRouter(prefix="/courses", tags=["courses"])
 
 @course_router.get("/", response_model=List[Course])
-def read_courses():
-    """Get all courses"""
-    return get_all_courses()
+def read_courses(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = Query(False, description="Stream every course from the cursor onwards as NDJSON")
+):
+    """Get courses one page at a time (next page cursor in the X-Next-Cursor header)"""
+    return list_response(get_courses_page, cursor, limit, stream, response)
 
 @course_router.post("/", response_model=Course, status_code=status.HTTP_201_CREATED)
 def create_new_course(course: Course):
@@ -123,8 +146,20 @@ def update_existing_course(course_id: int, course_update: CourseUpdate):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Course with ID {course_id} not found"
         )
+    # A capacity increase frees seats for waitlisted students
+    promote_waitlist(course_id)
     return updated_course
 
+@course_router.get("/{course_id}/seats", response_model=CourseSeats)
+def read_course_seats(course_id: int):
+    """Get enrolled, available and waitlisted seat counts for a course"""
+    if get_course(course_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Course with ID {course_id} not found"
+        )
+    return get_seat_status(course_id)
+
 @course_router.delete("/{course_id}")
 def delete_existing_course(course_id: int):
     """Delete a course by ID"""
@@ -139,9 +174,14 @@ def delete_existing_course(course_id: int):
 
 professor_router = APIRouter(prefix="/professors", tags=["professors"])
 @professor_router.get("/", response_model=List[Professor])
-def read_professors():
-    """Get all professors"""
-    return get_all_professors()
+def read_professors(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = Query(False, description="Stream every professor from the cursor onwards as NDJSON")
+):
+    """Get professors one page at a time (next page cursor in the X-Next-Cursor header)"""
+    return list_response(get_professors_page, cursor, limit, stream, response)
 
 
 @professor_router.post("/", response_model=Professor, status_code=status.HTTP_201_CREATED)
@@ -186,12 +226,30 @@ def delete_existing_professor(professor_id: int):
 # Enrollment CRUD endpoints
 enrollment_router = APIRouter(prefix="/enrollments", tags=["enrollments"])
 
-@enrollment_router.post("/", response_model=Enrollment, status_code=status.HTTP_201_CREATED)
-def create_new_enrollment(enrollment: EnrollmentCreate):
-    """Create a new enrollment"""
+@enrollment_router.post(
+    "/",
+    response_model=Enrollment,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_202_ACCEPTED: {"model": WaitlistEntry, "description": "Course full, student added to the waitlist"},
+        status.HTTP_409_CONFLICT: {"description": "Course full and waitlist=false"}
+    }
+)
+def create_new_enrollment(
+    enrollment: EnrollmentCreate,
+    waitlist: bool = Query(True, description="Join the course waitlist if it is full")
+):
+    """Create a new enrollment, or join the waitlist when the course is full"""
     try:
-        new_enrollment = create_enrollment(enrollment)
+        new_enrollment = create_enrollment(enrollment, join_waitlist=waitlist)
         return new_enrollment
+    except CourseFullError as e:
+        if e.waitlist_entry is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=str(e)
+            )
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=jsonable_encoder(e.waitlist_entry))
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -199,9 +257,14 @@ def create_new_enrollment(enrollment: EnrollmentCreate):
         )
 
 @enrollment_router.get("/", response_model=List[Enrollment])
-def read_enrollments():
-    """Get all enrollments"""
-    return get_all_enrollments()
+def read_enrollments(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = Query(False, description="Stream every enrollment from the cursor onwards as NDJSON")
+):
+    """Get enrollments one page at a time (next page cursor in the X-Next-Cursor header)"""
+    return list_response(get_enrollments_page, cursor, limit, stream, response)
 
 @enrollment_router.get("/{enrollment_id}", response_model=Enrollment)
 def read_enrollment(enrollment_id: int):
@@ -226,6 +289,22 @@ def read_enrollments_by_course(course_id: int):
     enrollments = get_enrollments_by_course(course_id)
     return enrollments
 
+@enrollment_router.get("/waitlist/course/{course_id}", response_model=List[WaitlistEntry])
+def read_course_waitlist(course_id: int):
+    """Get the waitlist of a course, first in line first"""
+    return get_waitlist(course_id)
+
+@enrollment_router.delete("/waitlist/{entry_id}")
+def delete_waitlist_entry(entry_id: int):
+    """Remove a student from a course waitlist"""
+    success = leave_waitlist(entry_id)
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Waitlist entry with ID {entry_id} not found"
+        )
+    return {"message": f"Waitlist entry with ID {entry_id} has been removed successfully"}
+
 @enrollment_router.put("/{enrollment_id}", response_model=Enrollment)
 def update_existing_enrollment(enrollment_id: int, enrollment_update: EnrollmentUpdate):
     """Update an enrollment by ID (typically to assign/update grade)"""
@@ -239,7 +318,7 @@ def update_existing_enrollment(enrollment_id: int, enrollment_update: Enrollment
 
 @enrollment_router.delete("/{enrollment_id}")
 def delete_existing_enrollment(enrollment_id: int):
-    """Delete an enrollment by ID"""
+    """Delete an enrollment by ID (the first waitlisted student takes the freed seat)"""
     success = delete_enrollment(enrollment_id)
     if not success:
         raise HTTPException(
@@ -249,8 +328,38 @@ def delete_existing_enrollment(enrollment_id: int):
     return {"message": f"Enrollment with ID {enrollment_id} has been deleted successfully"}
 
 
+# Bulk import endpoints
+import_router = APIRouter(prefix="/import", tags=["import"])
+
+@import_router.post("/{entity}")
+def bulk_import(
+    entity: Literal["students", "courses", "professors", "enrollments"],
+    file: UploadFile = File(..., description="CSV with a header row, or JSON Lines"),
+    file_format: Optional[Literal["csv", "jsonl"]] = Query(None, alias="format", description="Defaults to the file extension"),
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=MAX_BATCH_SIZE, description="Rows written per transaction")
+):
+    """Import many records from a CSV or JSONL file in batched transactions"""
+    file_format = file_format or detect_format(file.filename or "")
+    if file_format not in SUPPORTED_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported import format '{file_format}', expected one of {list(SUPPORTED_FORMATS)}"
+        )
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return import_records(entity, stream, file_format, batch_size)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not read uploaded file: {e}"
+        )
+    finally:
+        stream.detach()
+
+
 # Include routers in the main application
 app.include_router(student_router)
 app.include_router(course_router)
 app.include_router(professor_router)
-app.include_router(enrollment_router)
\ No newline at end of file
+app.include_router(enrollment_router)
+app.include_router(import_router)
\ No newline at end of file
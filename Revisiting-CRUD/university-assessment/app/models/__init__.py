@@ -12,6 +12,7 @@ from .student import (
     create_student,
     get_student,
     get_all_students,
+    get_students_page,
     update_student,
     delete_student
 )
@@ -23,6 +24,7 @@ from .course import (
     create_course,
     get_course,
     get_all_courses,
+    get_courses_page,
     update_course,
     delete_course
 )
@@ -33,14 +35,22 @@ from .enrollment import (
     EnrollmentCreate,
     EnrollmentUpdate,
     GradeEnum,
+    WaitlistEntry,
+    CourseSeats,
+    CourseFullError,
     create_enrollment,
     get_enrollment,
     get_all_enrollments,
+    get_enrollments_page,
     get_enrollments_by_student,
     get_enrollments_by_course,
     update_enrollment,
     delete_enrollment,
-    get_enrollment_by_student_course
+    get_enrollment_by_student_course,
+    promote_waitlist,
+    get_waitlist,
+    leave_waitlist,
+    get_seat_status
 )
 
 __all__ = [
@@ -51,6 +61,7 @@ __all__ = [
     "create_student",
     "get_student",
     "get_all_students",
+    "get_students_page",
     "update_student",
     "delete_student",
     "Course",
@@ -59,6 +70,7 @@ __all__ = [
     "create_course",
     "get_course",
     "get_all_courses",
+    "get_courses_page",
     "update_course",
     "delete_course",
     "Enrollment",
@@ -66,12 +78,20 @@ __all__ = [
     "EnrollmentCreate",
     "EnrollmentUpdate",
     "GradeEnum",
+    "WaitlistEntry",
+    "CourseSeats",
+    "CourseFullError",
     "create_enrollment",
     "get_enrollment",
     "get_all_enrollments",
+    "get_enrollments_page",
     "get_enrollments_by_student",
     "get_enrollments_by_course",
     "update_enrollment",
     "delete_enrollment",
-    "get_enrollment_by_student_course"
+    "get_enrollment_by_student_course",
+    "promote_waitlist",
+    "get_waitlist",
+    "leave_waitlist",
+    "get_seat_status"
 ]
\ No newline at end of file
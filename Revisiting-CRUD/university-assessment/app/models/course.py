@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Dict, Optional   
+from typing import Optional
 from typing import List
+from repository import TableSpec, create_repository
 
 class CourseBase(BaseModel):
     """Base course model with common fields"""
@@ -39,54 +40,43 @@ class Course(CourseBase):
             }
         }
 
-# Dictionary-based database
-courses_db: Dict[int, Course] = {}
-# Counter for generating new course IDs
-next_course_id = 1
+# Course storage (SQLite or in-memory, see repository.py), indexed by professor
+courses_repo = create_repository(TableSpec(name="courses", model=Course, indexes=(("professor_id",),)))
 
 
-def get_next_course_id() -> int:   
-    """Generate the next available course ID"""
-    global next_course_id
-    current_id = next_course_id
-    next_course_id += 1
-    return current_id
-
 def create_course(course_data: CourseCreate) -> Course:
     """Create a new course and add it to the database"""
-    global courses_db
-    course_id = get_next_course_id()
-    new_course = Course(id=course_id, **course_data.dict())
-    courses_db[course_id] = new_course
-    return new_course
+    return courses_repo.insert(course_data.model_dump())
 
 def get_course(course_id: int) -> Optional[Course]:
     """Retrieve a course by its ID"""
-    return courses_db.get(course_id)
+    return courses_repo.get(course_id)
 
 def get_all_courses() -> List[Course]:
     """Get a list of all courses"""
-    return list(courses_db.values())
+    return courses_repo.all()
+
+def get_courses_page(after_id: int, limit: int) -> List[Course]:
+    """Get up to `limit` courses with ID greater than `after_id`, in ID order"""
+    return courses_repo.page(after_id, limit)
+
+def get_courses_by_professor(professor_id: int) -> List[Course]:
+    """Get all courses taught by a professor"""
+    return courses_repo.find(professor_id=professor_id)
 
 def update_course(course_id: int, course_update: CourseUpdate) -> Optional[Course]:
     """Update an existing course by its ID"""
-    global courses_db
-    if course_id not in courses_db:
-        return None
-    existing_course = courses_db[course_id]
-    updated_data = existing_course.model_dump(exclude_unset=True)
-    updated_data.update(course_update.model_dump(exclude_unset=True))
-    updated_course = Course(id=course_id, **updated_data)
-    courses_db[course_id] = updated_course
-    return updated_course
+    return courses_repo.update(course_id, course_update.model_dump(exclude_unset=True))
 
 def delete_course(course_id: int) -> bool:
-    """Delete a course by its ID"""
-    global courses_db
-    if course_id in courses_db:
-        del courses_db[course_id]
-        return True
-    return False
+    """Delete a course by its ID, along with its seat counter and waitlist"""
+    # Imported here: the enrollment module imports this one for course capacities
+    from .enrollment import forget_course
+
+    if not courses_repo.delete(course_id):
+        return False
+    forget_course(course_id)
+    return True
 
 
 # Sample data for testing
@@ -101,4 +91,5 @@ def populate_sample_data():
     """Populate the database with sample courses"""
     sample_courses()
     return get_all_courses()
-populate_sample_data()  # Call to populate sample data on module load
+if courses_repo.count() == 0:
+    populate_sample_data()  # Call to populate sample data on module load (once for a persistent database)
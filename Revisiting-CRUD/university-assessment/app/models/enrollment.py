@@ -1,7 +1,10 @@
 from datetime import datetime
 from pydantic import BaseModel, Field, validator
-from typing import Dict, Optional, List
+from typing import Optional, List
 from enum import Enum
+from capacity import create_seat_counters
+from repository import DuplicateRecordError, TableSpec, create_repository
+from .course import get_course
 
 
 class GradeEnum(str, Enum):
@@ -69,86 +72,196 @@ class Enrollment(EnrollmentBase):
         }
 
 
-# Dictionary-based database
-enrollments_db: Dict[int, Enrollment] = {}
+class WaitlistEntry(BaseModel):
+    """A student waiting for a seat in a full course"""
+    id: int = Field(..., description="Unique waitlist entry ID (also the queue order)")
+    student_id: int = Field(..., description="ID of the waiting student")
+    course_id: int = Field(..., description="ID of the full course")
+    requested_at: datetime = Field(default_factory=datetime.now, description="When the student joined the waitlist")
+
+
+class CourseSeats(BaseModel):
+    """Seat usage of a course"""
+    course_id: int
+    max_capacity: Optional[int] = Field(None, description="None for courses that do not exist")
+    enrolled: int
+    available: Optional[int] = None
+    waitlisted: int
+
+
+class CourseFullError(ValueError):
+    """Raised when a course has no free seats; carries the waitlist entry if the student joined it"""
+
+    def __init__(self, course_id: int, waitlist_entry: Optional[WaitlistEntry] = None):
+        self.course_id = course_id
+        self.waitlist_entry = waitlist_entry
+        super().__init__(f"Course {course_id} is full")
+
+
+# Enrollment storage (SQLite or in-memory, see repository.py).
+# The unique (student_id, course_id) index backs the duplicate check and the
+# per-student / per-course indexes back the lookup endpoints.
+enrollments_repo = create_repository(TableSpec(
+    name="enrollments",
+    model=Enrollment,
+    indexes=(("student_id",), ("course_id",)),
+    unique=(("student_id", "course_id"),)
+))
+
+# Per-course waitlists, served in entry ID order
+waitlist_repo = create_repository(TableSpec(
+    name="waitlist",
+    model=WaitlistEntry,
+    indexes=(("course_id",),),
+    unique=(("student_id", "course_id"),)
+))
+
+# Taken seats per course, checked and updated atomically with the enrollment writes
+seat_counters = create_seat_counters(lambda course_id: len(enrollments_repo.find(course_id=course_id)))
+
+
+def _course_capacity(course_id: int) -> Optional[int]:
+    # Enrollments in unknown courses are not capacity-checked but still counted
+    course = get_course(course_id)
+    return course.max_capacity if course is not None else None
+
+
+def create_enrollment(enrollment_data: EnrollmentCreate, join_waitlist: bool = False) -> Enrollment:
+    """Create a new enrollment in the database.
+
+    Raises CourseFullError when the course has no free seat; with
+    join_waitlist the student is queued first and the entry is attached to
+    the error.
+    """
+    student_id, course_id = enrollment_data.student_id, enrollment_data.course_id
+    with seat_counters.guard(course_id):
+        # Check if student is already enrolled in this course
+        if get_enrollment_by_student_course(student_id, course_id) is not None:
+            raise ValueError(f"Student {student_id} is already enrolled in course {course_id}")
+
+        if seat_counters.try_reserve(course_id, _course_capacity(course_id)):
+            try:
+                enrollment = enrollments_repo.insert(enrollment_data.model_dump())
+            except Exception:
+                # The memory engine has no transaction to roll the seat back
+                seat_counters.release(course_id)
+                raise
+            for entry in waitlist_repo.find(student_id=student_id, course_id=course_id):
+                waitlist_repo.delete(entry.id)
+            return enrollment
 
-# Counter for generating new enrollment IDs
-next_enrollment_id = 1
+        entry = None
+        if join_waitlist and not waitlist_repo.find(student_id=student_id, course_id=course_id):
+            entry = waitlist_repo.insert({"student_id": student_id, "course_id": course_id})
 
+    # Raised outside the guard so the waitlist entry is committed
+    if join_waitlist and entry is None:
+        raise ValueError(f"Student {student_id} is already on the waitlist for course {course_id}")
+    raise CourseFullError(course_id, entry)
 
-def get_next_enrollment_id() -> int:
-    """Generate the next available enrollment ID"""
-    global next_enrollment_id
-    current_id = next_enrollment_id
-    next_enrollment_id += 1
-    return current_id
 
+def _promote_waitlisted(course_id: int) -> List[Enrollment]:
+    # Caller holds the course guard
+    promoted = []
+    capacity = _course_capacity(course_id)
+    for entry in waitlist_repo.find(course_id=course_id):
+        if not seat_counters.try_reserve(course_id, capacity):
+            break
+        waitlist_repo.delete(entry.id)
+        try:
+            promoted.append(enrollments_repo.insert({"student_id": entry.student_id, "course_id": course_id}))
+        except DuplicateRecordError:
+            seat_counters.release(course_id)
+    return promoted
 
-def create_enrollment(enrollment_data: EnrollmentCreate) -> Enrollment:
-    """Create a new enrollment in the database"""
-    # Check if student is already enrolled in this course
-    for enrollment in enrollments_db.values():
-        if (enrollment.student_id == enrollment_data.student_id and 
-            enrollment.course_id == enrollment_data.course_id):
-            raise ValueError(f"Student {enrollment_data.student_id} is already enrolled in course {enrollment_data.course_id}")
-    
-    enrollment_id = get_next_enrollment_id()
-    enrollment = Enrollment(id=enrollment_id, **enrollment_data.dict())
-    enrollments_db[enrollment_id] = enrollment
-    return enrollment
+
+def promote_waitlist(course_id: int) -> List[Enrollment]:
+    """Enroll waitlisted students into any free seats (e.g. after a capacity increase)"""
+    with seat_counters.guard(course_id):
+        return _promote_waitlisted(course_id)
+
+
+def get_waitlist(course_id: int) -> List[WaitlistEntry]:
+    """Get the waitlist of a course, first in line first"""
+    return waitlist_repo.find(course_id=course_id)
+
+
+def leave_waitlist(entry_id: int) -> bool:
+    """Remove a waitlist entry"""
+    return waitlist_repo.delete(entry_id)
+
+
+def forget_course(course_id: int):
+    """Drop the seat counter and waitlist of a deleted course"""
+    with seat_counters.guard(course_id):
+        for entry in waitlist_repo.find(course_id=course_id):
+            waitlist_repo.delete(entry.id)
+        seat_counters.resync([course_id])
+
+
+def get_seat_status(course_id: int) -> CourseSeats:
+    """Seat usage and waitlist length of a course"""
+    with seat_counters.guard(course_id):
+        capacity = _course_capacity(course_id)
+        taken = seat_counters.taken(course_id)
+        return CourseSeats(
+            course_id=course_id,
+            max_capacity=capacity,
+            enrolled=taken,
+            available=max(capacity - taken, 0) if capacity is not None else None,
+            waitlisted=len(waitlist_repo.find(course_id=course_id))
+        )
 
 
 def get_enrollment(enrollment_id: int) -> Optional[Enrollment]:
     """Get an enrollment by ID"""
-    return enrollments_db.get(enrollment_id)
+    return enrollments_repo.get(enrollment_id)
 
 
 def get_all_enrollments() -> List[Enrollment]:
     """Get all enrollments"""
-    return list(enrollments_db.values())
+    return enrollments_repo.all()
+
+
+def get_enrollments_page(after_id: int, limit: int) -> List[Enrollment]:
+    """Get up to `limit` enrollments with ID greater than `after_id`, in ID order"""
+    return enrollments_repo.page(after_id, limit)
 
 
 def get_enrollments_by_student(student_id: int) -> List[Enrollment]:
     """Get all enrollments for a specific student"""
-    return [enrollment for enrollment in enrollments_db.values() 
-            if enrollment.student_id == student_id]
+    return enrollments_repo.find(student_id=student_id)
 
 
 def get_enrollments_by_course(course_id: int) -> List[Enrollment]:
     """Get all enrollments for a specific course"""
-    return [enrollment for enrollment in enrollments_db.values() 
-            if enrollment.course_id == course_id]
+    return enrollments_repo.find(course_id=course_id)
 
 
 def update_enrollment(enrollment_id: int, enrollment_update: EnrollmentUpdate) -> Optional[Enrollment]:
     """Update an enrollment by ID"""
-    if enrollment_id not in enrollments_db:
-        return None
-    
-    enrollment = enrollments_db[enrollment_id]
-    update_data = enrollment_update.dict(exclude_unset=True)
-    
-    for field, value in update_data.items():
-        setattr(enrollment, field, value)
-    
-    enrollments_db[enrollment_id] = enrollment
-    return enrollment
+    return enrollments_repo.update(enrollment_id, enrollment_update.model_dump(exclude_unset=True))
 
 
 def delete_enrollment(enrollment_id: int) -> bool:
-    """Delete an enrollment by ID"""
-    if enrollment_id in enrollments_db:
-        del enrollments_db[enrollment_id]
-        return True
-    return False
+    """Delete an enrollment by ID, promoting the first waitlisted student into the freed seat"""
+    enrollment = enrollments_repo.get(enrollment_id)
+    if enrollment is None:
+        return False
+    with seat_counters.guard(enrollment.course_id):
+        # Release before deleting so a counter seeded here still includes this enrollment
+        if enrollments_repo.get(enrollment_id) is None:
+            return False
+        seat_counters.release(enrollment.course_id)
+        enrollments_repo.delete(enrollment_id)
+        _promote_waitlisted(enrollment.course_id)
+    return True
 
 
 def get_enrollment_by_student_course(student_id: int, course_id: int) -> Optional[Enrollment]:
     """Get enrollment by student ID and course ID"""
-    for enrollment in enrollments_db.values():
-        if enrollment.student_id == student_id and enrollment.course_id == course_id:
-            return enrollment
-    return None
+    matches = enrollments_repo.find(student_id=student_id, course_id=course_id)
+    return matches[0] if matches else None
 
 
 # Sample data for testing
@@ -197,5 +310,6 @@ def populate_sample_data():
         update_enrollment(3, EnrollmentUpdate(grade=GradeEnum.A_MINUS))
 
 
-# Initialize with sample data
-populate_sample_data()
+# Initialize with sample data (only once for a persistent database)
+if enrollments_repo.count() == 0:
+    populate_sample_data()
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Dict, List, Optional
+from typing import List, Optional
+from repository import TableSpec, create_repository
 
 
 class ProfessorBase(BaseModel):
@@ -35,50 +36,32 @@ class Professor(ProfessorBase):
             }
         }
 
-# Dictionary-based database
-professors_db: Dict[int, Professor] = {}    
-
-# Counter for generating new professor IDs
-next_professor_id = 1
-
-def get_next_professor_id() -> int:
-    """Generate the next available professor ID"""
-    global next_professor_id
-    current_id = next_professor_id
-    next_professor_id += 1
-    return current_id
+# Professor storage (SQLite or in-memory, see repository.py)
+professors_repo = create_repository(TableSpec(name="professors", model=Professor))
 
 def create_professor(professor_data: ProfessorCreate) -> Professor:
     """Create a new professor and add it to the database"""
-    global professors_db
-    professor_id = get_next_professor_id()
-    new_professor = Professor(id=professor_id, **professor_data.dict())
-    professors_db[professor_id] = new_professor
-    return new_professor
+    return professors_repo.insert(professor_data.model_dump())
 
 def get_professor(professor_id: int) -> Optional[Professor]:
     """Retrieve a professor by ID"""
-    return professors_db.get(professor_id)
+    return professors_repo.get(professor_id)
 
 def get_all_professors() -> List[Professor]:
     """Retrieve all professors"""
-    return list(professors_db.values())
+    return professors_repo.all()
+
+def get_professors_page(after_id: int, limit: int) -> List[Professor]:
+    """Get up to `limit` professors with ID greater than `after_id`, in ID order"""
+    return professors_repo.page(after_id, limit)
 
 def update_professor(professor_id: int, professor_update: ProfessorUpdate) -> Optional[Professor]:
     """Update a professor's information"""
-    if professor_id not in professors_db:
-        return None
-    existing_professor = professors_db[professor_id]
-    updated_data = existing_professor.copy(update=professor_update.dict(exclude_unset=True))
-    professors_db[professor_id] = updated_data
-    return updated_data
+    return professors_repo.update(professor_id, professor_update.model_dump(exclude_unset=True))
 
 def delete_professor(professor_id: int) -> bool:
     """Delete a professor by ID"""
-    if professor_id in professors_db:
-        del professors_db[professor_id]
-        return True
-    return False
+    return professors_repo.delete(professor_id)
 
 __all__ = [
     "Professor",
@@ -100,9 +83,10 @@ def sample_professors() -> List[Professor]:
         Professor(id=3, name="Dr. Emily Johnson", email="dr.emily.johnson@example.com", department="Physics", hire_date="2021-07-30")
     ]
     
-def populate_sample_data() -> Dict[int, Professor]:
+def populate_sample_data() -> List[Professor]:
     """Populate the database with sample professors"""  
     for professor in sample_professors():
-        professors_db[professor.id] = professor
-    return professors_db
-populate_sample_data()
+        professors_repo.insert(professor.model_dump(exclude={"id"}), record_id=professor.id)
+    return get_all_professors()
+if professors_repo.count() == 0:
+    populate_sample_data()
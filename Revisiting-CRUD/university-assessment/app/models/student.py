@@ -1,5 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Dict, Optional
+from typing import List, Optional
+from repository import TableSpec, create_repository
 
 
 class StudentBase(BaseModel):
@@ -42,60 +43,38 @@ class Student(StudentBase):
         }
 
 
-# Dictionary-based database
-students_db: Dict[int, Student] = {}
-
-# Counter for generating new student IDs
-next_student_id = 1
-
-
-def get_next_id() -> int:
-    """Generate the next available student ID"""
-    global next_student_id
-    current_id = next_student_id
-    next_student_id += 1
-    return current_id
+# Student storage (SQLite or in-memory, see repository.py)
+students_repo = create_repository(TableSpec(name="students", model=Student))
 
 
 def create_student(student_data: StudentCreate) -> Student:
     """Create a new student in the database"""
-    student_id = get_next_id()
-    student = Student(id=student_id, **student_data.dict())
-    students_db[student_id] = student
-    return student
+    return students_repo.insert(student_data.model_dump())
 
 
 def get_student(student_id: int) -> Optional[Student]:
     """Get a student by ID"""
-    return students_db.get(student_id)
+    return students_repo.get(student_id)
 
 
 def get_all_students() -> list[Student]:
     """Get all students"""
-    return list(students_db.values())
+    return students_repo.all()
+
+
+def get_students_page(after_id: int, limit: int) -> List[Student]:
+    """Get up to `limit` students with ID greater than `after_id`, in ID order"""
+    return students_repo.page(after_id, limit)
 
 
 def update_student(student_id: int, student_update: StudentUpdate) -> Optional[Student]:
     """Update a student by ID"""
-    if student_id not in students_db:
-        return None
-    
-    student = students_db[student_id]
-    update_data = student_update.dict(exclude_unset=True)
-    
-    for field, value in update_data.items():
-        setattr(student, field, value)
-    
-    students_db[student_id] = student
-    return student
+    return students_repo.update(student_id, student_update.model_dump(exclude_unset=True))
 
 
 def delete_student(student_id: int) -> bool:
     """Delete a student by ID"""
-    if student_id in students_db:
-        del students_db[student_id]
-        return True
-    return False
+    return students_repo.delete(student_id)
 
 
 # Sample data for testing
@@ -129,5 +108,6 @@ def populate_sample_data():
         create_student(student_data)
 
 
-# Initialize with sample data
-populate_sample_data()
\ No newline at end of file
+# Initialize with sample data (only once for a persistent database)
+if students_repo.count() == 0:
+    populate_sample_data()
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Keyset (cursor) pagination and NDJSON streaming for list endpoints.
+
+Pages are fetched with ``fetch_page(after_id, limit)`` callables, so list
+endpoints never materialise more than one page of records at a time.
+"""
+
+import base64
+import binascii
+import json
+from bisect import bisect_right
+from typing import Callable, Dict, Iterator, List, Optional, TypeVar
+
+from fastapi import HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+T = TypeVar("T", bound=BaseModel)
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+FetchPage = Callable[[int, int], List[T]]
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the last ID of a page as an opaque cursor"""
+    payload = json.dumps({"after": last_id}).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """Decode a cursor back to the ID to resume after (0 for the first page)"""
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        after_id = json.loads(base64.urlsafe_b64decode(padded))["after"]
+        if not isinstance(after_id, int) or after_id < 0:
+            raise ValueError(after_id)
+        return after_id
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def dict_page(db: Dict[int, T], sorted_ids: List[int], after_id: int, limit: int) -> List[T]:
+    """Return up to ``limit`` records with ID greater than ``after_id``.
+
+    ``sorted_ids`` holds the keys of ``db`` in ascending order, so the page
+    starts at a bisect and costs O(log N + limit), however many IDs were
+    deleted before it.
+    """
+    start = bisect_right(sorted_ids, after_id)
+    return [db[record_id] for record_id in sorted_ids[start:start + limit]]
+
+
+def paginate(fetch_page: FetchPage, cursor: Optional[str], limit: int,
+             response: Response) -> List[T]:
+    """Return one page and expose the cursor for the next one in a response header"""
+    page = fetch_page(decode_cursor(cursor), limit + 1)
+    if len(page) > limit:
+        page = page[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(page[-1].id)
+    return page
+
+
+def iter_records(fetch_page: FetchPage, after_id: int,
+                 batch_size: int = MAX_PAGE_SIZE) -> Iterator[T]:
+    """Lazily yield every record after ``after_id``, one batch in memory at a time"""
+    while True:
+        page = fetch_page(after_id, batch_size)
+        yield from page
+        if len(page) < batch_size:
+            return
+        after_id = page[-1].id
+
+
+def ndjson_response(fetch_page: FetchPage, cursor: Optional[str]) -> StreamingResponse:
+    """Stream every record from the cursor onwards as newline-delimited JSON"""
+    after_id = decode_cursor(cursor)
+
+    def serialize() -> Iterator[str]:
+        for record in iter_records(fetch_page, after_id):
+            yield record.model_dump_json() + "\n"
+
+    return StreamingResponse(serialize(), media_type="application/x-ndjson")
+
+
+def list_response(fetch_page: FetchPage, cursor: Optional[str], limit: int,
+                  stream: bool, response: Response):
+    """Shared body of the paginated list endpoints"""
+    if stream:
+        return ndjson_response(fetch_page, cursor)
+    return paginate(fetch_page, cursor, limit, response)
+
+
+__all__ = [
+    "DEFAULT_PAGE_SIZE",
+    "MAX_PAGE_SIZE",
+    "NEXT_CURSOR_HEADER",
+    "encode_cursor",
+    "decode_cursor",
+    "dict_page",
+    "paginate",
+    "iter_records",
+    "ndjson_response",
+    "list_response"
+]
@@ -0,0 +1,441 @@
+"""
+Pluggable storage layer for the University Assessment API.
+
+Every model module keeps its public create_*/get_*/update_*/delete_* functions
+and delegates persistence to a Repository built from a TableSpec. Two engines
+are available:
+
+- "sqlite" (default): SQLite in WAL mode behind a small connection pool, so
+  data survives restarts and several uvicorn workers can share one database.
+- "memory": dictionaries with hash indexes, handy for tests and benchmarks.
+
+The engine is chosen with the UNIVERSITY_STORAGE environment variable and the
+database file with UNIVERSITY_DB_PATH.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+from pagination import dict_page
+
+STORAGE_ENGINE = os.getenv("UNIVERSITY_STORAGE", "sqlite")
+DB_PATH = os.getenv(
+    "UNIVERSITY_DB_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "university.db")
+)
+POOL_SIZE = int(os.getenv("UNIVERSITY_DB_POOL_SIZE", "8"))
+
+
+class DuplicateRecordError(ValueError):
+    """Raised when an insert would violate a unique index"""
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """Describes how a model is stored: table name, model class and indexes"""
+    name: str
+    model: Type[BaseModel]
+    indexes: Tuple[Tuple[str, ...], ...] = ()
+    unique: Tuple[Tuple[str, ...], ...] = ()
+
+    @property
+    def columns(self) -> List[str]:
+        return [field for field in self.model.model_fields if field != "id"]
+
+
+class Repository(ABC):
+    """Storage interface used by the model modules"""
+
+    def __init__(self, spec: TableSpec):
+        self.spec = spec
+        self.model = spec.model
+
+    @abstractmethod
+    def insert(self, data: Dict[str, Any], record_id: Optional[int] = None) -> BaseModel:
+        """Validate and store a new record, assigning an ID unless one is given"""
+
+    @abstractmethod
+    def insert_many(self, rows: List[Dict[str, Any]]) -> int:
+        """Store many records in one batch, skipping unique-index conflicts; returns rows inserted"""
+
+    @abstractmethod
+    def get(self, record_id: int) -> Optional[BaseModel]:
+        """Get a record by ID"""
+
+    @abstractmethod
+    def all(self) -> List[BaseModel]:
+        """Get every record in ID order"""
+
+    @abstractmethod
+    def page(self, after_id: int, limit: int) -> List[BaseModel]:
+        """Get up to `limit` records with ID greater than `after_id`, in ID order"""
+
+    @abstractmethod
+    def find(self, **criteria: Any) -> List[BaseModel]:
+        """Get the records whose fields equal the given values, in ID order"""
+
+    @abstractmethod
+    def update(self, record_id: int, changes: Dict[str, Any]) -> Optional[BaseModel]:
+        """Apply field changes to a record; returns None if it does not exist"""
+
+    @abstractmethod
+    def delete(self, record_id: int) -> bool:
+        """Delete a record; returns False if it does not exist"""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of stored records"""
+
+
+# ===== IN-MEMORY ENGINE =====
+
+class MemoryRepository(Repository):
+    """Dictionary-based storage with hash indexes on the TableSpec index columns"""
+
+    def __init__(self, spec: TableSpec):
+        super().__init__(spec)
+        self._lock = threading.RLock()
+        self._records: Dict[int, BaseModel] = {}
+        # Record IDs in ascending order, for keyset pagination
+        self._ids: List[int] = []
+        self._next_id = 1
+        # index columns -> key values -> insertion-ordered set of record IDs
+        self._indexes: Dict[Tuple[str, ...], Dict[Tuple, Dict[int, None]]] = {
+            columns: {} for columns in spec.indexes + spec.unique
+        }
+
+    def _key(self, record: BaseModel, columns: Tuple[str, ...]) -> Tuple:
+        return tuple(getattr(record, column) for column in columns)
+
+    def _index(self, record: BaseModel):
+        for columns, index in self._indexes.items():
+            index.setdefault(self._key(record, columns), {})[record.id] = None
+
+    def _unindex(self, record: BaseModel):
+        for columns, index in self._indexes.items():
+            key = self._key(record, columns)
+            members = index[key]
+            members.pop(record.id, None)
+            if not members:
+                del index[key]
+
+    def _check_unique(self, record: BaseModel):
+        for columns in self.spec.unique:
+            members = self._indexes[columns].get(self._key(record, columns), {})
+            if any(member != record.id for member in members):
+                raise DuplicateRecordError(
+                    f"{self.spec.name} with {dict(zip(columns, self._key(record, columns)))} already exists"
+                )
+
+    def insert(self, data: Dict[str, Any], record_id: Optional[int] = None) -> BaseModel:
+        with self._lock:
+            record_id = record_id or self._next_id
+            record = self.model(**{**data, "id": record_id})
+            self._check_unique(record)
+            if record_id in self._records:
+                self._unindex(self._records[record_id])
+            elif not self._ids or record_id > self._ids[-1]:
+                self._ids.append(record_id)
+            else:
+                insort(self._ids, record_id)
+            self._records[record_id] = record
+            self._index(record)
+            self._next_id = max(self._next_id, record_id + 1)
+            return record
+
+    def insert_many(self, rows: List[Dict[str, Any]]) -> int:
+        inserted = 0
+        with self._lock:
+            for data in rows:
+                try:
+                    self.insert(data)
+                    inserted += 1
+                except DuplicateRecordError:
+                    continue
+        return inserted
+
+    def get(self, record_id: int) -> Optional[BaseModel]:
+        return self._records.get(record_id)
+
+    def all(self) -> List[BaseModel]:
+        return list(self._records.values())
+
+    def page(self, after_id: int, limit: int) -> List[BaseModel]:
+        with self._lock:
+            return dict_page(self._records, self._ids, after_id, limit)
+
+    def find(self, **criteria: Any) -> List[BaseModel]:
+        columns = tuple(criteria)
+        index = self._indexes.get(columns)
+        if index is not None:
+            ids = index.get(tuple(criteria.values()), ())
+            return [self._records[record_id] for record_id in sorted(ids)]
+        return [
+            record for record in self._records.values()
+            if all(getattr(record, column) == value for column, value in criteria.items())
+        ]
+
+    def update(self, record_id: int, changes: Dict[str, Any]) -> Optional[BaseModel]:
+        with self._lock:
+            current = self._records.get(record_id)
+            if current is None:
+                return None
+            updated = self.model(**{**current.model_dump(), **changes, "id": record_id})
+            self._check_unique(updated)
+            self._unindex(current)
+            self._records[record_id] = updated
+            self._index(updated)
+            return updated
+
+    def delete(self, record_id: int) -> bool:
+        with self._lock:
+            record = self._records.pop(record_id, None)
+            if record is None:
+                return False
+            del self._ids[bisect_left(self._ids, record_id)]
+            self._unindex(record)
+            return True
+
+    def count(self) -> int:
+        return len(self._records)
+
+
+# ===== SQLITE ENGINE =====
+
+class ConnectionPool:
+    """Fixed-size pool of SQLite connections in WAL mode, shared across threads"""
+
+    def __init__(self, path: str, size: int = POOL_SIZE):
+        self.path = path
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=size)
+        # Connection of the transaction open on the current thread, if any
+        self._local = threading.local()
+        for _ in range(size):
+            self._pool.put(self._connect())
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None: autocommit reads, explicit BEGIN for writes.
+        # cached_statements keeps the parameterised SQL of every repository prepared.
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None,
+                               cached_statements=256)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection, reusing the current thread's open transaction if any"""
+        active = getattr(self._local, "conn", None)
+        if active is not None:
+            yield active
+            return
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def transaction(self, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        """Run a block in one transaction; IMMEDIATE takes the write lock up front.
+
+        Nested calls on the same thread join the outer transaction, so several
+        repository operations can be committed atomically.
+        """
+        active = getattr(self._local, "conn", None)
+        if active is not None:
+            yield active
+            return
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            self._local.conn = conn
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            finally:
+                self._local.conn = None
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+def _sqlite_type(annotation: Any) -> str:
+    if get_origin(annotation) is Union:
+        annotation = next(arg for arg in get_args(annotation) if arg is not type(None))
+    if annotation is int or annotation is bool:
+        return "INTEGER"
+    if annotation is float:
+        return "REAL"
+    return "TEXT"
+
+
+class SQLiteRepository(Repository):
+    """SQLite-backed storage; one table per model with indexes from the TableSpec"""
+
+    def __init__(self, spec: TableSpec, pool: ConnectionPool):
+        super().__init__(spec)
+        self.pool = pool
+        self.columns = spec.columns
+        name = spec.name
+        column_list = ", ".join(self.columns)
+        placeholders = ", ".join("?" for _ in self.columns)
+
+        # SQL is built once so sqlite3's statement cache reuses the prepared statements
+        self._select = f"SELECT id, {column_list} FROM {name}"
+        self._sql_insert = f"INSERT INTO {name} ({column_list}) VALUES ({placeholders})"
+        self._sql_insert_with_id = f"INSERT INTO {name} (id, {column_list}) VALUES (?, {placeholders})"
+        self._sql_insert_ignore = f"INSERT OR IGNORE INTO {name} ({column_list}) VALUES ({placeholders})"
+        self._sql_get = f"{self._select} WHERE id = ?"
+        self._sql_all = f"{self._select} ORDER BY id"
+        self._sql_page = f"{self._select} WHERE id > ? ORDER BY id LIMIT ?"
+        self._sql_update = f"UPDATE {name} SET {', '.join(f'{c} = ?' for c in self.columns)} WHERE id = ?"
+        self._sql_delete = f"DELETE FROM {name} WHERE id = ?"
+        self._sql_count = f"SELECT COUNT(*) FROM {name}"
+        self._sql_find: Dict[Tuple[str, ...], str] = {}
+
+        self._create_schema()
+
+    def _create_schema(self):
+        column_defs = ", ".join(
+            f"{column} {_sqlite_type(self.model.model_fields[column].annotation)}"
+            for column in self.columns
+        )
+        with self.pool.transaction() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.spec.name} "
+                f"(id INTEGER PRIMARY KEY AUTOINCREMENT, {column_defs})"
+            )
+            for columns, unique in [(c, False) for c in self.spec.indexes] + [(c, True) for c in self.spec.unique]:
+                conn.execute(
+                    f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS "
+                    f"idx_{self.spec.name}_{'_'.join(columns)} ON {self.spec.name} ({', '.join(columns)})"
+                )
+
+    def _validate(self, data: Dict[str, Any], record_id: int = 0) -> BaseModel:
+        return self.model(**{**data, "id": record_id})
+
+    def _values(self, record: BaseModel) -> List[Any]:
+        dumped = record.model_dump(mode="json")
+        return [dumped[column] for column in self.columns]
+
+    def _from_row(self, row: Tuple) -> BaseModel:
+        return self.model(id=row[0], **dict(zip(self.columns, row[1:])))
+
+    def insert(self, data: Dict[str, Any], record_id: Optional[int] = None) -> BaseModel:
+        record = self._validate(data, record_id or 0)
+        try:
+            with self.pool.transaction() as conn:
+                if record_id is None:
+                    cursor = conn.execute(self._sql_insert, self._values(record))
+                else:
+                    cursor = conn.execute(self._sql_insert_with_id, [record_id, *self._values(record)])
+        except sqlite3.IntegrityError as e:
+            raise DuplicateRecordError(f"{self.spec.name} record violates a unique index: {e}")
+        return record.model_copy(update={"id": cursor.lastrowid})
+
+    def insert_many(self, rows: List[Dict[str, Any]]) -> int:
+        values = [self._values(self._validate(data)) for data in rows]
+        with self.pool.transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(self._sql_insert_ignore, values)
+            return conn.total_changes - before
+
+    def get(self, record_id: int) -> Optional[BaseModel]:
+        with self.pool.connection() as conn:
+            row = conn.execute(self._sql_get, (record_id,)).fetchone()
+        return self._from_row(row) if row else None
+
+    def all(self) -> List[BaseModel]:
+        with self.pool.connection() as conn:
+            rows = conn.execute(self._sql_all).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def page(self, after_id: int, limit: int) -> List[BaseModel]:
+        with self.pool.connection() as conn:
+            rows = conn.execute(self._sql_page, (after_id, limit)).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def find(self, **criteria: Any) -> List[BaseModel]:
+        columns = tuple(criteria)
+        sql = self._sql_find.get(columns)
+        if sql is None:
+            unknown = set(columns) - set(self.columns)
+            if unknown:
+                raise ValueError(f"Unknown {self.spec.name} columns: {sorted(unknown)}")
+            where = " AND ".join(f"{column} = ?" for column in columns)
+            sql = self._sql_find[columns] = f"{self._select} WHERE {where} ORDER BY id"
+        with self.pool.connection() as conn:
+            rows = conn.execute(sql, tuple(criteria.values())).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def update(self, record_id: int, changes: Dict[str, Any]) -> Optional[BaseModel]:
+        with self.pool.transaction(immediate=True) as conn:
+            row = conn.execute(self._sql_get, (record_id,)).fetchone()
+            if row is None:
+                return None
+            current = self._from_row(row)
+            updated = self.model(**{**current.model_dump(), **changes, "id": record_id})
+            try:
+                conn.execute(self._sql_update, [*self._values(updated), record_id])
+            except sqlite3.IntegrityError as e:
+                raise DuplicateRecordError(f"{self.spec.name} record violates a unique index: {e}")
+        return updated
+
+    def delete(self, record_id: int) -> bool:
+        with self.pool.transaction() as conn:
+            return conn.execute(self._sql_delete, (record_id,)).rowcount > 0
+
+    def count(self) -> int:
+        with self.pool.connection() as conn:
+            return conn.execute(self._sql_count).fetchone()[0]
+
+
+# ===== ENGINE SELECTION =====
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Create the shared SQLite connection pool on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(DB_PATH)
+        return _pool
+
+
+def create_repository(spec: TableSpec) -> Repository:
+    """Build a repository for the configured storage engine"""
+    if STORAGE_ENGINE == "memory":
+        return MemoryRepository(spec)
+    if STORAGE_ENGINE == "sqlite":
+        return SQLiteRepository(spec, get_pool())
+    raise ValueError(f"Unknown UNIVERSITY_STORAGE engine: {STORAGE_ENGINE!r}")
+
+
+__all__ = [
+    "DuplicateRecordError",
+    "TableSpec",
+    "Repository",
+    "MemoryRepository",
+    "ConnectionPool",
+    "SQLiteRepository",
+    "get_pool",
+    "create_repository"
+]
@@ -0,0 +1,81 @@
+"""
+Bulk enrollment benchmark for the University Assessment API.
+
+Loads N enrollments through create_enrollment (duplicate check included) and
+times the indexed lookups. With the (student_id, course_id) index this is
+linear in N; the previous full-scan duplicate check made it O(N^2). Each
+insert also takes a seat from the course's seat counter, so capacity checks
+are included in the timings.
+
+Uses a throwaway SQLite database unless UNIVERSITY_DB_PATH is set; run with
+UNIVERSITY_STORAGE=memory to benchmark the in-memory engine.
+
+Usage:
+    python benchmark_enrollments.py [N]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("UNIVERSITY_DB_PATH", os.path.join(tempfile.mkdtemp(), "benchmark.db"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "app"))
+
+from models.course import CourseCreate, create_course  # noqa: E402
+from models.enrollment import (  # noqa: E402
+    EnrollmentCreate,
+    create_enrollment,
+    enrollments_repo,
+    get_enrollment_by_student_course,
+    get_enrollments_by_course,
+    get_enrollments_by_student,
+)
+
+COURSES_PER_STUDENT = 5
+NUM_COURSES = 200
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    # Offset past the sample data so every pair is new
+    student_offset = 1_000
+    course_ids = [
+        create_course(CourseCreate(name=f"Benchmark {i}", code=f"BM{i}", credits=3,
+                                   professor_id=1, max_capacity=total)).id
+        for i in range(NUM_COURSES)
+    ]
+
+    start = time.perf_counter()
+    for i in range(total):
+        student_id = student_offset + i // COURSES_PER_STUDENT
+        course_id = course_ids[(i * 7 + i // COURSES_PER_STUDENT) % NUM_COURSES]
+        create_enrollment(EnrollmentCreate(student_id=student_id, course_id=course_id))
+    load_seconds = time.perf_counter() - start
+    print(f"Loaded {total:,} enrollments in {load_seconds:.2f}s "
+          f"({total / load_seconds:,.0f} enrollments/s, store size {enrollments_repo.count():,})")
+
+    start = time.perf_counter()
+    duplicates = 0
+    for i in range(0, total, 10):
+        try:
+            student_id = student_offset + i // COURSES_PER_STUDENT
+            course_id = course_ids[(i * 7 + i // COURSES_PER_STUDENT) % NUM_COURSES]
+            create_enrollment(EnrollmentCreate(student_id=student_id, course_id=course_id))
+        except ValueError:
+            duplicates += 1
+    print(f"Rejected {duplicates:,} duplicate enrollments in {time.perf_counter() - start:.2f}s")
+
+    lookups = 10_000
+    start = time.perf_counter()
+    for i in range(lookups):
+        student_id = student_offset + i
+        get_enrollments_by_student(student_id)
+        get_enrollments_by_course(course_ids[i % NUM_COURSES])
+        get_enrollment_by_student_course(student_id, course_ids[0])
+    elapsed_us = (time.perf_counter() - start) / lookups * 1e6
+    print(f"By-student + by-course + pair lookup: {elapsed_us:.1f}µs per iteration")
+
+
+if __name__ == "__main__":
+    main()
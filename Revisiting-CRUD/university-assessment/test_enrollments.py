@@ -0,0 +1,33 @@
+"""
+Tests for enrollment seat accounting.
+
+Run with the in-memory engine, which has no transaction to undo a seat that
+was reserved for a failed insert:
+    python -m pytest test_enrollments.py
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+from pydantic import ValidationError
+
+os.environ["UNIVERSITY_STORAGE"] = "memory"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "app"))
+
+from models.course import CourseCreate, create_course  # noqa: E402
+from models.enrollment import EnrollmentCreate, create_enrollment, get_seat_status  # noqa: E402
+
+
+def test_failed_insert_gives_the_seat_back():
+    course = create_course(CourseCreate(name="Compilers", code="CS410", credits=3, professor_id=1, max_capacity=2))
+    create_enrollment(EnrollmentCreate(student_id=1, course_id=course.id))
+
+    future = datetime.now() + timedelta(days=1)
+    with pytest.raises(ValidationError):
+        create_enrollment(EnrollmentCreate(student_id=2, course_id=course.id, enrollment_date=future))
+
+    assert get_seat_status(course.id).enrolled == 1
+    create_enrollment(EnrollmentCreate(student_id=2, course_id=course.id))
+    assert get_seat_status(course.id).available == 0
@@ -0,0 +1,48 @@
+"""
+Tests for keyset pagination over the in-memory engine:
+    python -m pytest test_pagination.py
+"""
+
+import os
+import sys
+
+os.environ["UNIVERSITY_STORAGE"] = "memory"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "app"))
+
+from pydantic import BaseModel  # noqa: E402
+
+from repository import MemoryRepository, TableSpec  # noqa: E402
+
+
+class Note(BaseModel):
+    id: int
+    text: str
+
+
+def _ids(records) -> list:
+    return [record.id for record in records]
+
+
+def test_pages_skip_deleted_ids():
+    repo = MemoryRepository(TableSpec(name="notes", model=Note))
+    for i in range(1, 1001):
+        repo.insert({"text": f"note {i}"})
+    for record_id in range(2, 1000):
+        repo.delete(record_id)
+
+    assert _ids(repo.page(0, 5)) == [1, 1000]
+    assert _ids(repo.page(1, 5)) == [1000]
+    assert repo.page(1000, 5) == []
+
+
+def test_pages_follow_id_order_with_explicit_ids():
+    repo = MemoryRepository(TableSpec(name="notes", model=Note))
+    for record_id in (50, 10, 30):
+        repo.insert({"text": "imported"}, record_id=record_id)
+    repo.insert({"text": "new"})
+
+    assert _ids(repo.page(0, 2)) == [10, 30]
+    assert _ids(repo.page(30, 10)) == [50, 51]
+    # Replacing a record keeps its position
+    repo.insert({"text": "replaced"}, record_id=30)
+    assert _ids(repo.page(0, 10)) == [10, 30, 50, 51]
@@ -1,13 +1,22 @@
 # pyright: reportGeneralTypeIssues=false
 
+import hashlib
+import math
+import threading
+from collections import Counter
 from functools import lru_cache
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Set
 
 import textstat
 from transformers import pipeline  # type: ignore
 import spacy
 from sklearn.feature_extraction.text import TfidfVectorizer
-import numpy as np
+
+from .storage import document_count, iter_documents
+
+# Texts per forward pass of the sentiment model / per spaCy batch
+SENTIMENT_BATCH_SIZE = 32
+NLP_BATCH_SIZE = 64
 
 # Lazy load heavy models
 
@@ -27,12 +36,72 @@ def _nlp():
         nlp.add_pipe("sentencizer")
     return nlp
 
+@lru_cache()
+def _keyword_analyzer():
+    # Same tokenization, stop words and 1-2 grams as before; nothing is fitted
+    return TfidfVectorizer(stop_words="english", ngram_range=(1, 2)).build_analyzer()  # type: ignore
+
+# Corpus statistics for keyword IDF
+
+class CorpusStats:
+    """Document frequency of every keyword term across the stored documents.
+
+    Updated one document at a time, so keyword extraction scores terms by
+    corpus-level IDF without refitting a vectorizer per call.
+    """
+
+    def __init__(self):
+        self._df: Counter = Counter()
+        self._doc_ids: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id in self._doc_ids
+
+    def add(self, doc_id: int, text: str) -> None:
+        if doc_id in self._doc_ids:
+            return
+        terms = set(_keyword_analyzer()(text))
+        with self._lock:
+            if doc_id in self._doc_ids:
+                return
+            self._doc_ids.add(doc_id)
+            self._df.update(terms)
+
+    def idf(self, term: str) -> float:
+        # Smoothed IDF, as TfidfVectorizer computes it
+        return math.log((1 + len(self._doc_ids)) / (1 + self._df[term])) + 1
+
+_corpus = CorpusStats()
+_corpus_load_lock = threading.Lock()
+
+def _get_corpus() -> CorpusStats:
+    """The process-wide corpus statistics, caught up with storage whenever its document count changes.
+
+    That also picks up documents stored without ``add_to_corpus`` (e.g. by
+    another process or the legacy JSON migration).
+    """
+    if len(_corpus) != document_count():
+        with _corpus_load_lock:
+            if len(_corpus) != document_count():
+                for doc in iter_documents():
+                    if doc["id"] not in _corpus:
+                        _corpus.add(doc["id"], doc.get("content", ""))
+    return _corpus
+
+def add_to_corpus(doc_id: int, text: str) -> None:
+    """Count a newly stored document in the keyword IDF statistics."""
+    _get_corpus().add(doc_id, text)
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
 # Analysis helpers
 
-def get_sentiment(text: str) -> str:
-    if not text.strip():
-        return "neutral"
-    result = _sentiment_pipeline()(text[:512])[0]  # type: ignore  # limit for speed
+def _sentiment_label(result: Dict) -> str:
     label = result["label"].lower()
     if label == "positive":
         return "positive"
@@ -40,15 +109,27 @@ def get_sentiment(text: str) -> str:
         return "negative"
     return "neutral"
 
+def get_sentiments(texts: List[str], batch_size: int = SENTIMENT_BATCH_SIZE) -> List[str]:
+    """Sentiment of many texts, run through the model in batches."""
+    labels = ["neutral"] * len(texts)
+    todo = [i for i, text in enumerate(texts) if text.strip()]
+    if todo:
+        results = _sentiment_pipeline()([texts[i][:512] for i in todo], batch_size=batch_size)  # type: ignore  # limit for speed
+        for i, result in zip(todo, results):
+            labels[i] = _sentiment_label(result)
+    return labels
+
+def get_sentiment(text: str) -> str:
+    return get_sentiments([text])[0]
+
 def extract_keywords(text: str, limit: int = 5) -> List[str]:
+    """Top terms by TF x corpus IDF (1-2 grams, English stop words removed)."""
     if not text.strip():
         return []
-    vectorizer = TfidfVectorizer(stop_words="english", ngram_range=(1, 2))  # type: ignore
-    tfidf = vectorizer.fit_transform([text])
-    scores = tfidf.toarray()[0]
-    indices = np.argsort(scores)[::-1][:limit]  # type: ignore
-    features = vectorizer.get_feature_names_out()
-    return [features[i] for i in indices if scores[i] > 0]
+    corpus = _get_corpus()
+    counts = Counter(_keyword_analyzer()(text))
+    scored = sorted(((-tf * corpus.idf(term), term) for term, tf in counts.items()))
+    return [term for _, term in scored[:limit]]
 
 def readability_score(text: str) -> float:
     # Flesch Reading Ease
@@ -57,8 +138,7 @@ def readability_score(text: str) -> float:
     except Exception:
         return 0.0
 
-def basic_stats(text: str) -> Dict[str, int]:
-    doc = _nlp()(text)
+def _doc_stats(doc) -> Dict[str, int]:
     words = [t for t in doc if not t.is_space]
     sentences = list(doc.sents)
     return {
@@ -66,10 +146,35 @@ def basic_stats(text: str) -> Dict[str, int]:
         "sentence_count": len(sentences)
     }
 
+def basic_stats_many(texts: Iterable[str], batch_size: int = NLP_BATCH_SIZE) -> List[Dict[str, int]]:
+    return [_doc_stats(doc) for doc in _nlp().pipe(texts, batch_size=batch_size)]
+
+def basic_stats(text: str) -> Dict[str, int]:
+    return _doc_stats(_nlp()(text))
+
+def analyze_contents(texts: List[str], keyword_limit: int = 5,
+                     cached: Optional[List[Optional[Dict]]] = None) -> List[Dict]:
+    """Analyze many texts, batching the sentiment model and spaCy.
+
+    ``cached`` may hold an earlier result per text (or None); only the
+    missing ones go through the models. Keywords are always recomputed
+    since the corpus IDF moves as documents are added.
+    """
+    cached = cached or [None] * len(texts)
+    todo = [i for i, result in enumerate(cached) if result is None]
+    sentiments = get_sentiments([texts[i] for i in todo])
+    stats = basic_stats_many(texts[i] for i in todo)
+    results = list(cached)
+    for i, sentiment, text_stats in zip(todo, sentiments, stats):
+        results[i] = {
+            "sentiment": sentiment,
+            "readability": readability_score(texts[i]),
+            "stats": text_stats,
+        }
+    return [
+        {**result, "keywords": extract_keywords(text, limit=keyword_limit)}
+        for text, result in zip(texts, results)
+    ]
+
 def analyze_document_content(text: str, keyword_limit: int = 5) -> Dict:
-    return {
-        "sentiment": get_sentiment(text),
-        "keywords": extract_keywords(text, limit=keyword_limit),
-        "readability": readability_score(text),
-        "stats": basic_stats(text),
-    } 
\ No newline at end of file
+    return analyze_contents([text], keyword_limit=keyword_limit)[0] 
\ No newline at end of file
@@ -6,6 +6,7 @@ from document_analyzer import tools  # type: ignore
 from document_analyzer.tools import (
     AddDocumentIn, AddDocumentOut,
     AnalyzeDocumentIn, AnalyzeDocumentOut,
+    AnalyzeDocumentsIn, AnalyzeDocumentsOut,
     SentimentIn, SentimentOut,
     KeywordsIn, KeywordsOut,
     SearchIn, SearchHit,
@@ -37,6 +38,14 @@ async def analyze_document(payload: AnalyzeDocumentIn):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/analyze_documents", response_model=AnalyzeDocumentsOut)
+async def analyze_documents(payload: AnalyzeDocumentsIn):
+    try:
+        return tools.analyze_documents(payload)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/get_sentiment", response_model=SentimentOut)
 async def get_sentiment(payload: SentimentIn):
     return tools.get_sentiment(payload)
@@ -1,25 +1,174 @@
-from typing import List, Dict
+import heapq
+import math
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
 
-from .storage import all_documents
+from .storage import document_count, iter_documents
 
 SNIPPET_RADIUS = 40  # characters around match
 
-def search_documents(query: str) -> List[Dict]:
-    """Return list of {id, title, matched_snippet}. Case-insensitive substring search."""
+# BM25 parameters (the usual defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"\w+")
+_PHRASE_RE = re.compile(r'"([^"]*)"')
+
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """Lowercased word tokens with their (start, end) character offsets."""
+    return [(m.group().lower(), m.start(), m.end()) for m in _TOKEN_RE.finditer(text)]
+
+
+def parse_query(query: str) -> Tuple[List[str], List[List[str]]]:
+    """Split a query into its terms and its "quoted phrases" (as term lists)."""
+    phrases = [[t for t, _, _ in tokenize(p)] for p in _PHRASE_RE.findall(query)]
+    terms = [t for t, _, _ in tokenize(query)]
+    return terms, [p for p in phrases if p]
+
+
+class InvertedIndex:
+    """Positional inverted index over document content with BM25 ranking.
+
+    Each term maps to postings ``{doc_id: [positions]}``; the character
+    offsets of every token position are kept per document so snippets can be
+    cut without re-tokenizing. Scoring only visits the postings of the query
+    terms, so a query costs O(postings), not O(corpus).
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, List[int]]] = {}
+        self._offsets: Dict[int, List[Tuple[int, int]]] = {}
+        self._docs: Dict[int, Tuple[str, str]] = {}  # id -> (title, content)
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id in self._docs
+
+    def add(self, doc_id: int, title: str, content: str) -> None:
+        with self._lock:
+            if doc_id in self._docs:
+                self.remove(doc_id)
+            tokens = tokenize(content)
+            for position, (term, _, _) in enumerate(tokens):
+                self._postings.setdefault(term, {}).setdefault(doc_id, []).append(position)
+            self._offsets[doc_id] = [(start, end) for _, start, end in tokens]
+            self._docs[doc_id] = (title, content)
+            self._total_length += len(tokens)
+
+    def remove(self, doc_id: int) -> None:
+        with self._lock:
+            if doc_id not in self._docs:
+                return
+            _, content = self._docs.pop(doc_id)
+            for term in {t for t, _, _ in tokenize(content)}:
+                postings = self._postings[term]
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+            self._total_length -= len(self._offsets.pop(doc_id))
+
+    def _phrase_positions(self, doc_id: int, phrase: List[str]) -> List[int]:
+        """Start positions of ``phrase`` in the document."""
+        starts = set(self._postings[phrase[0]][doc_id])
+        for i, term in enumerate(phrase[1:], start=1):
+            starts &= {p - i for p in self._postings[term][doc_id]}
+            if not starts:
+                break
+        return sorted(starts)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Dict]:
+        """BM25-ranked hits; every quoted phrase in the query must occur in a hit."""
+        terms, phrases = parse_query(query)
+        if not terms:
+            return []
+        with self._lock:
+            n_docs = len(self._docs)
+            avg_length = self._total_length / n_docs if n_docs else 0.0
+            scores: Dict[int, float] = {}
+            for term in set(terms):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, positions in postings.items():
+                    tf = len(positions)
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * len(self._offsets[doc_id]) / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+            # First matched token span per document, used for the snippet
+            match_spans: Dict[int, Tuple[int, int]] = {}
+            for phrase in phrases:
+                if any(term not in self._postings for term in phrase):
+                    return []
+                candidates = set(scores)
+                for term in phrase:
+                    candidates &= self._postings[term].keys()
+                for doc_id in list(scores):
+                    starts = self._phrase_positions(doc_id, phrase) if doc_id in candidates else []
+                    if not starts:
+                        del scores[doc_id]
+                    elif doc_id not in match_spans:
+                        match_spans[doc_id] = (starts[0], starts[0] + len(phrase) - 1)
+
+            if limit is None:
+                ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            else:
+                ranked = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+
+            hits = []
+            for doc_id, score in ranked:
+                if doc_id not in match_spans:
+                    first = min(self._postings[t][doc_id][0] for t in set(terms) if doc_id in self._postings.get(t, {}))
+                    match_spans[doc_id] = (first, first)
+                title, content = self._docs[doc_id]
+                offsets = self._offsets[doc_id]
+                start = max(0, offsets[match_spans[doc_id][0]][0] - SNIPPET_RADIUS)
+                end = offsets[match_spans[doc_id][1]][1] + SNIPPET_RADIUS
+                hits.append({
+                    "id": doc_id,
+                    "title": title,
+                    "matched_snippet": content[start:end].replace("\n", " ").strip(),
+                    "score": round(score, 4),
+                })
+            return hits
+
+
+_index = InvertedIndex()
+_index_load_lock = threading.Lock()
+
+
+def _get_index() -> InvertedIndex:
+    """The process-wide index, caught up with storage whenever its document count changes.
+
+    That also picks up documents stored without ``index_document`` (e.g. by
+    another process or the legacy JSON migration).
+    """
+    if len(_index) != document_count():
+        with _index_load_lock:
+            if len(_index) != document_count():
+                for doc in iter_documents():
+                    if doc["id"] not in _index:
+                        _index.add(doc["id"], doc.get("title", ""), doc.get("content", ""))
+    return _index
+
+
+def index_document(doc: Dict) -> None:
+    """Add a newly stored document to the search index."""
+    _get_index().add(doc["id"], doc.get("title", ""), doc.get("content", ""))
+
+
+def search_documents(query: str, limit: Optional[int] = None) -> List[Dict]:
+    """Return list of {id, title, matched_snippet, score} ranked by BM25.
+
+    Terms are matched as whole words (case-insensitive); wrap words in double
+    quotes to require them as an exact phrase.
+    """
     if not query:
         return []
-    results = []
-    q_lower = query.lower()
-    for doc in all_documents():
-        content_lower = doc.get("content", "").lower()
-        idx = content_lower.find(q_lower)
-        if idx != -1:
-            start = max(0, idx - SNIPPET_RADIUS)
-            end = idx + len(query) + SNIPPET_RADIUS
-            snippet = doc["content"][start:end].replace("\n", " ")
-            results.append({
-                "id": doc["id"],
-                "title": doc.get("title", ""),
-                "matched_snippet": snippet.strip()
-            })
-    return results 
\ No newline at end of file
+    return _get_index().search(query, limit=limit)
@@ -1,50 +1,153 @@
 import json
-import os
+import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-from filelock import FileLock
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 DATA_DIR = Path(__file__).resolve().parent / "data"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-STORAGE_FILE = DATA_DIR / "documents.json"
-LOCK_FILE = STORAGE_FILE.with_suffix(".lock")
+DB_FILE = DATA_DIR / "documents.db"
+# Previous storage format; imported once into the database and left in place
+LEGACY_JSON_FILE = DATA_DIR / "documents.json"
+
+_COLUMNS = ("id", "title", "author", "date", "content", "metadata")
+
+# One connection per thread: WAL mode lets readers run alongside the writer
+_local = threading.local()
+
+
+def _connect() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(str(DB_FILE), timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _local.conn = conn
+    return conn
+
+
+@contextmanager
+def _transaction() -> Iterator[sqlite3.Connection]:
+    conn = _connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _row_to_document(row: tuple) -> Dict[str, Any]:
+    doc = dict(zip(_COLUMNS, row))
+    doc["metadata"] = json.loads(doc["metadata"]) if doc["metadata"] else {}
+    return doc
 
-# Ensure the JSON file exists
-if not STORAGE_FILE.exists():
-    STORAGE_FILE.write_text("[]", encoding="utf-8")
 
-_lock = FileLock(str(LOCK_FILE))
+def _document_values(doc: Dict[str, Any]) -> tuple:
+    return (
+        doc.get("title", ""),
+        doc.get("author", ""),
+        doc.get("date", ""),
+        doc.get("content", ""),
+        json.dumps(doc.get("metadata") or {}, ensure_ascii=False),
+    )
 
-def _load_documents() -> List[Dict[str, Any]]:
-    with _lock:
-        with STORAGE_FILE.open("r", encoding="utf-8") as f:
+
+def _migrate_legacy_json() -> None:
+    """Import documents.json (keeping ids) into a new database, once.
+
+    The import is recorded in the ``meta`` table rather than by touching the
+    JSON file, which is tracked in version control.
+    """
+    if not LEGACY_JSON_FILE.exists():
+        return
+    with _transaction() as conn:
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_json_imported'").fetchone():
+            return
+        if conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0] == 0:
             try:
-                return json.load(f)
+                docs = json.loads(LEGACY_JSON_FILE.read_text(encoding="utf-8"))
             except json.JSONDecodeError:
-                # Re-initialize corrupted file
-                return []
+                docs = []
+            conn.executemany(
+                "INSERT INTO documents (id, title, author, date, content, metadata) VALUES (?, ?, ?, ?, ?, ?)",
+                [(d["id"], *_document_values(d)) for d in docs],
+            )
+        conn.execute("INSERT INTO meta (key, value) VALUES ('legacy_json_imported', '1')")
+
+
+def _init_db() -> None:
+    with _transaction() as conn:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT, author TEXT, date TEXT, "
+            "content TEXT NOT NULL, metadata TEXT)"
+        )
+        # Cached analysis per document, valid while the content hash matches
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            "document_id INTEGER PRIMARY KEY REFERENCES documents(id), content_hash TEXT NOT NULL, "
+            "result TEXT NOT NULL)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+    _migrate_legacy_json()
+
 
-def _save_documents(docs: List[Dict[str, Any]]) -> None:
-    with _lock:
-        with STORAGE_FILE.open("w", encoding="utf-8") as f:
-            json.dump(docs, f, ensure_ascii=False, indent=2)
+_init_db()
 
 # Public helper functions
 
 def add_document(doc: Dict[str, Any]) -> int:
     """Add a document and return its new id."""
-    docs = _load_documents()
-    next_id = (max(d["id"] for d in docs) + 1) if docs else 1
-    doc["id"] = next_id
-    docs.append(doc)
-    _save_documents(docs)
-    return next_id
+    with _transaction() as conn:
+        cursor = conn.execute(
+            "INSERT INTO documents (title, author, date, content, metadata) VALUES (?, ?, ?, ?, ?)",
+            _document_values(doc),
+        )
+    doc["id"] = cursor.lastrowid
+    return doc["id"]
+
+def document_count() -> int:
+    return _connect().execute("SELECT COUNT(*) FROM documents").fetchone()[0]
 
 def get_document(doc_id: int) -> Optional[Dict[str, Any]]:
-    docs = _load_documents()
-    return next((d for d in docs if d["id"] == doc_id), None)
+    row = _connect().execute(
+        f"SELECT {', '.join(_COLUMNS)} FROM documents WHERE id = ?", (doc_id,)
+    ).fetchone()
+    return _row_to_document(row) if row else None
+
+def iter_documents() -> Iterator[Dict[str, Any]]:
+    """Stream every document in id order without loading them all at once."""
+    for row in _connect().execute(f"SELECT {', '.join(_COLUMNS)} FROM documents ORDER BY id"):
+        yield _row_to_document(row)
 
 def all_documents() -> List[Dict[str, Any]]:
-    return _load_documents() 
\ No newline at end of file
+    return list(iter_documents())
+
+def get_analyses(keys: Sequence[Tuple[int, str]]) -> Dict[int, Dict[str, Any]]:
+    """Cached analyses for (document id, content hash) pairs whose hash still matches."""
+    wanted = dict(keys)
+    found: Dict[int, Dict[str, Any]] = {}
+    ids = list(wanted)
+    # Stay under SQLite's bound-parameter limit
+    for start in range(0, len(ids), 500):
+        batch = ids[start:start + 500]
+        rows = _connect().execute(
+            f"SELECT document_id, content_hash, result FROM analyses WHERE document_id IN ({','.join('?' * len(batch))})",
+            batch,
+        )
+        for doc_id, digest, result in rows:
+            if wanted[doc_id] == digest:
+                found[doc_id] = json.loads(result)
+    return found
+
+def save_analyses(items: Sequence[Tuple[int, str, Dict[str, Any]]]) -> None:
+    """Store analyses as (document id, content hash, result) triples."""
+    with _transaction() as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO analyses (document_id, content_hash, result) VALUES (?, ?, ?)",
+            [(doc_id, digest, json.dumps(result, ensure_ascii=False)) for doc_id, digest, result in items],
+        )
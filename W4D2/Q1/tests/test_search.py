@@ -0,0 +1,38 @@
+from document_analyzer.search import InvertedIndex
+
+
+def _index():
+    index = InvertedIndex()
+    index.add(1, "Quantum", "Researchers reached a milestone in quantum computing.")
+    index.add(2, "Cloud", "Cloud computing costs keep falling; computing is cheap.")
+    index.add(3, "Physics", "Computing quantum effects needs a quantum computer.")
+    return index
+
+
+def test_bm25_ranks_documents_matching_more_terms_first():
+    hits = _index().search("quantum computing")
+    assert [h["id"] for h in hits][:2] == [3, 1]
+    assert {h["id"] for h in hits} == {1, 2, 3}
+
+
+def test_phrase_query_requires_adjacent_terms():
+    hits = _index().search('"quantum computing"')
+    assert [h["id"] for h in hits] == [1]
+    assert "quantum computing" in hits[0]["matched_snippet"]
+
+
+def test_reindexing_a_document_replaces_its_postings():
+    index = _index()
+    index.add(1, "Quantum", "Nothing to see here.")
+    assert index.search('"quantum computing"') == []
+    assert len(index) == 3
+
+
+def test_index_picks_up_documents_stored_elsewhere():
+    from document_analyzer import search, storage
+
+    search.search_documents("anything")
+    # Stored without going through index_document (e.g. by another process)
+    doc_id = storage.add_document({"title": "Direct", "content": "Quokkasaurus field notes."})
+    assert [h["id"] for h in search.search_documents("quokkasaurus")] == [doc_id]
+    assert len(search._get_index()) == storage.document_count()
@@ -44,4 +44,48 @@ def test_search_documents():
     # Using earlier added document
     resp = client.post("/search_documents", json={"query": "OpenAI"})
     assert resp.status_code == 200
-    assert isinstance(resp.json(), list) 
\ No newline at end of file
+    assert isinstance(resp.json(), list) 
+
+def test_analyze_documents_batch():
+    add_resp = client.post("/add_document", json={
+        "document_data": {
+            "title": "Markets",
+            "author": "Finance Desk",
+            "date": "2025-07-03",
+            "content": "Markets rallied strongly after the announcement.",
+            "metadata": {"category": "Finance", "language": "English"}
+        }
+    })
+    doc_id = add_resp.json()["document_id"]
+
+    resp = client.post("/analyze_documents", json={"document_ids": [doc_id, 10_000_000]})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert set(data["results"]) == {str(doc_id)}
+    assert data["not_found"] == [10_000_000]
+    # Served from the analysis cache the second time
+    single = client.post("/analyze_document", json={"document_id": doc_id}).json()
+    assert single == data["results"][str(doc_id)]
+
+
+def test_keyword_corpus_picks_up_documents_stored_elsewhere():
+    from document_analyzer import analyzer, storage
+
+    corpus = analyzer._get_corpus()
+    # Stored without going through the add_document tool (e.g. by another process)
+    doc_id = storage.add_document({"title": "Direct", "content": "Zebracorn migration notes."})
+    assert doc_id not in corpus
+    assert doc_id in analyzer._get_corpus()
+    assert len(analyzer._get_corpus()) == storage.document_count()
+
+
+def test_legacy_json_is_imported_once_and_left_in_place():
+    from document_analyzer import storage
+
+    assert storage.LEGACY_JSON_FILE.exists()
+    count = storage.document_count()
+    storage._migrate_legacy_json()
+    assert storage.document_count() == count
+    assert storage._connect().execute(
+        "SELECT value FROM meta WHERE key = 'legacy_json_imported'"
+    ).fetchone() == ("1",)
@@ -34,6 +34,13 @@ class AnalyzeDocumentOut(BaseModel):
     readability: float
     stats: Dict[str, Any]
 
+class AnalyzeDocumentsIn(BaseModel):
+    document_ids: List[int]
+
+class AnalyzeDocumentsOut(BaseModel):
+    results: Dict[int, AnalyzeDocumentOut]
+    not_found: List[int] = Field(default_factory=list)
+
 class SentimentIn(BaseModel):
     text: str
 
@@ -49,11 +56,13 @@ class KeywordsOut(BaseModel):
 
 class SearchIn(BaseModel):
     query: str
+    limit: Optional[int] = None
 
 class SearchHit(BaseModel):
     id: int
     title: str
     matched_snippet: str
+    score: float = 0.0
 
 # ----------------------------
 # Tool Logic
@@ -62,15 +71,47 @@ class SearchHit(BaseModel):
 def add_document(in_data: AddDocumentIn) -> AddDocumentOut:
     doc_dict = in_data.document_data.dict()
     new_id = storage.add_document(doc_dict)
+    search.index_document({**doc_dict, "id": new_id})
+    analyzer.add_to_corpus(new_id, doc_dict["content"])
     return AddDocumentOut(document_id=new_id)
 
+def _analyze_stored(docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Analyze stored documents, reusing (and filling) the per-document analysis cache."""
+    hashes = [analyzer.content_hash(d["content"]) for d in docs]
+    cached = storage.get_analyses([(d["id"], h) for d, h in zip(docs, hashes)])
+    results = analyzer.analyze_contents(
+        [d["content"] for d in docs], cached=[cached.get(d["id"]) for d in docs]
+    )
+    fresh = [
+        (d["id"], h, {k: v for k, v in r.items() if k != "keywords"})
+        for d, h, r in zip(docs, hashes, results) if d["id"] not in cached
+    ]
+    if fresh:
+        storage.save_analyses(fresh)
+    return results
+
 def analyze_document(in_data: AnalyzeDocumentIn) -> AnalyzeDocumentOut:
     doc = storage.get_document(in_data.document_id)
     if not doc:
         raise ValueError("Document not found")
-    analysis = analyzer.analyze_document_content(doc["content"])
+    analysis = _analyze_stored([doc])[0]
     return AnalyzeDocumentOut(**analysis)
 
+def analyze_documents(in_data: AnalyzeDocumentsIn) -> AnalyzeDocumentsOut:
+    docs = []
+    not_found = []
+    for doc_id in dict.fromkeys(in_data.document_ids):
+        doc = storage.get_document(doc_id)
+        if doc:
+            docs.append(doc)
+        else:
+            not_found.append(doc_id)
+    results = _analyze_stored(docs) if docs else []
+    return AnalyzeDocumentsOut(
+        results={d["id"]: AnalyzeDocumentOut(**r) for d, r in zip(docs, results)},
+        not_found=not_found,
+    )
+
 def get_sentiment(in_data: SentimentIn) -> SentimentOut:
     sentiment = analyzer.get_sentiment(in_data.text)
     return SentimentOut(sentiment=sentiment)
@@ -80,5 +121,5 @@ def extract_keywords(in_data: KeywordsIn) -> KeywordsOut:
     return KeywordsOut(keywords=keywords)
 
 def search_documents(in_data: SearchIn) -> List[SearchHit]:
-    results = search.search_documents(in_data.query)
+    results = search.search_documents(in_data.query, limit=in_data.limit)
     return [SearchHit(**r) for r in results] 
\ No newline at end of file
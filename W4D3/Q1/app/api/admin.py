@@ -4,11 +4,13 @@ from sqlalchemy import select
 import uuid
 from datetime import datetime
 
+from app.core.auth_cache import api_key_cache
 from app.core.database import get_db
 from app.core.security import generate_api_key, hash_api_key
 from app.dependencies import require_role
 from app.models import APIKey, RoleEnum
-from app.schemas import APIKeyCreateRequest, APIKeyWithSecret, APIKeyResponse
+from app.schemas import APIKeyCreateRequest, APIKeyWithSecret, APIKeyResponse, MessageRetentionSettings
+from app.services.message_index import Retention, message_index
 from app.core.config import settings
 from app.core.rate_limit import limiter
 
@@ -84,4 +86,27 @@ async def revoke_api_key(
     api_key_obj.revoked = True
     api_key_obj.revoked_at = datetime.utcnow()
     await db.commit()
-    return Response(status_code=status.HTTP_204_NO_CONTENT) 
\ No newline at end of file
+    # Stop accepting the key right away instead of when its cache entry expires
+    api_key_cache.invalidate(api_key_obj.hashed_key)
+    return Response(status_code=status.HTTP_204_NO_CONTENT) 
+
+@router.get("/message-index/retention", response_model=MessageRetentionSettings)
+@limiter.limit(endpoint_limit)
+async def get_message_retention(
+    request: Request,
+    auth=Depends(require_role(RoleEnum.admin)),
+):
+    retention = await message_index.get_retention(str(auth.tenant.id))
+    return MessageRetentionSettings(**retention.__dict__)
+
+
+@router.put("/message-index/retention", response_model=MessageRetentionSettings)
+@limiter.limit(endpoint_limit)
+async def set_message_retention(
+    request: Request,
+    payload: MessageRetentionSettings,
+    auth=Depends(require_role(RoleEnum.admin)),
+):
+    """Retention of this tenant's indexed Discord messages; already indexed messages are pruned to it immediately."""
+    await message_index.set_retention(str(auth.tenant.id), Retention(**payload.model_dump()))
+    return payload
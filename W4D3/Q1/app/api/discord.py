@@ -6,7 +6,8 @@ from app.core.config import settings
 from app.core.rate_limit import limiter
 from app.dependencies import require_role
 from app.models import RoleEnum
-from app.services.discord_api import DiscordClient, DiscordAPIError
+from app.services.discord_api import DiscordClient, DiscordAPIError, DiscordClientRegistry
+from app.services.message_index import message_index
 from app.schemas import (
     SendMessageRequest,
     SendMessageResponse,
@@ -21,9 +22,16 @@ endpoint_limit = f"{settings.rate_limit_per_endpoint}/minute"
 router = APIRouter(prefix="/discord", tags=["Discord"])
 
 
-# Helper to create client per request (short-lived). In a production system, clients could be pooled.
+# Pooled clients, one per tenant bot token; closed by the app lifespan (see app.main).
+discord_clients = DiscordClientRegistry(
+    http2=settings.discord_http2,
+    max_connections=settings.discord_max_connections,
+    max_keepalive_connections=settings.discord_max_keepalive_connections,
+)
+
+
 async def _get_client(bot_token: str) -> DiscordClient:
-    return DiscordClient(bot_token)
+    return discord_clients.get(bot_token)
 
 
 # ---------------- Helpers ----------------
@@ -58,11 +66,9 @@ async def send_message(
     try:
         resp = await client.send_message(payload.channel_id, payload.content)
     except DiscordAPIError as err:
-        await client.close()
         _handle_discord_error(err)
-    finally:
-        # Ensure the client is closed even on success
-        await client.close()
+
+    await message_index.add_message(str(auth.tenant.id), payload.channel_id, resp)
 
     return SendMessageResponse(
         id=int(resp["id"]),
@@ -87,10 +93,7 @@ async def get_messages(
     try:
         messages = await client.get_messages(channel_id, limit=limit)
     except DiscordAPIError as err:
-        await client.close()
         _handle_discord_error(err)
-    finally:
-        await client.close()
 
     return GetMessagesResponse(messages=messages)
 
@@ -109,10 +112,7 @@ async def channel_info(
     try:
         info = await client.get_channel_info(channel_id)
     except DiscordAPIError as err:
-        await client.close()
         _handle_discord_error(err)
-    finally:
-        await client.close()
 
     return info
 
@@ -131,15 +131,14 @@ async def delete_message(
     try:
         await client.delete_message(payload.channel_id, payload.message_id)
     except DiscordAPIError as err:
-        await client.close()
         _handle_discord_error(err)
-    finally:
-        await client.close()
+
+    await message_index.remove_message(str(auth.tenant.id), payload.channel_id, payload.message_id)
 
     return None
 
 
-# ---------------- Search Messages (Keyword Filter) ----------------
+# ---------------- Search Messages (Local Index) ----------------
 
 
 @router.post("/search_messages", response_model=GetMessagesResponse)
@@ -151,11 +150,11 @@ async def search_messages(
 ):
     client = await _get_client(auth.tenant.discord_bot_token)
     try:
-        messages = await client.search_messages_keyword(payload.channel_id, payload.keyword, payload.limit)
+        # Served from the local index; Discord is only asked for messages not indexed yet
+        messages = await message_index.search(
+            client, str(auth.tenant.id), payload.channel_id, payload.keyword, payload.limit
+        )
     except DiscordAPIError as err:
-        await client.close()
         _handle_discord_error(err)
-    finally:
-        await client.close()
 
     return GetMessagesResponse(messages=messages) 
\ No newline at end of file
@@ -3,13 +3,12 @@ from __future__ import annotations
 from typing import Optional
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from sqlalchemy import select
 
+from app.core.auth_cache import lookup_api_key
 from app.core.config import settings
-from app.core.database import AsyncSessionLocal
 from app.core.security import hash_api_key
 from app.dependencies import AuthContext
-from app.models import APIKey, RoleEnum
+from app.models import RoleEnum
 from app.inspector.manager import manager
 
 router = APIRouter(tags=["Inspector"], prefix="/inspector")
@@ -19,14 +18,9 @@ async def _authenticate_admin(websocket: WebSocket) -> Optional[AuthContext]:
     api_key_value = websocket.headers.get(settings.api_key_header)
     if not api_key_value:
         return None
-    async with AsyncSessionLocal() as session:
-        hashed = hash_api_key(api_key_value)
-        result = await session.execute(
-            select(APIKey).where(APIKey.hashed_key == hashed, APIKey.revoked == False)
-        )
-        api_key_obj = result.scalar_one_or_none()
-        if api_key_obj and api_key_obj.role == RoleEnum.admin:
-            return AuthContext(api_key_obj)
+    api_key_obj = await lookup_api_key(hash_api_key(api_key_value))
+    if api_key_obj and not api_key_obj.revoked and api_key_obj.role == RoleEnum.admin:
+        return AuthContext(api_key_obj)
     return None
 
 
@@ -0,0 +1,133 @@
+"""In-process cache of API-key lookups.
+
+Shared by the auth dependency, the audit middleware and the inspector
+websocket, so an authenticated request resolves its key without touching the
+database once the key has been seen. Entries are plain snapshots (not ORM
+objects) and expire after ``settings.auth_cache_ttl_seconds``; revoking a key
+through the admin API evicts it immediately. Other worker processes only see
+a revocation once their own entry expires.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import APIKey, RoleEnum
+
+
+@dataclass(frozen=True)
+class TenantInfo:
+    id: uuid.UUID
+    name: str
+    discord_bot_token: str
+
+
+@dataclass(frozen=True)
+class APIKeyInfo:
+    id: uuid.UUID
+    tenant_id: uuid.UUID
+    role: RoleEnum
+    revoked: bool
+    tenant: TenantInfo
+
+    @classmethod
+    def from_model(cls, obj: APIKey) -> "APIKeyInfo":
+        tenant = obj.tenant
+        return cls(
+            id=obj.id,
+            tenant_id=obj.tenant_id,
+            role=obj.role,
+            revoked=bool(obj.revoked),
+            tenant=TenantInfo(id=tenant.id, name=tenant.name, discord_bot_token=tenant.discord_bot_token),
+        )
+
+
+class APIKeyCache:
+    """Bounded LRU mapping hashed API key -> APIKeyInfo, with a TTL per entry.
+
+    Every ``invalidate`` bumps the key's generation. A loader takes
+    ``generation()`` before reading the database and passes it to ``put``,
+    which drops the snapshot if the key was invalidated in the meantime, so a
+    read that raced a revocation cannot re-cache the un-revoked key.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl_seconds: float = 60.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, APIKeyInfo]]" = OrderedDict()
+        # Only invalidated (i.e. revoked) keys appear here, so this stays small
+        self._generations: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, hashed_key: str) -> Optional[APIKeyInfo]:
+        entry = self._entries.get(hashed_key)
+        if entry is None:
+            return None
+        expires_at, info = entry
+        if expires_at <= time.monotonic():
+            del self._entries[hashed_key]
+            return None
+        self._entries.move_to_end(hashed_key)
+        return info
+
+    def generation(self, hashed_key: str) -> int:
+        return self._generations.get(hashed_key, 0)
+
+    def put(self, hashed_key: str, info: APIKeyInfo, generation: Optional[int] = None) -> None:
+        if self.ttl_seconds <= 0 or self.max_size <= 0:
+            return  # Caching disabled
+        if generation is not None and generation != self.generation(hashed_key):
+            return  # Invalidated while this snapshot was being loaded
+        self._entries[hashed_key] = (time.monotonic() + self.ttl_seconds, info)
+        self._entries.move_to_end(hashed_key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, hashed_key: str) -> None:
+        self._entries.pop(hashed_key, None)
+        self._generations[hashed_key] = self.generation(hashed_key) + 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+api_key_cache = APIKeyCache(max_size=settings.auth_cache_max_size, ttl_seconds=settings.auth_cache_ttl_seconds)
+
+
+async def _load_api_key(hashed_key: str, db: AsyncSession) -> Optional[APIKeyInfo]:
+    result = await db.execute(
+        select(APIKey).options(selectinload(APIKey.tenant)).where(APIKey.hashed_key == hashed_key)
+    )
+    obj = result.scalar_one_or_none()
+    return APIKeyInfo.from_model(obj) if obj is not None else None
+
+
+async def lookup_api_key(hashed_key: str, db: AsyncSession | None = None) -> Optional[APIKeyInfo]:
+    """The API key with this hash (revoked or not), from the cache or else the database.
+
+    ``db`` is only used on a cache miss; without one a short-lived session is opened.
+    """
+    info = api_key_cache.get(hashed_key)
+    if info is not None:
+        return info
+    generation = api_key_cache.generation(hashed_key)
+    if db is None:
+        async with AsyncSessionLocal() as session:
+            info = await _load_api_key(hashed_key, session)
+    else:
+        info = await _load_api_key(hashed_key, db)
+    if info is not None:
+        api_key_cache.put(hashed_key, info, generation)
+    return info
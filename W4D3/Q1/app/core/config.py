@@ -11,13 +11,35 @@ class Settings(BaseSettings):
     database_url: str = Field(default="sqlite:///./test.db")
     discord_bot_token: str = Field(default="dummy-token")
 
+    # Pooled Discord HTTP clients (one per tenant bot token)
+    discord_http2: bool = Field(default=True)
+    discord_max_connections: int = Field(default=100)
+    discord_max_keepalive_connections: int = Field(default=20)
+
     # API & security
     api_key_header: str = Field(default="X-API-Key")
+    # In-process cache of API-key lookups (a TTL of 0 disables it)
+    auth_cache_ttl_seconds: float = Field(default=60.0)
+    auth_cache_max_size: int = Field(default=10_000)
 
     # Rate-limiting (SlowAPI)
     rate_limit_per_minute: int = Field(default=100)
     rate_limit_per_endpoint: int = Field(default=10)
 
+    # Local message index behind /discord/search_messages
+    message_index_path: str = Field(default="./message_index.db")
+    message_index_poll_seconds: float = Field(default=30.0)
+    # Defaults; each tenant can override them via /admin/message-index/retention
+    message_retention_days: int = Field(default=30)
+    message_retention_max_per_channel: int = Field(default=10_000)
+
+    # Audit log writer (batched, off the request path) and inspector feed
+    audit_queue_size: int = Field(default=10_000)
+    audit_batch_size: int = Field(default=200)
+    audit_flush_interval_seconds: float = Field(default=0.5)
+    inspector_queue_size: int = Field(default=100)
+    inspector_max_dropped: int = Field(default=100)
+
     model_config = {"env_file": ".env", "case_sensitive": False, "extra": "ignore"}
 
 
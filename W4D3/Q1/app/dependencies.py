@@ -1,13 +1,12 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import APIKeyHeader
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 
+from app.core.auth_cache import APIKeyInfo, lookup_api_key
 from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import hash_api_key
-from app.models import APIKey, RoleEnum
+from app.models import RoleEnum
 
 api_key_header_scheme = APIKeyHeader(name=settings.api_key_header, auto_error=False)
 
@@ -15,7 +14,7 @@ api_key_header_scheme = APIKeyHeader(name=settings.api_key_header, auto_error=Fa
 class AuthContext:
     """Holds authenticated API key and its tenant/role."""
 
-    def __init__(self, api_key_obj: APIKey):
+    def __init__(self, api_key_obj: APIKeyInfo):
         self.api_key = api_key_obj
         self.tenant = api_key_obj.tenant
         self.role = api_key_obj.role
@@ -28,14 +27,9 @@ async def get_current_auth(
     if not api_key_header:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing API key")
 
-    hashed = hash_api_key(api_key_header)
-    result = await db.execute(
-        select(APIKey)
-        .options(selectinload(APIKey.tenant))
-        .where((APIKey.hashed_key == hashed) & (APIKey.revoked.is_(False)))
-    )
-    obj = result.scalar_one_or_none()
-    if obj is None:
+    # Served from the in-process cache; the DB is only queried on a miss
+    obj = await lookup_api_key(hash_api_key(api_key_header), db)
+    if obj is None or obj.revoked:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key")
 
     return AuthContext(obj)
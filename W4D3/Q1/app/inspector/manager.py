@@ -1,52 +1,123 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
-from typing import List, Any
+from typing import Any, Dict
 
-from fastapi import WebSocket, WebSocketDisconnect
+from fastapi import WebSocket
+
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Close code sent to inspectors that cannot keep up ("Try Again Later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class _Inspector:
+    """One connected websocket with its bounded outbound queue and writer task."""
+
+    def __init__(self, websocket: WebSocket, queue_size: int):
+        self.websocket = websocket
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.writer: asyncio.Task | None = None
+
 
 class ConnectionManager:
-    """Manages active WebSocket inspector connections and broadcasting."""
+    """Manages active WebSocket inspector connections and broadcasting.
+
+    ``broadcast`` serialises a message once and only enqueues the text on
+    each connection; a writer task per connection does the actual sends, so
+    a slow inspector never delays the others.
+
+    Slow-consumer policy: when a connection's queue (``queue_size``) is
+    full, its oldest pending message is dropped to make room. Once a
+    connection has dropped more than ``max_dropped`` messages it is closed
+    with code 1013 (try again later).
+    """
 
-    def __init__(self):
-        self._connections: List[WebSocket] = []
+    def __init__(self, queue_size: int = 100, max_dropped: int = 100):
+        self.queue_size = queue_size
+        self.max_dropped = max_dropped
+        self._inspectors: Dict[WebSocket, _Inspector] = {}
         self._lock = asyncio.Lock()
+        # Strong references to running evictions (the loop only keeps weak ones)
+        self._evictions: set[asyncio.Task] = set()
 
     @property
     def count(self) -> int:
-        return len(self._connections)
+        return len(self._inspectors)
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
+        inspector = _Inspector(websocket, self.queue_size)
+        inspector.writer = asyncio.create_task(self._writer(inspector))
         async with self._lock:
-            self._connections.append(websocket)
+            self._inspectors[websocket] = inspector
         logger.info("Inspector connected, total=%s", self.count)
         await self.broadcast({"event": "inspector_connected", "connections": self.count})
 
     async def disconnect(self, websocket: WebSocket):
         async with self._lock:
-            if websocket in self._connections:
-                self._connections.remove(websocket)
+            inspector = self._inspectors.pop(websocket, None)
+        if inspector is None:
+            return
+        if inspector.writer is not asyncio.current_task():
+            inspector.writer.cancel()
         logger.info("Inspector disconnected, total=%s", self.count)
         await self.broadcast({"event": "inspector_disconnected", "connections": self.count})
 
+    async def _writer(self, inspector: _Inspector):
+        try:
+            while True:
+                text = await inspector.queue.get()
+                await inspector.websocket.send_text(text)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # noqa: BLE001 - closed or broken socket
+            logger.warning("Error sending to inspector WS: %s", exc)
+            await self.disconnect(inspector.websocket)
+
+    async def _evict(self, inspector: _Inspector):
+        logger.warning("Disconnecting slow inspector after %s dropped messages", inspector.dropped)
+        await self.disconnect(inspector.websocket)
+        try:
+            await inspector.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+        except Exception:  # noqa: BLE001 - already closed
+            pass
+
+    def _eviction_done(self, task: asyncio.Task):
+        self._evictions.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Evicting slow inspector failed: %s", task.exception())
+
     async def broadcast(self, message: Any):
-        """Broadcast a JSON-serialisable message to all active websockets."""
-        stale: List[WebSocket] = []
-        for ws in list(self._connections):
-            try:
-                await ws.send_json(message)
-            except WebSocketDisconnect:
-                stale.append(ws)
-            except Exception as exc:  # pragma: no cover
-                logger.warning("Error sending to inspector WS: %s", exc)
-        # Cleanup stale
-        for ws in stale:
-            await self.disconnect(ws)
-
-
-manager = ConnectionManager() 
\ No newline at end of file
+        """Queue a JSON-serialisable message for all active websockets."""
+        if not self._inspectors:
+            return
+        text = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+        for inspector in list(self._inspectors.values()):
+            queue = inspector.queue
+            if queue.full():
+                queue.get_nowait()  # Drop the oldest message for this client
+                inspector.dropped += 1
+                if inspector.dropped == self.max_dropped + 1:
+                    task = asyncio.create_task(self._evict(inspector))
+                    self._evictions.add(task)
+                    task.add_done_callback(self._eviction_done)
+            queue.put_nowait(text)
+
+    async def close(self):
+        """Stop all writer tasks (on shutdown)."""
+        async with self._lock:
+            inspectors = list(self._inspectors.values())
+            self._inspectors.clear()
+        for inspector in inspectors:
+            inspector.writer.cancel()
+
+
+manager = ConnectionManager(
+    queue_size=settings.inspector_queue_size, max_dropped=settings.inspector_max_dropped
+)
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI, Request
 from slowapi.errors import RateLimitExceeded
@@ -8,9 +10,24 @@ from app.core.rate_limit import limiter
 from app.api import admin as admin_router
 from app.api import discord as discord_router
 from app.api import inspector as inspector_router
-from app.middleware.audit import AuditMiddleware
+from app.inspector.manager import manager as inspector_manager
+from app.middleware.audit import AuditMiddleware, audit_writer
+from app.services.message_index import message_index
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    audit_writer.start()
+    yield
+    # Write out queued audit events before the inspectors and Discord clients go away
+    await audit_writer.stop()
+    await inspector_manager.close()
+    # Close the pooled Discord connections and the message index
+    await discord_router.discord_clients.close()
+    await message_index.close()
+
 
-app = FastAPI(title=settings.app_name)
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
 # Attach rate limiter
 app.state.limiter = limiter
@@ -1,21 +1,164 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 from datetime import datetime
-from typing import Callable, Awaitable
+from typing import Any, Dict, List, Optional
 
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from sqlalchemy import select
 
+from app.core.auth_cache import lookup_api_key
 from app.core.config import settings
 from app.core.database import AsyncSessionLocal
 from app.core.security import hash_api_key
-from app.models import APIKey, AuditLog
+from app.models import AuditLog
 from app.inspector.manager import manager as inspector_manager
 
+logger = logging.getLogger(__name__)
+
+# Queued by AuditWriter.stop() to end the writer after the pending events
+_STOP = object()
+
+
+class AuditWriter:
+    """Persists audit events in batches from a background task.
+
+    Requests only enqueue an event (no I/O on the request path). The writer
+    drains the queue in batches of up to ``batch_size`` events or whatever
+    arrived within ``flush_interval`` seconds, resolves the API keys (via the
+    auth cache), bulk-inserts the rows in one transaction and then hands each
+    event to the inspector.
+
+    Overflow policy: the queue holds at most ``max_queue`` events; when it is
+    full new events are dropped (and counted in ``dropped``) rather than
+    slowing requests down. ``stop()`` flushes everything still queued.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 10_000,
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+        session_factory=AsyncSessionLocal,
+    ):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._session_factory = session_factory
+        self.dropped = 0
+        self.written = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._task = asyncio.create_task(self._run())
+
+    def submit(self, event: Dict[str, Any]) -> bool:
+        """Queue an event; returns False if it was dropped because the queue is full."""
+        self.start()
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning("Audit queue full, %s events dropped so far", self.dropped)
+            return False
+
+    async def stop(self) -> None:
+        """Flush every queued event, then stop the background task."""
+        if self._task is None or self._task.done():
+            return
+        # Queued behind all pending events, so they are written first
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            batch: List[Dict[str, Any]] = []
+            item = await self._queue.get()
+            deadline = loop.time() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                if not self._queue.empty():
+                    item = self._queue.get_nowait()
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._flush(batch)
+            except Exception as exc:  # noqa: BLE001
+                logger.error("Audit flush failed: %s", exc)
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        if not batch:
+            return
+        # Open new DB session so we are decoupled from endpoint transactions
+        async with self._session_factory() as session:
+            rows = []
+            for event in batch:
+                hashed_key = event.pop("hashed_key", None)
+                api_key_obj = await lookup_api_key(hashed_key, session) if hashed_key else None
+                event["tenant_id"] = api_key_obj.tenant_id if api_key_obj else None
+                event["api_key_id"] = api_key_obj.id if api_key_obj else None
+                # Audit rows need a tenant and key; anonymous requests are only broadcast
+                if api_key_obj is not None:
+                    rows.append(AuditLog(
+                        tenant_id=api_key_obj.tenant_id,
+                        api_key_id=api_key_obj.id,
+                        timestamp=event["timestamp"],
+                        endpoint=event["endpoint"],
+                        method=event["method"],
+                        status_code=event["status_code"],
+                    ))
+            if rows:
+                session.add_all(rows)
+                try:
+                    await session.commit()
+                    self.written += len(rows)
+                except Exception as exc:  # noqa: BLE001
+                    logger.error("Failed to write %s audit log rows: %s", len(rows), exc)
+                    await session.rollback()
+
+        # Broadcast to inspector
+        for event in batch:
+            await inspector_manager.broadcast(
+                {
+                    "event": "audit_log",
+                    "timestamp": event["timestamp"].isoformat(),
+                    "tenant_id": str(event["tenant_id"]) if event["tenant_id"] else None,
+                    "endpoint": event["endpoint"],
+                    "method": event["method"],
+                    "status_code": event["status_code"],
+                }
+            )
+
+
+audit_writer = AuditWriter(
+    max_queue=settings.audit_queue_size,
+    batch_size=settings.audit_batch_size,
+    flush_interval=settings.audit_flush_interval_seconds,
+)
+
 
 class AuditMiddleware(BaseHTTPMiddleware):
-    """Middleware that stores an audit log entry for every HTTP request."""
+    """Middleware that records an audit log entry for every HTTP request."""
 
     async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:  # type: ignore[override]
         start = datetime.utcnow()
@@ -26,44 +169,13 @@ class AuditMiddleware(BaseHTTPMiddleware):
         finally:
             # Create audit log entry even if an exception occurred (response may be None)
             status_code = response.status_code if response else 500
-            await self._write_audit_log(request, status_code, start)
-
-    async def _write_audit_log(self, request: Request, status_code: int, timestamp: datetime):
-        # Open new DB session so we are decoupled from endpoint transactions
-        async with AsyncSessionLocal() as session:
-            tenant_id = None
-            api_key_id = None
             api_key_header = request.headers.get(settings.api_key_header)
-            if api_key_header:
-                hashed = hash_api_key(api_key_header)
-                result = await session.execute(select(APIKey).where(APIKey.hashed_key == hashed))
-                api_key_obj = result.scalar_one_or_none()
-                if api_key_obj is not None:
-                    api_key_id = api_key_obj.id
-                    tenant_id = api_key_obj.tenant_id
-
-            audit = AuditLog(
-                tenant_id=tenant_id,
-                api_key_id=api_key_id,
-                timestamp=timestamp,
-                endpoint=request.url.path,
-                method=request.method,
-                status_code=status_code,
-            )
-            session.add(audit)
-            try:
-                await session.commit()
-            except Exception:
-                await session.rollback()
-
-            # Broadcast to inspector
-            await inspector_manager.broadcast(
+            audit_writer.submit(
                 {
-                    "event": "audit_log",
-                    "timestamp": timestamp.isoformat(),
-                    "tenant_id": str(tenant_id) if tenant_id else None,
+                    "hashed_key": hash_api_key(api_key_header) if api_key_header else None,
+                    "timestamp": start,
                     "endpoint": request.url.path,
                     "method": request.method,
                     "status_code": status_code,
                 }
-            ) 
\ No newline at end of file
+            )
@@ -6,6 +6,7 @@ from app.schemas.discord import (
     ChannelInfoResponse,
     DeleteMessageRequest,
     SearchMessagesRequest,
+    MessageRetentionSettings,
 )
 
 __all__ = [
@@ -18,4 +19,5 @@ __all__ = [
     "ChannelInfoResponse",
     "DeleteMessageRequest",
     "SearchMessagesRequest",
+    "MessageRetentionSettings",
 ] 
\ No newline at end of file
@@ -36,5 +36,10 @@ class DeleteMessageRequest(BaseModel):
 
 class SearchMessagesRequest(BaseModel):
     channel_id: int
-    keyword: str = Field(..., description="Case-insensitive keyword to search in message content")
-    limit: int = Field(100, ge=1, le=100) 
\ No newline at end of file
+    keyword: str = Field(..., min_length=1, description="Case-insensitive keyword to search in message content")
+    limit: int = Field(100, ge=1, le=100, description="Maximum number of matches (newest first)")
+
+
+class MessageRetentionSettings(BaseModel):
+    retention_days: int = Field(..., ge=1, description="Messages older than this are not kept in the search index")
+    max_messages_per_channel: int = Field(..., ge=1, description="Newest messages kept per channel") 
\ No newline at end of file
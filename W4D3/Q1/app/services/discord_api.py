@@ -2,14 +2,26 @@
 
 from __future__ import annotations
 
+import asyncio
+import importlib.util
 import logging
-from typing import Any, Dict, List, Optional
+import re
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
 
 DISCORD_API_BASE = "https://discord.com/api/v10"
 logger = logging.getLogger(__name__)
 
+# HTTP/2 needs the optional `h2` package (httpx[http2]); fall back to HTTP/1.1 keep-alive without it
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# How many times a request that hit a 429 is retried after waiting out the limit
+MAX_RATE_LIMIT_RETRIES = 3
+
+_ID_RE = re.compile(r"/\d+")
+_MAJOR_PARAM_RE = re.compile(r"^/(channels|guilds|webhooks)/(\d+)")
+
 
 class DiscordAPIError(Exception):
     """Raised when Discord returns a non-2xx response."""
@@ -20,28 +32,149 @@ class DiscordAPIError(Exception):
         self.error = error
 
 
+def _route_key(method: str, url: str) -> Tuple[str, str]:
+    """(route, major parameter) for a request path, e.g. ("GET /channels/{id}/messages", "123").
+
+    Discord rate-limits per route *and* per major parameter (channel, guild or
+    webhook id); all other ids in the path share the route's bucket.
+    """
+    match = _MAJOR_PARAM_RE.match(url)
+    return f"{method} {_ID_RE.sub('/{id}', url)}", match.group(2) if match else ""
+
+
+class _Bucket:
+    """Local view of one Discord rate-limit bucket."""
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None  # None until Discord has told us
+        self.reset_at = 0.0
+
+
+class RateLimiter:
+    """Tracks Discord's per-route rate-limit buckets from response headers.
+
+    Requests reserve a slot in their bucket before they are sent; when a
+    bucket is exhausted, callers queue (FIFO, on the bucket's lock) until it
+    resets instead of sending a request that would come back as 429.
+    """
+
+    def __init__(self):
+        self._bucket_ids: Dict[str, str] = {}  # route -> X-RateLimit-Bucket hash
+        self._buckets: Dict[Tuple[str, str], _Bucket] = {}
+        self._global_reset_at = 0.0
+
+    def bucket(self, route: str, major: str) -> _Bucket:
+        # Until Discord names the bucket, the route itself is the bucket
+        key = (self._bucket_ids.get(route, route), major)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket()
+        return bucket
+
+    async def acquire(self, bucket: _Bucket) -> None:
+        """Wait until ``bucket`` (and the global limit) allows one more request."""
+        loop = asyncio.get_running_loop()
+        async with bucket.lock:
+            while True:
+                now = loop.time()
+                if self._global_reset_at > now:
+                    await asyncio.sleep(self._global_reset_at - now)
+                    continue
+                if bucket.reset_at <= now and bucket.remaining is not None:
+                    bucket.remaining = bucket.limit  # Window has rolled over
+                if bucket.remaining is not None and bucket.remaining <= 0:
+                    logger.debug("Discord bucket exhausted, waiting %.2fs", bucket.reset_at - now)
+                    await asyncio.sleep(bucket.reset_at - now)
+                    continue
+                if bucket.remaining is not None:
+                    bucket.remaining -= 1
+                return
+
+    def update(self, route: str, major: str, resp: httpx.Response) -> None:
+        """Record the bucket state reported by a response."""
+        headers = resp.headers
+        now = asyncio.get_running_loop().time()
+        bucket_id = headers.get("X-RateLimit-Bucket")
+        if bucket_id:
+            self._bucket_ids[route] = bucket_id
+        bucket = self.bucket(route, major)
+
+        if resp.status_code == 429:
+            retry_after = _retry_after(resp)
+            if headers.get("X-RateLimit-Global") or headers.get("X-RateLimit-Scope") == "global":
+                self._global_reset_at = now + retry_after
+            else:
+                bucket.remaining = 0
+                bucket.reset_at = now + retry_after
+            return
+
+        if "X-RateLimit-Remaining" in headers:
+            bucket.limit = int(headers.get("X-RateLimit-Limit", 1))
+            bucket.remaining = int(headers["X-RateLimit-Remaining"])
+            bucket.reset_at = now + float(headers.get("X-RateLimit-Reset-After", 0))
+
+
+def _retry_after(resp: httpx.Response) -> float:
+    try:
+        return float(resp.json()["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        return float(resp.headers.get("Retry-After", 1))
+
+
 class DiscordClient:
-    def __init__(self, bot_token: str):
+    def __init__(
+        self,
+        bot_token: str,
+        http2: bool = False,
+        limits: Optional[httpx.Limits] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
         self._headers = {"Authorization": f"Bot {bot_token}"}
         # Create a single AsyncClient instance; caller is responsible for lifespan.
-        self._client = httpx.AsyncClient(headers=self._headers, base_url=DISCORD_API_BASE, timeout=10.0)
+        self._client = httpx.AsyncClient(
+            headers=self._headers,
+            base_url=DISCORD_API_BASE,
+            timeout=10.0,
+            http2=http2 and HTTP2_AVAILABLE,
+            limits=limits or httpx.Limits(),
+            transport=transport,
+        )
+        self.rate_limiter = RateLimiter()
 
     async def close(self):
         await self._client.aclose()
 
     async def _request(self, method: str, url: str, **kwargs):
-        resp = await self._client.request(method, url, **kwargs)
+        route, major = _route_key(method, url)
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            await self.rate_limiter.acquire(self.rate_limiter.bucket(route, major))
+            resp = await self._client.request(method, url, **kwargs)
+            self.rate_limiter.update(route, major, resp)
+            if resp.status_code != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+                break
+            logger.warning("Discord rate limit hit on %s %s, retrying", method, url)
         if resp.status_code >= 400:
             logger.error("Discord API error %s %s -> %s %s", method, url, resp.status_code, resp.text)
             raise DiscordAPIError(resp.status_code, resp.text)
+        if resp.status_code == 204:
+            return None
         return resp.json()
 
     # Operations
     async def send_message(self, channel_id: int, content: str) -> Dict[str, Any]:
         return await self._request("POST", f"/channels/{channel_id}/messages", json={"content": content})
 
-    async def get_messages(self, channel_id: int, limit: int = 50) -> List[Dict[str, Any]]:
-        return await self._request("GET", f"/channels/{channel_id}/messages", params={"limit": limit})
+    async def get_messages(
+        self, channel_id: int, limit: int = 50, before: Optional[int] = None, after: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        params: Dict[str, Any] = {"limit": limit}
+        if before is not None:
+            params["before"] = before
+        if after is not None:
+            params["after"] = after
+        return await self._request("GET", f"/channels/{channel_id}/messages", params=params)
 
     async def get_channel_info(self, channel_id: int) -> Dict[str, Any]:
         return await self._request("GET", f"/channels/{channel_id}")
@@ -49,8 +182,32 @@ class DiscordClient:
     async def delete_message(self, channel_id: int, message_id: int) -> None:
         await self._request("DELETE", f"/channels/{channel_id}/messages/{message_id}")
 
-    async def search_messages_keyword(self, channel_id: int, keyword: str, limit: int = 100) -> List[Dict[str, Any]]:
-        # Discord does not expose channel-scoped search for bots; fallback: fetch & filter.
-        msgs = await self.get_messages(channel_id, limit=limit)
-        keyword_lower = keyword.lower()
-        return [m for m in msgs if keyword_lower in m.get("content", "").lower()] 
\ No newline at end of file
+
+class DiscordClientRegistry:
+    """Long-lived DiscordClient per bot token.
+
+    Each tenant's bot keeps one pooled (keep-alive, HTTP/2 when available)
+    connection to Discord and one set of rate-limit buckets, instead of a new
+    client and TLS handshake per request. Call ``close()`` on shutdown.
+    """
+
+    def __init__(self, http2: bool = True, max_connections: int = 100, max_keepalive_connections: int = 20):
+        self._http2 = http2
+        self._limits = httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_keepalive_connections
+        )
+        self._clients: Dict[str, DiscordClient] = {}
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get(self, bot_token: str) -> DiscordClient:
+        client = self._clients.get(bot_token)
+        if client is None:
+            client = self._clients[bot_token] = DiscordClient(bot_token, http2=self._http2, limits=self._limits)
+        return client
+
+    async def close(self) -> None:
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.close()
@@ -0,0 +1,343 @@
+"""Local full-text index of Discord channel messages.
+
+Discord offers bots no channel search, so ``/discord/search_messages`` is
+answered from a SQLite FTS5 index instead of fetching and filtering recent
+messages on every call. The first search in a channel pages backwards through
+its history (within the tenant's retention); after that only messages newer
+than the newest indexed one are fetched, at most every ``poll_interval``
+seconds and in the background, so searches never wait on Discord once a
+channel is indexed.
+
+Messages sent or deleted through the gateway are applied to the index
+directly; edits and deletions made elsewhere show up only once the message
+ages out of retention.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Discord's maximum page size for GET /channels/{id}/messages
+PAGE_SIZE = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    tenant_id TEXT NOT NULL,
+    channel_id INTEGER NOT NULL,
+    message_id INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    content TEXT NOT NULL,
+    raw TEXT NOT NULL,
+    UNIQUE (tenant_id, channel_id, message_id)
+);
+-- Trigram tokens give the same case-insensitive substring matching as before
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    content, content='messages', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+CREATE TABLE IF NOT EXISTS channels (
+    tenant_id TEXT NOT NULL,
+    channel_id INTEGER NOT NULL,
+    newest_id INTEGER NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (tenant_id, channel_id)
+);
+CREATE TABLE IF NOT EXISTS retention (
+    tenant_id TEXT PRIMARY KEY,
+    retention_days INTEGER NOT NULL,
+    max_messages_per_channel INTEGER NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class Retention:
+    retention_days: int
+    max_messages_per_channel: int
+
+
+def _created_at(message: Dict[str, Any]) -> float:
+    try:
+        return datetime.fromisoformat(str(message["timestamp"]).replace("Z", "+00:00")).timestamp()
+    except (KeyError, ValueError):
+        return time.time()
+
+
+class MessageIndex:
+    """Per-tenant, per-channel message store with an FTS5 index over content."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        default_retention: Retention = Retention(retention_days=30, max_messages_per_channel=10_000),
+        poll_interval: float = 30.0,
+    ):
+        self.path = Path(path)
+        self.default_retention = default_retention
+        self.poll_interval = poll_interval
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._syncs: Dict[Tuple[str, int], asyncio.Task] = {}
+        self._refreshes: Set[asyncio.Task] = set()
+
+    # ------------------------------------------------------------------
+    # SQLite (runs on worker threads)
+    # ------------------------------------------------------------------
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _run(self, fn, *args):
+        def locked():
+            with self._lock:
+                return fn(self._db(), *args)
+
+        return asyncio.to_thread(locked)
+
+    @staticmethod
+    def _get_retention(conn: sqlite3.Connection, tenant_id: str) -> Optional[Retention]:
+        row = conn.execute(
+            "SELECT retention_days, max_messages_per_channel FROM retention WHERE tenant_id = ?", (tenant_id,)
+        ).fetchone()
+        return Retention(*row) if row else None
+
+    @staticmethod
+    def _set_retention(conn: sqlite3.Connection, tenant_id: str, retention: Retention) -> None:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO retention (tenant_id, retention_days, max_messages_per_channel) "
+                "VALUES (?, ?, ?)",
+                (tenant_id, retention.retention_days, retention.max_messages_per_channel),
+            )
+            channels = conn.execute("SELECT channel_id FROM channels WHERE tenant_id = ?", (tenant_id,)).fetchall()
+            for (channel_id,) in channels:
+                MessageIndex._prune(conn, tenant_id, channel_id, retention)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _prune(conn: sqlite3.Connection, tenant_id: str, channel_id: int, retention: Retention) -> None:
+        # Enforce retention: age first, then the per-channel cap (newest messages are kept)
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=retention.retention_days)).timestamp()
+        conn.execute(
+            "DELETE FROM messages WHERE tenant_id = ? AND channel_id = ? AND created_at < ?",
+            (tenant_id, channel_id, cutoff),
+        )
+        conn.execute(
+            "DELETE FROM messages WHERE tenant_id = ? AND channel_id = ? AND message_id < ("
+            "  SELECT message_id FROM messages WHERE tenant_id = ? AND channel_id = ?"
+            "  ORDER BY message_id DESC LIMIT 1 OFFSET ?)",
+            (tenant_id, channel_id, tenant_id, channel_id, retention.max_messages_per_channel - 1),
+        )
+
+    @staticmethod
+    def _channel_state(conn: sqlite3.Connection, tenant_id: str, channel_id: int) -> Optional[Tuple[int, float]]:
+        return conn.execute(
+            "SELECT newest_id, synced_at FROM channels WHERE tenant_id = ? AND channel_id = ?",
+            (tenant_id, channel_id),
+        ).fetchone()
+
+    @staticmethod
+    def _store(conn: sqlite3.Connection, tenant_id: str, channel_id: int, messages: List[Dict[str, Any]]) -> None:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR IGNORE INTO messages (tenant_id, channel_id, message_id, created_at, content, raw) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (tenant_id, channel_id, int(m["id"]), _created_at(m), m.get("content") or "", json.dumps(m))
+                    for m in messages
+                ],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _finish_sync(
+        conn: sqlite3.Connection, tenant_id: str, channel_id: int, newest_id: int, retention: Retention
+    ) -> None:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO channels (tenant_id, channel_id, newest_id, synced_at) VALUES (?, ?, ?, ?)",
+                (tenant_id, channel_id, newest_id, time.time()),
+            )
+            MessageIndex._prune(conn, tenant_id, channel_id, retention)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, tenant_id: str, channel_id: int, message_id: int) -> None:
+        conn.execute(
+            "DELETE FROM messages WHERE tenant_id = ? AND channel_id = ? AND message_id = ?",
+            (tenant_id, channel_id, message_id),
+        )
+
+    @staticmethod
+    def _search(
+        conn: sqlite3.Connection, tenant_id: str, channel_id: int, keyword: str, limit: int
+    ) -> List[Dict[str, Any]]:
+        if len(keyword) >= 3:
+            # CROSS JOIN keeps the FTS lookup first; otherwise SQLite walks the channel and probes FTS per row
+            rows = conn.execute(
+                "SELECT m.raw FROM messages_fts CROSS JOIN messages m ON m.id = messages_fts.rowid "
+                "WHERE messages_fts MATCH ? AND m.tenant_id = ? AND m.channel_id = ? "
+                "ORDER BY m.message_id DESC LIMIT ?",
+                ('"' + keyword.replace('"', '""') + '"', tenant_id, channel_id, limit),
+            )
+        else:
+            # Trigrams cannot match fewer than three characters
+            escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            rows = conn.execute(
+                "SELECT raw FROM messages WHERE tenant_id = ? AND channel_id = ? AND content LIKE ? ESCAPE '\\' "
+                "ORDER BY message_id DESC LIMIT ?",
+                (tenant_id, channel_id, f"%{escaped}%", limit),
+            )
+        return [json.loads(raw) for (raw,) in rows]
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    async def get_retention(self, tenant_id: str) -> Retention:
+        return await self._run(self._get_retention, tenant_id) or self.default_retention
+
+    async def set_retention(self, tenant_id: str, retention: Retention) -> None:
+        """Store the tenant's retention and prune its indexed channels to it right away.
+
+        A longer retention does not bring back pruned messages; it applies to
+        messages indexed from now on.
+        """
+        await self._run(self._set_retention, tenant_id, retention)
+
+    async def add_message(self, tenant_id: str, channel_id: int, message: Dict[str, Any]) -> None:
+        """Index a message the gateway itself sent (only for channels already being indexed)."""
+        if await self._run(self._channel_state, tenant_id, channel_id) is not None:
+            await self._run(self._store, tenant_id, channel_id, [message])
+
+    async def remove_message(self, tenant_id: str, channel_id: int, message_id: int) -> None:
+        await self._run(self._delete, tenant_id, channel_id, message_id)
+
+    async def sync(self, client, tenant_id: str, channel_id: int) -> None:
+        """Bring the channel up to date (backfill on first use, then only new messages).
+
+        Concurrent calls for the same channel share one sync.
+        """
+        key = (tenant_id, channel_id)
+        task = self._syncs.get(key)
+        if task is None:
+            task = self._syncs[key] = asyncio.create_task(self._sync(client, tenant_id, channel_id))
+            task.add_done_callback(lambda _: self._syncs.pop(key, None))
+        await asyncio.shield(task)
+
+    async def search(
+        self, client, tenant_id: str, channel_id: int, keyword: str, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Newest-first messages containing ``keyword`` (case-insensitive), from the local index."""
+        state = await self._run(self._channel_state, tenant_id, channel_id)
+        if state is None:
+            await self.sync(client, tenant_id, channel_id)
+        elif time.time() - state[1] >= self.poll_interval and (tenant_id, channel_id) not in self._syncs:
+            # Answer from the index now; pick up new messages for the next search
+            refresh = asyncio.create_task(self._refresh(client, tenant_id, channel_id))
+            self._refreshes.add(refresh)
+            refresh.add_done_callback(self._refreshes.discard)
+        return await self._run(self._search, tenant_id, channel_id, keyword, limit)
+
+    async def close(self) -> None:
+        for task in [*self._syncs.values(), *self._refreshes]:
+            task.cancel()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    # Fetching from Discord
+    # ------------------------------------------------------------------
+    async def _refresh(self, client, tenant_id: str, channel_id: int) -> None:
+        try:
+            await self.sync(client, tenant_id, channel_id)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Background sync of channel %s failed: %s", channel_id, exc)
+
+    async def _sync(self, client, tenant_id: str, channel_id: int) -> None:
+        retention = await self.get_retention(tenant_id)
+        state = await self._run(self._channel_state, tenant_id, channel_id)
+        if state is None:
+            newest_id = await self._backfill(client, tenant_id, channel_id, retention)
+        else:
+            newest_id = await self._fetch_new(client, tenant_id, channel_id, state[0])
+        await self._run(self._finish_sync, tenant_id, channel_id, newest_id, retention)
+
+    async def _backfill(self, client, tenant_id: str, channel_id: int, retention: Retention) -> int:
+        """Page backwards from the newest message until retention is covered; returns the newest id."""
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=retention.retention_days)).timestamp()
+        newest_id, before, stored = 0, None, 0
+        while stored < retention.max_messages_per_channel:
+            page = await client.get_messages(channel_id, limit=PAGE_SIZE, before=before)
+            ids = [int(m["id"]) for m in page]
+            if before is not None:
+                page = [m for m, i in zip(page, ids) if i < before]
+            if not page:
+                break
+            fresh = [m for m in page if _created_at(m) >= cutoff]
+            await self._run(self._store, tenant_id, channel_id, fresh)
+            stored += len(fresh)
+            newest_id = max(newest_id, *ids)
+            if len(fresh) < len(page) or len(ids) < PAGE_SIZE:
+                break
+            before = min(ids)
+        return newest_id
+
+    async def _fetch_new(self, client, tenant_id: str, channel_id: int, newest_id: int) -> int:
+        """Fetch messages after ``newest_id`` page by page; returns the new newest id."""
+        while True:
+            page = [m for m in await client.get_messages(channel_id, limit=PAGE_SIZE, after=newest_id)
+                    if int(m["id"]) > newest_id]
+            if not page:
+                return newest_id
+            await self._run(self._store, tenant_id, channel_id, page)
+            newest_id = max(int(m["id"]) for m in page)
+            if len(page) < PAGE_SIZE:
+                return newest_id
+
+
+message_index = MessageIndex(
+    settings.message_index_path,
+    default_retention=Retention(
+        retention_days=settings.message_retention_days,
+        max_messages_per_channel=settings.message_retention_max_per_channel,
+    ),
+    poll_interval=settings.message_index_poll_seconds,
+)
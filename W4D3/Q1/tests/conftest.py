@@ -3,7 +3,7 @@ import uuid
 import secrets
 
 import pytest
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
@@ -66,6 +66,7 @@ async def admin_key(db):
     plain_key = f"adminkey-{secrets.token_hex(8)}"
     api_key = APIKey(
         tenant_id=tenant.id,
+        name="admin",
         hashed_key=hash_api_key(plain_key),
         role=RoleEnum.admin,
     )
@@ -76,5 +77,5 @@ async def admin_key(db):
 
 @pytest.fixture
 async def client():
-    async with AsyncClient(app=fastapi_app, base_url="http://test") as c:
+    async with AsyncClient(transport=ASGITransport(app=fastapi_app), base_url="http://test") as c:
         yield c 
\ No newline at end of file
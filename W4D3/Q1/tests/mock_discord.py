@@ -1,11 +1,24 @@
+import time
 from datetime import datetime
 
+import httpx
+
 
 class MockDiscordClient:
     """Mock version of DiscordClient for unit tests."""
 
-    def __init__(self, token: str):
+    def __init__(self, token: str, history_size: int = 250):
         self.token = token
+        # Channel history, oldest first; message 42 mentions "hello"
+        self.history = [
+            {
+                "id": i,
+                "content": "hello from the archive" if i == 42 else f"msg{i}",
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+            for i in range(1, history_size + 1)
+        ]
+        self.get_messages_calls = 0
 
     async def close(self):
         """No-op close."""
@@ -19,10 +32,15 @@ class MockDiscordClient:
             "timestamp": datetime.utcnow().isoformat(),
         }
 
-    async def get_messages(self, channel_id: int, limit: int = 50):
-        return [
-            {"id": i, "channel_id": channel_id, "content": f"msg{i}"} for i in range(limit)
-        ]
+    async def get_messages(self, channel_id: int, limit: int = 50, before=None, after=None):
+        """Newest first, like Discord; ``before`` / ``after`` page through ``history``."""
+        self.get_messages_calls += 1
+        if after is not None:
+            page = [m for m in self.history if m["id"] > after][:limit]
+        else:
+            older = [m for m in self.history if before is None or m["id"] < before]
+            page = older[-limit:]
+        return [{**m, "channel_id": channel_id} for m in reversed(page)]
 
     async def get_channel_info(self, channel_id: int):
         return {
@@ -35,13 +53,44 @@ class MockDiscordClient:
     async def delete_message(self, channel_id: int, message_id: int):
         return None
 
-    async def search_messages_keyword(
-        self, channel_id: int, keyword: str, limit: int = 100
-    ):
-        return [
-            {
-                "id": 99,
-                "channel_id": channel_id,
-                "content": f"{keyword} found",
-            }
-        ] 
\ No newline at end of file
+
+class RateLimitedDiscord:
+    """httpx transport handler emulating Discord's per-channel rate limits.
+
+    Each channel allows ``limit`` requests per ``window`` seconds and reports
+    its bucket in the usual X-RateLimit-* headers; requests over the limit get
+    a 429. ``responses`` / ``rate_limited`` count what was served.
+    """
+
+    def __init__(self, limit: int = 2, window: float = 0.2):
+        self.limit = limit
+        self.window = window
+        self.windows = {}  # path -> (window start, requests in window)
+        self.responses = 0
+        self.rate_limited = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        now = time.monotonic()
+        path = request.url.path
+        start, count = self.windows.get(path, (now, 0))
+        if now - start >= self.window:
+            start, count = now, 0
+        reset_after = self.window - (now - start)
+        if count >= self.limit:
+            self.rate_limited += 1
+            return httpx.Response(
+                429,
+                json={"message": "You are being rate limited.", "retry_after": reset_after, "global": False},
+                headers={"X-RateLimit-Bucket": "abc", "X-RateLimit-Remaining": "0"},
+            )
+        self.windows[path] = (start, count + 1)
+        self.responses += 1
+        headers = {
+            "X-RateLimit-Bucket": "abc",
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.limit - count - 1),
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+        }
+        if request.method == "DELETE":
+            return httpx.Response(204, headers=headers)
+        return httpx.Response(200, json={"id": "1", "channel_id": "123", "content": "ok"}, headers=headers)
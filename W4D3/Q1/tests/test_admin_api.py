@@ -6,7 +6,7 @@ async def test_admin_api_key_lifecycle(client, admin_key):
     headers = {"X-API-Key": admin_key}
 
     # Create new write key
-    resp = await client.post("/admin/api-keys", json={"role": "write"}, headers=headers)
+    resp = await client.post("/admin/api-keys", json={"name": "writer", "role": "write"}, headers=headers)
     assert resp.status_code == 201
     data = resp.json()
     new_key_id = data["id"]
@@ -21,4 +21,23 @@ async def test_admin_api_key_lifecycle(client, admin_key):
 
     # Revoke key
     resp = await client.delete(f"/admin/api-keys/{new_key_id}", headers=headers)
-    assert resp.status_code == 204 
\ No newline at end of file
+    assert resp.status_code == 204 
+
+@pytest.mark.asyncio
+async def test_revoked_key_is_rejected_immediately(client, admin_key):
+    headers = {"X-API-Key": admin_key}
+
+    resp = await client.post("/admin/api-keys", json={"name": "second", "role": "admin"}, headers=headers)
+    assert resp.status_code == 201
+    second = resp.json()
+    second_headers = {"X-API-Key": second["secret"]}
+
+    # First use caches the key
+    resp = await client.get("/admin/api-keys", headers=second_headers)
+    assert resp.status_code == 200
+
+    resp = await client.delete(f"/admin/api-keys/{second['id']}", headers=headers)
+    assert resp.status_code == 204
+
+    resp = await client.get("/admin/api-keys", headers=second_headers)
+    assert resp.status_code == 401
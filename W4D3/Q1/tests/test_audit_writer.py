@@ -0,0 +1,44 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.security import hash_api_key
+from app.middleware.audit import AuditWriter
+from app.models import AuditLog
+
+
+def _event(hashed_key, endpoint):
+    return {
+        "hashed_key": hashed_key,
+        "timestamp": datetime.utcnow(),
+        "endpoint": endpoint,
+        "method": "GET",
+        "status_code": 200,
+    }
+
+
+@pytest.mark.asyncio
+async def test_events_are_bulk_written_and_flushed_on_stop(session_maker, admin_key):
+    writer = AuditWriter(batch_size=3, flush_interval=0.05, session_factory=session_maker)
+    endpoint = f"/audit-test/{uuid.uuid4().hex}"
+    for _ in range(7):
+        assert writer.submit(_event(hash_api_key(admin_key), endpoint))
+    # Anonymous requests are broadcast but not stored
+    writer.submit(_event(None, endpoint))
+    await writer.stop()
+
+    async with session_maker() as session:
+        count = await session.scalar(select(func.count()).select_from(AuditLog).where(AuditLog.endpoint == endpoint))
+    assert count == 7
+    assert writer.written == 7
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_new_events(session_maker):
+    writer = AuditWriter(max_queue=2, session_factory=session_maker)
+    results = [writer.submit(_event(None, "/overflow")) for _ in range(3)]
+    assert results == [True, True, False]
+    assert writer.dropped == 1
+    await writer.stop()
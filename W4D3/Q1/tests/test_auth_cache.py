@@ -0,0 +1,54 @@
+import uuid
+
+from app.core import auth_cache as auth_cache_module
+from app.core.auth_cache import APIKeyCache, APIKeyInfo, TenantInfo
+from app.models import RoleEnum
+
+
+def _info() -> APIKeyInfo:
+    tenant = TenantInfo(id=uuid.uuid4(), name="t", discord_bot_token="token")
+    return APIKeyInfo(id=uuid.uuid4(), tenant_id=tenant.id, role=RoleEnum.read, revoked=False, tenant=tenant)
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(auth_cache_module.time, "monotonic", lambda: now[0])
+    cache = APIKeyCache(max_size=10, ttl_seconds=60)
+    info = _info()
+    cache.put("h", info)
+    assert cache.get("h") is info
+    now[0] += 61
+    assert cache.get("h") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = APIKeyCache(max_size=2, ttl_seconds=60)
+    cache.put("a", _info())
+    cache.put("b", _info())
+    cache.get("a")
+    cache.put("c", _info())
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_invalidate_and_disabled_cache():
+    cache = APIKeyCache(max_size=10, ttl_seconds=60)
+    cache.put("a", _info())
+    cache.invalidate("a")
+    assert cache.get("a") is None
+
+    disabled = APIKeyCache(max_size=10, ttl_seconds=0)
+    disabled.put("a", _info())
+    assert len(disabled) == 0
+
+
+def test_load_racing_invalidate_is_not_cached():
+    cache = APIKeyCache(max_size=10, ttl_seconds=60)
+    generation = cache.generation("a")  # Loader starts reading the un-revoked row
+    cache.invalidate("a")  # Revocation commits and invalidates meanwhile
+    cache.put("a", _info(), generation)
+    assert cache.get("a") is None
+
+    cache.put("a", _info(), cache.generation("a"))
+    assert cache.get("a") is not None
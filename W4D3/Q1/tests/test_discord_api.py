@@ -1,7 +1,9 @@
 import pytest
 
 from tests.mock_discord import MockDiscordClient
+import app.api.admin as admin_api_module
 import app.api.discord as discord_api_module
+from app.services.message_index import MessageIndex
 
 
 @pytest.fixture(autouse=True)
@@ -12,6 +14,15 @@ def patch_discord_client(monkeypatch):
     monkeypatch.setattr(discord_api_module, "_get_client", _mock_get_client)
 
 
+@pytest.fixture(autouse=True)
+async def patch_message_index(monkeypatch, tmp_path):
+    index = MessageIndex(tmp_path / "message_index.db")
+    monkeypatch.setattr(discord_api_module, "message_index", index)
+    monkeypatch.setattr(admin_api_module, "message_index", index)
+    yield index
+    await index.close()
+
+
 @pytest.mark.asyncio
 async def test_discord_endpoints(client, admin_key):
     headers = {"X-API-Key": admin_key}
@@ -53,4 +64,22 @@ async def test_discord_endpoints(client, admin_key):
         headers=headers,
     )
     assert resp.status_code == 200
-    assert len(resp.json()["messages"]) >= 1 
\ No newline at end of file
+    assert [m["content"] for m in resp.json()["messages"]] == ["hello from the archive"]
+
+
+@pytest.mark.asyncio
+async def test_message_retention_settings(client, admin_key):
+    headers = {"X-API-Key": admin_key}
+
+    resp = await client.get("/admin/message-index/retention", headers=headers)
+    assert resp.status_code == 200
+    assert resp.json()["retention_days"] == 30
+
+    resp = await client.put(
+        "/admin/message-index/retention",
+        json={"retention_days": 7, "max_messages_per_channel": 500},
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    resp = await client.get("/admin/message-index/retention", headers=headers)
+    assert resp.json() == {"retention_days": 7, "max_messages_per_channel": 500} 
\ No newline at end of file
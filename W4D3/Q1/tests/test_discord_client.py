@@ -0,0 +1,69 @@
+import asyncio
+
+import httpx
+import pytest
+
+import app.api.discord as discord_api_module
+from app.services.discord_api import DiscordClient, DiscordClientRegistry, _route_key
+from tests.mock_discord import RateLimitedDiscord
+
+
+def test_route_key_groups_by_major_parameter():
+    assert _route_key("DELETE", "/channels/1/messages/2") == ("DELETE /channels/{id}/messages/{id}", "1")
+    assert _route_key("DELETE", "/channels/1/messages/3")[0] == _route_key("DELETE", "/channels/1/messages/2")[0]
+    assert _route_key("GET", "/channels/9") == ("GET /channels/{id}", "9")
+
+
+@pytest.mark.asyncio
+async def test_requests_queue_locally_instead_of_hitting_429():
+    discord = RateLimitedDiscord(limit=2, window=0.2)
+    client = DiscordClient("token", transport=httpx.MockTransport(discord))
+    try:
+        # Learn the bucket from the first response, then burst
+        await client.send_message(123, "first")
+        await asyncio.gather(*(client.send_message(123, f"msg{i}") for i in range(6)))
+        await client.delete_message(123, 1)
+    finally:
+        await client.close()
+
+    assert discord.responses == 8
+    assert discord.rate_limited == 0
+
+
+@pytest.mark.asyncio
+async def test_429_is_retried_after_retry_after():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(asyncio.get_running_loop().time())
+        if len(calls) == 1:
+            return httpx.Response(429, json={"message": "slow down", "retry_after": 0.1, "global": False})
+        return httpx.Response(200, json={"id": "1", "channel_id": "123", "content": "a"})
+
+    client = DiscordClient("token", transport=httpx.MockTransport(handler))
+    try:
+        resp = await client.send_message(123, "a")
+    finally:
+        await client.close()
+
+    assert resp["content"] == "a"
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_clients_are_pooled_per_bot_token():
+    registry = DiscordClientRegistry(http2=False)
+    try:
+        assert registry.get("token-a") is registry.get("token-a")
+        assert registry.get("token-a") is not registry.get("token-b")
+        assert len(registry) == 2
+    finally:
+        await registry.close()
+    assert len(registry) == 0
+
+
+@pytest.mark.asyncio
+async def test_router_reuses_the_tenant_client():
+    first = await discord_api_module._get_client("tenant-token")
+    assert await discord_api_module._get_client("tenant-token") is first
@@ -0,0 +1,70 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.inspector.manager import SLOW_CONSUMER_CLOSE_CODE, ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self, stalled: bool = False, delay: float = 0.0):
+        self.stalled = stalled
+        self.delay = delay
+        self.received = []
+        self.close_code = None
+
+    async def accept(self):
+        return None
+
+    async def send_text(self, text):
+        if self.stalled:
+            await asyncio.Event().wait()  # Never completes
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received.append(json.loads(text))
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+
+async def _broadcast_seconds(manager, n):
+    start = time.perf_counter()
+    for i in range(n):
+        await manager.broadcast({"event": "audit_log", "seq": i})
+    return (time.perf_counter() - start) / n
+
+
+@pytest.mark.asyncio
+async def test_broadcast_cost_stays_flat_with_500_inspectors():
+    # Each send takes 1ms: sending sequentially would cost 0.5s per broadcast
+    manager = ConnectionManager(queue_size=1000, max_dropped=1000)
+    await manager.connect(FakeWebSocket(delay=0.001))
+    for i in range(499):
+        await manager.connect(FakeWebSocket(stalled=i % 10 == 0, delay=0.001))
+    assert manager.count == 500
+    many = await _broadcast_seconds(manager, 100)
+    await manager.close()
+
+    # Broadcasting only enqueues, so it never waits on a socket
+    assert many < 0.01
+
+
+@pytest.mark.asyncio
+async def test_slow_inspector_is_dropped_and_disconnected():
+    manager = ConnectionManager(queue_size=5, max_dropped=10)
+    fast = FakeWebSocket()
+    slow = FakeWebSocket(stalled=True)
+    await manager.connect(fast)
+    await manager.connect(slow)
+
+    for i in range(50):
+        await manager.broadcast({"event": "audit_log", "seq": i})
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.01)
+
+    assert slow.close_code == SLOW_CONSUMER_CLOSE_CODE
+    assert manager.count == 1
+    # The fast inspector got every audit event despite the stalled one
+    assert [m["seq"] for m in fast.received if m["event"] == "audit_log"] == list(range(50))
+    await manager.close()
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+import pytest
+
+from app.services.message_index import MessageIndex, Retention
+from tests.mock_discord import MockDiscordClient
+
+TENANT = "tenant-a"
+
+
+@pytest.fixture
+async def index(tmp_path):
+    index = MessageIndex(tmp_path / "index.db", poll_interval=0)
+    yield index
+    await index.close()
+
+
+@pytest.mark.asyncio
+async def test_backfills_once_then_answers_locally(index):
+    client = MockDiscordClient("token", history_size=250)
+
+    hits = await index.search(client, TENANT, 1, "HELLO")
+    assert [m["id"] for m in hits] == [42]
+    backfill_calls = client.get_messages_calls
+    assert backfill_calls == 3  # 250 messages in pages of 100
+
+    index.poll_interval = 3600
+    assert [m["id"] for m in await index.search(client, TENANT, 1, "archive")] == [42]
+    assert client.get_messages_calls == backfill_calls
+    # Another tenant's bot sees a different (here empty) channel history
+    assert await index.search(MockDiscordClient("other", history_size=0), "tenant-b", 1, "archive") == []
+
+
+@pytest.mark.asyncio
+async def test_new_messages_are_polled_incrementally(index):
+    client = MockDiscordClient("token", history_size=10)
+    await index.sync(client, TENANT, 1)
+
+    client.history.append({"id": 11, "content": "fresh news", "timestamp": "2030-01-01T00:00:00+00:00"})
+    await index.sync(client, TENANT, 1)
+    assert [m["id"] for m in await index.search(client, TENANT, 1, "news")] == [11]
+    # Short keywords fall back to a substring scan
+    assert len(await index.search(client, TENANT, 1, "ms")) == 10
+
+
+@pytest.mark.asyncio
+async def test_retention_is_enforced_per_tenant(index):
+    await index.set_retention(TENANT, Retention(retention_days=1, max_messages_per_channel=20))
+    client = MockDiscordClient("token", history_size=100)
+    client.history[0]["timestamp"] = "2000-01-01T00:00:00+00:00"
+    await index.sync(client, TENANT, 1)
+
+    hits = await index.search(client, TENANT, 1, "msg", limit=100)
+    assert [m["id"] for m in hits] == list(range(100, 80, -1))
+    assert (await index.get_retention("other")).retention_days == 30
+
+    # Tightening retention prunes the index right away, not at the next sync
+    await index.set_retention(TENANT, Retention(retention_days=1, max_messages_per_channel=5))
+    hits = await index.search(client, TENANT, 1, "msg", limit=100)
+    assert [m["id"] for m in hits] == list(range(100, 95, -1))
+
+
+@pytest.mark.asyncio
+async def test_sent_and_deleted_messages_update_the_index(index):
+    client = MockDiscordClient("token", history_size=5)
+    await index.sync(client, TENANT, 1)
+
+    await index.add_message(TENANT, 1, {"id": 99, "content": "posted via gateway", "timestamp": datetime.utcnow().isoformat()})
+    assert [m["id"] for m in await index.search(client, TENANT, 1, "gateway")] == [99]
+    await index.remove_message(TENANT, 1, 99)
+    assert await index.search(client, TENANT, 1, "gateway") == []
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import math
+from typing import List, Optional
+
+import numpy as np
+
+# FAISS warns below ~39 training points per list; fewer gives unstable centroids
+MIN_POINTS_PER_LIST = 39
+# Retrain the coarse quantizer once the index has grown this much since training
+RETRAIN_GROWTH = 4
+# Rows sampled for k-means (per list) so training stays bounded on large corpora
+MAX_TRAIN_POINTS_PER_LIST = 256
+KMEANS_ITERATIONS = 20
+
+
+def _spherical_kmeans(vectors: np.ndarray, nlist: int, seed: int) -> np.ndarray:
+    """Unit-norm centroids maximising cosine similarity to their members."""
+    rng = np.random.default_rng(seed)
+    sample_size = min(vectors.shape[0], nlist * MAX_TRAIN_POINTS_PER_LIST)
+    sample = np.asarray(vectors[np.sort(rng.choice(vectors.shape[0], sample_size, replace=False))])
+    centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assignments = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        empty = norms[:, 0] == 0
+        # Re-seed empty lists from random points instead of leaving them dead
+        sums[empty] = sample[rng.choice(sample_size, int(empty.sum()), replace=False)]
+        norms[empty] = 1.0
+        centroids = (sums / norms).astype(np.float32)
+    return centroids
+
+
+class IVFIndex:
+    """IVF-flat index: a k-means coarse quantizer over inverted lists of row ids.
+
+    Rows are expected to be L2-normalised (as stored by ``SimpleVectorStore``),
+    so inner product is cosine similarity. The index only holds row ids; the
+    caller scores the candidate rows against the stored vectors.
+
+    The quantizer is trained once ``MIN_POINTS_PER_LIST`` rows per list are
+    available and retrained after the index grows ``RETRAIN_GROWTH``-fold;
+    in between, new rows are assigned to their nearest centroid. ``nlist=0``
+    picks ``sqrt(N)`` lists at training time.
+    """
+
+    def __init__(self, dim: int, nlist: int = 0, nprobe: int = 8, seed: int = 0):
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self.trained_rows = 0
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._size = 0
+        self._lists: Optional[List[np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    @property
+    def assignments(self) -> np.ndarray:
+        """List id of every indexed row."""
+        return self._assignments[:self._size]
+
+    def _target_nlist(self, rows: int) -> int:
+        return self.nlist or max(1, int(math.sqrt(rows)))
+
+    def needs_training(self, rows: int) -> bool:
+        """True if an index holding ``rows`` rows should (re)train its quantizer."""
+        if self.is_trained:
+            return rows >= RETRAIN_GROWTH * self.trained_rows
+        return rows >= self._target_nlist(rows) * MIN_POINTS_PER_LIST
+
+    def train(self, vectors: np.ndarray) -> np.ndarray:
+        """Fit the quantizer on all rows, reassign them and return their list ids."""
+        nlist = self._target_nlist(vectors.shape[0])
+        self.centroids = _spherical_kmeans(vectors, nlist, self.seed)
+        self.trained_rows = vectors.shape[0]
+        self._size = 0
+        self._lists = None
+        assignments = self.assign(vectors)
+        self.extend(assignments)
+        return assignments
+
+    def assign(self, vectors: np.ndarray, batch_size: int = 8192) -> np.ndarray:
+        """Nearest centroid of each row."""
+        if self.centroids is None:
+            raise RuntimeError("IVF index is not trained")
+        out = np.empty(vectors.shape[0], dtype=np.int32)
+        for start in range(0, vectors.shape[0], batch_size):
+            batch = np.asarray(vectors[start:start + batch_size])
+            out[start:start + batch.shape[0]] = np.argmax(batch @ self.centroids.T, axis=1)
+        return out
+
+    def extend(self, assignments: np.ndarray) -> None:
+        """Append rows (numbered after the existing ones) to their lists."""
+        needed = self._size + assignments.shape[0]
+        if needed > self._assignments.shape[0]:
+            grown = np.zeros(max(needed, 2 * self._assignments.shape[0]), dtype=np.int32)
+            grown[:self._size] = self._assignments[:self._size]
+            self._assignments = grown
+        self._assignments[self._size:needed] = assignments
+        self._size = needed
+        self._lists = None
+
+    def load(self, centroids: np.ndarray, assignments: np.ndarray, trained_rows: int) -> None:
+        """Restore a persisted index."""
+        self.centroids = centroids.astype(np.float32, copy=False)
+        self.trained_rows = trained_rows
+        self._size = 0
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self.extend(assignments.astype(np.int32, copy=False))
+
+    def _inverted_lists(self) -> List[np.ndarray]:
+        # Rebuilt lazily after adds: one stable sort groups the row ids by list
+        if self._lists is None:
+            order = np.argsort(self.assignments, kind="stable").astype(np.int64)
+            bounds = np.searchsorted(self.assignments[order], np.arange(self.centroids.shape[0] + 1))
+            self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(self.centroids.shape[0])]
+        return self._lists
+
+    def candidates(self, query: np.ndarray, nprobe: Optional[int] = None) -> np.ndarray:
+        """Ascending row ids in the ``nprobe`` lists closest to ``query``."""
+        nprobe = min(nprobe or self.nprobe, self.centroids.shape[0])
+        centroid_scores = self.centroids @ query
+        probed = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        lists = self._inverted_lists()
+        return np.sort(np.concatenate([lists[i] for i in probed]))
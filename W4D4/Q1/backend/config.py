@@ -2,18 +2,39 @@ import os
 
 # Vector store persistence location
 VECTOR_STORE_PATH = os.environ.get("VECTOR_STORE_PATH", "vector_store")
+# Segments are merged into one once an index has more than this many
+VECTOR_STORE_MAX_SEGMENTS = int(os.environ.get("VECTOR_STORE_MAX_SEGMENTS", "16"))
+
+# Search index: "flat" (exact) or "ivf" (approximate, IVF-flat)
+VECTOR_INDEX = os.environ.get("VECTOR_INDEX", "flat")
+# IVF lists (0 = sqrt of the corpus size at training time) and lists probed per query
+IVF_NLIST = int(os.environ.get("IVF_NLIST", "0"))
+IVF_NPROBE = int(os.environ.get("IVF_NPROBE", "8"))
 
 # OpenAI settings (can be swapped by changing provider implementation)
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
 EMBEDDING_MODEL = os.environ.get("EMBEDDING_MODEL", "text-embedding-3-small")
 COMPLETION_MODEL = os.environ.get("COMPLETION_MODEL", "gpt-4o-mini")
 
+# Embedding requests: tokens per batch, batches in flight and retries per batch
+EMBED_BATCH_TOKENS = int(os.environ.get("EMBED_BATCH_TOKENS", "100000"))
+EMBED_CONCURRENCY = int(os.environ.get("EMBED_CONCURRENCY", "4"))
+EMBED_MAX_RETRIES = int(os.environ.get("EMBED_MAX_RETRIES", "5"))
+# Content-hash embedding cache (empty to disable)
+EMBEDDING_CACHE_PATH = os.environ.get(
+    "EMBEDDING_CACHE_PATH", os.path.join(VECTOR_STORE_PATH, "embedding_cache.db")
+)
+
 # Retrieval / generation parameters
 top_k_default = os.environ.get("TOP_K", "4")
 TOP_K = int(top_k_default) if top_k_default.isdigit() else 4
 max_tokens_default = os.environ.get("MAX_TOKENS", "256")
 MAX_TOKENS = int(max_tokens_default) if max_tokens_default.isdigit() else 256
 
+# Background uploads: jobs processed at once and processes for text extraction (0 = in the job thread)
+INGEST_WORKERS = int(os.environ.get("INGEST_WORKERS", "2"))
+INGEST_EXTRACT_PROCESSES = int(os.environ.get("INGEST_EXTRACT_PROCESSES", "2"))
+
 # Chunking
 CHUNK_SIZE = int(os.environ.get("CHUNK_SIZE", "400"))
 CHUNK_OVERLAP = int(os.environ.get("CHUNK_OVERLAP", "50")) 
\ No newline at end of file
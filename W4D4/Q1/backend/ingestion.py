@@ -49,24 +49,31 @@ def _split_into_chunks(text: str, size: int, overlap: int) -> List[str]:
     return splitter.split_text(text)
 
 
-# ------------------ Public Ingest Function ------------------
+# ------------------ Public Ingest Functions ------------------
 
-def ingest_document(file_path: str) -> List[DocumentChunk]:
+def extract_text(file_path: str) -> str:
+    """Extract the plain text of a supported document (module-level so it can run in a worker process)."""
     ext = os.path.splitext(file_path)[1].lower()
     if ext not in _extractors:
         raise ValueError(f"Unsupported file type: {ext}")
 
     print(f"[Ingest] Extracting text from {file_path}")
-    text = _extractors[ext](file_path)
+    return _extractors[ext](file_path)
+
 
+def chunk_document(text: str, source_name: str) -> List[DocumentChunk]:
     print("[Ingest] Splitting into chunks (LangChain)…")
     raw_chunks = _split_into_chunks(text, config.CHUNK_SIZE, config.CHUNK_OVERLAP)
     doc_chunks: List[DocumentChunk] = []
     for i, chunk_text in enumerate(tqdm(raw_chunks)):
         chunk_id = str(uuid.uuid4())
         metadata = {
-            "source_path": os.path.basename(file_path),
+            "source_path": source_name,
             "chunk_index": str(i),
         }
         doc_chunks.append(DocumentChunk(id=chunk_id, text=chunk_text, metadata=metadata))
-    return doc_chunks 
\ No newline at end of file
+    return doc_chunks
+
+
+def ingest_document(file_path: str) -> List[DocumentChunk]:
+    return chunk_document(extract_text(file_path), os.path.basename(file_path))
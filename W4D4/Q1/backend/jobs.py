@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import dataclasses
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from .ingestion import chunk_document, extract_text
+from .models import UploadJob
+from .providers.base import ProgressCallback
+from .vector_store import SimpleVectorStore
+
+# Finished jobs kept for status queries before the oldest are forgotten
+MAX_FINISHED_JOBS = 1000
+
+
+class IngestionJobs:
+    """Runs document uploads in the background: extract → chunk → embed → index.
+
+    Up to ``workers`` uploads run at once on a thread pool, so request
+    handlers only enqueue a job and return its id. Text extraction is
+    CPU-bound pure Python and runs in a separate process pool
+    (``extract_processes``, 0 to extract on the job thread) so it does not
+    hold the GIL the event loop needs.
+
+    Each job owns the uploaded file it is given and deletes it when it
+    finishes, whether it succeeded or not.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[List[str], Optional[ProgressCallback]], List[List[float]]],
+        get_store: Callable[[int], SimpleVectorStore],
+        workers: int = 2,
+        extract_processes: int = 2,
+    ):
+        self._embed = embed
+        self._get_store = get_store
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest")
+        self._extract_processes = extract_processes
+        self._extract_executor: Optional[Executor] = None
+        self._jobs: "OrderedDict[str, UploadJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, file_path: str, filename: str) -> Dict:
+        job = UploadJob(id=uuid.uuid4().hex, filename=filename)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict_finished()
+            snapshot = dataclasses.asdict(job)
+        self._executor.submit(self._run, job, file_path)
+        return snapshot
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dataclasses.asdict(job) if job else None
+
+    def list(self) -> List[Dict]:
+        with self._lock:
+            return [dataclasses.asdict(job) for job in reversed(self._jobs.values())]
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+        if self._extract_executor is not None:
+            self._extract_executor.shutdown(wait=True)
+
+    # ---------------------------------------------------------------------
+    # Pipeline
+    # ---------------------------------------------------------------------
+    def _evict_finished(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished_at is not None]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    def _extract(self, file_path: str) -> str:
+        if self._extract_processes <= 0:
+            return extract_text(file_path)
+        with self._lock:
+            if self._extract_executor is None:
+                # spawn: forking a process that is running threads can deadlock
+                self._extract_executor = ProcessPoolExecutor(
+                    max_workers=self._extract_processes, mp_context=multiprocessing.get_context("spawn")
+                )
+        return self._extract_executor.submit(extract_text, file_path).result()
+
+    def _start_stage(self, job: UploadJob, stage: str, total: int = 0) -> None:
+        with self._lock:
+            job.status = "running"
+            job.stage = stage
+            job.stages[stage].status = "running"
+            job.stages[stage].total = total
+
+    def _advance(self, job: UploadJob, stage: str, done: int, total: Optional[int] = None) -> None:
+        with self._lock:
+            progress = job.stages[stage]
+            progress.done = done
+            if total is not None:
+                progress.total = total
+            if progress.done >= progress.total:
+                progress.status = "done"
+
+    def _run(self, job: UploadJob, file_path: str) -> None:
+        try:
+            self._start_stage(job, "extract", total=1)
+            text = self._extract(file_path)
+            self._advance(job, "extract", 1)
+
+            self._start_stage(job, "chunk")
+            chunks = chunk_document(text, job.filename)
+            self._advance(job, "chunk", len(chunks), total=len(chunks))
+
+            self._start_stage(job, "embed", total=len(chunks))
+            # One call, so the provider batches and parallelises all chunks; it reports each finished batch
+            embeddings = self._embed([c.text for c in chunks], lambda done: self._advance(job, "embed", done))
+            self._advance(job, "embed", len(embeddings))
+
+            self._start_stage(job, "index", total=len(chunks))
+            if chunks:
+                store = self._get_store(len(embeddings[0]))
+                store.add(embeddings, [c.__dict__ for c in chunks])
+            self._advance(job, "index", len(chunks))
+
+            with self._lock:
+                job.status = "completed"
+                job.chunks_indexed = len(chunks)
+            print(f"[Upload] {job.filename}: indexed {len(chunks)} chunks")
+        except Exception as exc:  # noqa: BLE001
+            print(f"[Upload] {job.filename}: failed during {job.stage}: {exc}")
+            with self._lock:
+                job.status = "failed"
+                job.error = str(exc)
+                if job.stage:
+                    job.stages[job.stage].status = "failed"
+        finally:
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+            with self._lock:
+                job.finished_at = time.time()
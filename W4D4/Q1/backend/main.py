@@ -1,17 +1,19 @@
 from __future__ import annotations
 
+import asyncio
 import os
+import threading
+import uuid
 from pathlib import Path
 from typing import List
 
-from fastapi import FastAPI, File, UploadFile
+from fastapi import FastAPI, File, HTTPException, UploadFile
 from pydantic import BaseModel
 from fastapi.middleware.cors import CORSMiddleware
 
 from . import config
-from .ingestion import ingest_document
-
-from .providers import OpenAIProvider
+from .jobs import IngestionJobs
+from .providers import CachedEmbeddingsProvider, EmbeddingCache, OpenAIProvider
 from .retriever import _build_prompt
 from .vector_store import SimpleVectorStore
 from .models import DocumentChunk  # added import
@@ -40,60 +42,94 @@ provider = OpenAIProvider(
     api_key=config.OPENAI_API_KEY,
     embedding_model=config.EMBEDDING_MODEL,
     completion_model=config.COMPLETION_MODEL,
+    batch_tokens=config.EMBED_BATCH_TOKENS,
+    concurrency=config.EMBED_CONCURRENCY,
+    max_retries=config.EMBED_MAX_RETRIES,
+)
+# Repeated chunks and queries are served from the cache instead of the API
+embedder = (
+    CachedEmbeddingsProvider(provider, EmbeddingCache(config.EMBEDDING_CACHE_PATH), model=config.EMBEDDING_MODEL)
+    if config.EMBEDDING_CACHE_PATH
+    else provider
 )
 
 # Build vector store lazily once we know embedding dimension
 _vector_store: SimpleVectorStore | None = None
+_vector_store_lock = threading.Lock()
 
 
 def _get_vector_store(dim: int) -> SimpleVectorStore:
     global _vector_store  # noqa: PLW0603
-    if _vector_store is None:
-        _vector_store = SimpleVectorStore(dim, path=config.VECTOR_STORE_PATH)
+    # Upload workers and requests may race to create it
+    with _vector_store_lock:
+        if _vector_store is None:
+            _vector_store = SimpleVectorStore(
+                dim,
+                path=config.VECTOR_STORE_PATH,
+                max_segments=config.VECTOR_STORE_MAX_SEGMENTS,
+                index=config.VECTOR_INDEX,
+                nlist=config.IVF_NLIST,
+                nprobe=config.IVF_NPROBE,
+            )
     return _vector_store
 
 
-@app.post("/upload-doc")
+# Uploads are processed in the background; the handlers only enqueue jobs
+ingestion_jobs = IngestionJobs(
+    embed=embedder.embed,
+    get_store=_get_vector_store,
+    workers=config.INGEST_WORKERS,
+    extract_processes=config.INGEST_EXTRACT_PROCESSES,
+)
+
+
+@app.on_event("shutdown")
+def _shutdown_ingestion() -> None:
+    ingestion_jobs.shutdown()
+
+
+@app.post("/upload-doc", status_code=202)
 async def upload_document(file: UploadFile = File(...)) -> dict:  # noqa: D401
-    """Accepts a document file and indexes it."""
-    try:
-        safe_name = file.filename or "uploaded_file"
-        dest_path = Path("uploaded_docs") / safe_name
-        dest_path.parent.mkdir(exist_ok=True)
-        with dest_path.open("wb") as fh:
-            fh.write(await file.read())
-
-        print(f"[Upload] Processing file: {safe_name}")
-        
-        # Ingest & embed
-        chunks = ingest_document(str(dest_path))
-        texts = [c.text for c in chunks]
-        
-        print(f"[Upload] Generated {len(chunks)} chunks, calling OpenAI API...")
-        embeddings = provider.embed(texts)
-        print(f"[Upload] Got embeddings of dimension {len(embeddings[0])}")
-
-        store = _get_vector_store(len(embeddings[0]))
-        store.add(embeddings, [c.__dict__ for c in chunks])
-
-        return {"chunks_indexed": len(chunks)}
-    except Exception as e:
-        print(f"[Upload] Error: {e}")
-        return {"error": str(e), "chunks_indexed": 0}
+    """Accepts a document file and queues it for indexing; poll the returned status URL."""
+    safe_name = os.path.basename(file.filename or "") or "uploaded_file"
+    # Unique per upload: same-named files may be queued at once; the job deletes it when done
+    dest_path = Path("uploaded_docs") / f"{uuid.uuid4().hex}-{safe_name}"
+    dest_path.parent.mkdir(exist_ok=True)
+    await asyncio.to_thread(dest_path.write_bytes, await file.read())
+
+    job = ingestion_jobs.submit(str(dest_path), safe_name)
+    print(f"[Upload] Queued {safe_name} as job {job['id']}")
+    return {"job_id": job["id"], "status": job["status"], "status_url": f"/upload-doc/jobs/{job['id']}"}
+
+
+@app.get("/upload-doc/jobs")
+async def list_upload_jobs() -> List[dict]:
+    """Most recent upload jobs first."""
+    return ingestion_jobs.list()
+
+
+@app.get("/upload-doc/jobs/{job_id}")
+async def get_upload_job(job_id: str) -> dict:
+    """Status of an upload job with progress per stage (extract, chunk, embed, index)."""
+    job = ingestion_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 
 @app.post("/chat")
 async def chat(request: ChatRequest) -> dict:  # noqa: D401
     """Return answer & citations for a query."""
     # Embed query
-    query_embedding = provider.embed([request.query])[0]
+    query_embedding = (await embedder.aembed([request.query]))[0]
 
     store = _get_vector_store(len(query_embedding))
-    results = store.search(query_embedding, k=config.TOP_K)
+    # Search and completion block, so keep them off the event loop
+    results = await asyncio.to_thread(store.search, query_embedding, k=config.TOP_K)
     doc_chunks = [DocumentChunk(**meta) for meta, _ in results]
 
     prompt = _build_prompt(request.query, doc_chunks)
-    answer = provider.complete(prompt, max_tokens=config.MAX_TOKENS)
+    answer = await asyncio.to_thread(provider.complete, prompt, max_tokens=config.MAX_TOKENS)
 
     citations: List[dict] = [c.metadata for c in doc_chunks]
     return {"answer": answer, "citations": citations} 
\ No newline at end of file
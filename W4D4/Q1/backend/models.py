@@ -1,5 +1,6 @@
-from dataclasses import dataclass
-from typing import Dict, List
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 
 @dataclass
 class DocumentChunk:
@@ -13,4 +14,28 @@ class QueryLog:
     query: str
     answer: str
     citations: List[Dict[str, str]]
-    category: str 
\ No newline at end of file
+    category: str 
+
+# Stages of the upload pipeline, in order
+UPLOAD_STAGES = ("extract", "chunk", "embed", "index")
+
+
+@dataclass
+class StageProgress:
+    status: str = "pending"  # pending | running | done | failed
+    done: int = 0
+    total: int = 0
+
+
+@dataclass
+class UploadJob:
+    """State of one background document upload."""
+    id: str
+    filename: str
+    status: str = "queued"  # queued | running | completed | failed
+    stage: Optional[str] = None
+    stages: Dict[str, StageProgress] = field(default_factory=lambda: {s: StageProgress() for s in UPLOAD_STAGES})
+    chunks_indexed: int = 0
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
@@ -1,2 +1,4 @@
 from .base import EmbeddingsProvider, CompletionProvider  # type: ignore  # noqa: F401
-from .openai_provider import OpenAIProvider  # type: ignore  # noqa: F401 
\ No newline at end of file
+from .openai_provider import OpenAIProvider  # type: ignore  # noqa: F401
+from .cache import EmbeddingCache, CachedEmbeddingsProvider  # type: ignore  # noqa: F401
+from .fake import FakeProvider  # type: ignore  # noqa: F401
@@ -1,15 +1,23 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Callable, List, Optional
+
+# Called with the number of input texts embedded so far
+ProgressCallback = Callable[[int], None]
 
 
 class EmbeddingsProvider(ABC):
     """Abstract interface for embedding text into vector space."""
 
     @abstractmethod
-    def embed(self, texts: List[str]) -> List[List[float]]:  # noqa: D401
-        """Return an embedding per input text."""
+    def embed(self, texts: List[str], progress: Optional[ProgressCallback] = None) -> List[List[float]]:  # noqa: D401
+        """Return an embedding per input text, calling ``progress`` as batches complete."""
         raise NotImplementedError
 
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        """Async variant of ``embed``; by default runs ``embed`` in a worker thread."""
+        return await asyncio.to_thread(self.embed, texts)
+
 
 class CompletionProvider(ABC):
     """Abstract interface for text completion / chat generation."""
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .base import EmbeddingsProvider, ProgressCallback
+
+
+def _cache_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite table of embeddings keyed by SHA-256 of (model, text)."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+        self._db.commit()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            batch = list(keys[start:start + 500])
+            with self._lock:
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def put_many(self, items: Sequence[Tuple[str, List[float]]]) -> None:
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                ((key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items),
+            )
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class CachedEmbeddingsProvider(EmbeddingsProvider):
+    """Wraps an embeddings provider with a content-hash cache.
+
+    Only texts not seen before (for this model) reach the wrapped provider,
+    each once per call even if repeated in the input. Vectors are cached as
+    float32, which is what the vector store keeps anyway.
+    """
+
+    def __init__(self, provider: EmbeddingsProvider, cache: EmbeddingCache, model: str):
+        self.provider = provider
+        self.cache = cache
+        self.model = model
+
+    def _lookup(self, texts: List[str]) -> Tuple[List[str], Dict[str, List[float]], List[str]]:
+        keys = [_cache_key(self.model, text) for text in texts]
+        found = self.cache.get_many(list(dict.fromkeys(keys)))
+        misses = list(dict.fromkeys(text for key, text in zip(keys, texts) if key not in found))
+        return keys, found, misses
+
+    def _store(self, misses: List[str], vectors: List[List[float]], found: Dict[str, List[float]]) -> None:
+        items = [(_cache_key(self.model, text), vector) for text, vector in zip(misses, vectors)]
+        self.cache.put_many(items)
+        found.update(items)
+
+    def embed(self, texts: List[str], progress: Optional[ProgressCallback] = None) -> List[List[float]]:
+        keys, found, misses = self._lookup(texts)
+        if misses:
+            # Cache hits count as done up front; the provider reports the rest
+            cached = len(texts) - len(misses)
+            if progress is not None:
+                progress(cached)
+            on_batch = (lambda done: progress(cached + done)) if progress is not None else None
+            self._store(misses, self.provider.embed(misses, on_batch), found)
+        elif progress is not None:
+            progress(len(texts))
+        return [found[key] for key in keys]
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        # SQLite reads and commits run in a worker thread to keep the event loop free
+        keys, found, misses = await asyncio.to_thread(self._lookup, texts)
+        if misses:
+            await asyncio.to_thread(self._store, misses, await self.provider.aembed(misses), found)
+        return [found[key] for key in keys]
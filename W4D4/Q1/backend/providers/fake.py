@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import hashlib
+from typing import List, Optional
+
+import numpy as np
+
+from .base import EmbeddingsProvider, CompletionProvider, ProgressCallback
+
+
+class FakeProvider(EmbeddingsProvider, CompletionProvider):
+    """Offline provider for tests: deterministic pseudo-random embeddings per text.
+
+    Identical texts always get the same vector, so caching and search can be
+    exercised without network access. ``calls`` and ``texts_embedded`` count
+    the work done, e.g. to check what a cache saved.
+    """
+
+    def __init__(self, dim: int = 64):
+        self.dim = dim
+        self.calls = 0
+        self.texts_embedded = 0
+
+    def embed(self, texts: List[str], progress: Optional[ProgressCallback] = None) -> List[List[float]]:
+        self.calls += 1
+        self.texts_embedded += len(texts)
+        vectors = []
+        for text in texts:
+            seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+            vectors.append(np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32).tolist())
+        if progress is not None:
+            progress(len(texts))
+        return vectors
+
+    def complete(self, prompt: str, max_tokens: int = 256) -> str:
+        return "I'm not sure."
@@ -1,23 +1,171 @@
-from typing import List
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, List, Optional, TypeVar
 
 import openai
 
-from .base import EmbeddingsProvider, CompletionProvider
+from .base import EmbeddingsProvider, CompletionProvider, ProgressCallback
+
+T = TypeVar("T")
+
+# API limits per embeddings request (inputs and total tokens)
+MAX_INPUTS_PER_REQUEST = 2048
+MAX_TOKENS_PER_REQUEST = 300_000
+
+# Errors worth retrying: rate limits, timeouts, dropped connections and 5xx responses
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+
+
+def _run_sync(make_coro: Callable[[], Awaitable[T]]) -> T:
+    """Run a coroutine to completion from sync code, even inside a running event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(make_coro())
+    # Called from async code through the sync API: use a private loop in another thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(lambda: asyncio.run(make_coro())).result()
 
 
 class OpenAIProvider(EmbeddingsProvider, CompletionProvider):
-    """OpenAI implementation for embeddings and completions (chat)."""
+    """OpenAI implementation for embeddings and completions (chat).
+
+    ``embed`` splits its input into batches of at most ``batch_tokens`` tokens
+    (and the API's input limit), sends up to ``concurrency`` batches at once and
+    retries rate-limited or failed batches with exponential backoff and jitter.
+    """
 
-    def __init__(self, api_key: str, embedding_model: str, completion_model: str):
+    def __init__(
+        self,
+        api_key: str,
+        embedding_model: str,
+        completion_model: str,
+        batch_tokens: int = 100_000,
+        concurrency: int = 4,
+        max_retries: int = 5,
+    ):
         openai.api_key = api_key
+        self.api_key = api_key
         self.embedding_model = embedding_model
         self.completion_model = completion_model
+        self.batch_tokens = min(batch_tokens, MAX_TOKENS_PER_REQUEST)
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self._encoding = None
+        self._encoding_lock = threading.Lock()
+        self._async_client: Optional[openai.AsyncOpenAI] = None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ---------------------------------------------------------------------
+    # Batching
+    # ---------------------------------------------------------------------
+    def _count_tokens(self, text: str) -> int:
+        with self._encoding_lock:
+            if self._encoding is None:
+                try:
+                    import tiktoken  # type: ignore
+
+                    try:
+                        self._encoding = tiktoken.encoding_for_model(self.embedding_model)
+                    except KeyError:
+                        self._encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception as exc:  # noqa: BLE001
+                    print(f"[OpenAIProvider] tiktoken unavailable ({exc}); estimating tokens from length")
+                    self._encoding = False
+        if self._encoding is False:
+            # Conservative estimate (English averages ~4 characters per token)
+            return len(text) // 3 + 1
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def _batches(self, texts: List[str]) -> List[List[int]]:
+        """Group input positions into consecutive token-bounded batches."""
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+        for i, text in enumerate(texts):
+            tokens = self._count_tokens(text)
+            if current and (current_tokens + tokens > self.batch_tokens or len(current) >= MAX_INPUTS_PER_REQUEST):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    # ---------------------------------------------------------------------
+    # Requests
+    # ---------------------------------------------------------------------
+    def _new_async_client(self) -> openai.AsyncOpenAI:
+        # Retries are handled here so backoff is shared with the semaphore
+        return openai.AsyncOpenAI(api_key=self.api_key or None, max_retries=0)
+
+    async def _embed_batch(self, client: openai.AsyncOpenAI, texts: List[str]) -> List[List[float]]:
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await client.embeddings.create(model=self.embedding_model, input=texts)
+                # Preserve order of inputs
+                return [r.embedding for r in sorted(response.data, key=lambda x: x.index)]
+            except _RETRYABLE_ERRORS as exc:
+                if attempt == self.max_retries:
+                    raise
+                delay = random.uniform(0, min(30.0, 2.0 ** attempt))
+                print(f"[OpenAIProvider] Embedding batch failed ({exc.__class__.__name__}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def _embed(
+        self, client: openai.AsyncOpenAI, texts: List[str], progress: Optional[ProgressCallback] = None
+    ) -> List[List[float]]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        done = 0
+
+        async def run(batch: List[int]) -> List[List[float]]:
+            nonlocal done
+            async with semaphore:
+                vectors = await self._embed_batch(client, [texts[i] for i in batch])
+            done += len(batch)
+            if progress is not None:
+                progress(done)
+            return vectors
+
+        batches = self._batches(texts)
+        results = await asyncio.gather(*(run(batch) for batch in batches))
+        embeddings: List[List[float]] = [[] for _ in texts]
+        for batch, vectors in zip(batches, results):
+            for i, vector in zip(batch, vectors):
+                embeddings[i] = vector
+        return embeddings
 
     # EmbeddingsProvider
-    def embed(self, texts: List[str]) -> List[List[float]]:
-        response = openai.embeddings.create(model=self.embedding_model, input=texts)
-        # Preserve order of inputs
-        return [r.embedding for r in sorted(response.data, key=lambda x: x.index)]
+    def embed(self, texts: List[str], progress: Optional[ProgressCallback] = None) -> List[List[float]]:
+        if not texts:
+            return []
+
+        async def embed_once() -> List[List[float]]:
+            # A client per call: its connection pool is tied to the event loop
+            async with self._new_async_client() as client:
+                return await self._embed(client, texts, progress)
+
+        return _run_sync(embed_once)
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = self._new_async_client()
+            self._async_client_loop = loop
+        return await self._embed(self._async_client, texts)
 
     # CompletionProvider
     def complete(self, prompt: str, max_tokens: int = 256) -> str:
@@ -27,4 +175,4 @@ class OpenAIProvider(EmbeddingsProvider, CompletionProvider):
             max_tokens=max_tokens,
             temperature=0,
         )
-        return response.choices[0].message.content.strip() 
\ No newline at end of file
+        return response.choices[0].message.content.strip()
@@ -1,71 +1,283 @@
 from __future__ import annotations
 
 import json
-import math
 import os
 import pickle
-from typing import Dict, List, Tuple
+import sqlite3
+import threading
+import uuid
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .ann_index import IVFIndex
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to unit L2 norm; all-zero rows stay zero (cosine similarity 0)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+# Scores within this distance of each other count as ties (float32 rounding noise)
+TIE_TOLERANCE = 1e-6
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, ordered like a stable descending sort.
+
+    ``argpartition`` finds the k-th largest score in O(N); every candidate tied
+    with it is kept so ties resolve to the lower index, as the full sort did.
+    Scores are compared at TIE_TOLERANCE granularity, so exact ties of the old
+    float64 computation stay ties despite float32 rounding.
+    """
+    scores = np.round(scores.astype(np.float64) / TIE_TOLERANCE)
+    n = scores.shape[0]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < n:
+        threshold = scores[np.argpartition(scores, n - k)[n - k]]
+        candidates = np.flatnonzero(scores >= threshold)
+    else:
+        candidates = np.arange(n)
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order[:k]]
+
+
+def _fsync_dir(path: str) -> None:
+    if os.name == "posix":
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
 
 
 class SimpleVectorStore:
-    """Simple in-memory vector store using pure Python for similarity search."""
+    """Vector store over append-only, memory-mapped float32 segments.
+
+    On-disk layout under ``path``:
+
+    - ``segments/seg-<id>.npy``: immutable ``.npy`` files of L2-normalised
+      float32 rows, opened with ``np.memmap`` (via ``np.load(mmap_mode="r")``)
+    - ``index.db``: SQLite (WAL) log of which segments are live and the
+      metadata of every row
+
+    ``add()`` writes one new segment holding only the new rows, then commits
+    the segment and its metadata in one transaction, so a crash leaves either
+    the old or the new state (an uncommitted segment file is deleted at the
+    next start). Startup only maps the segment files and reads the segment
+    table; metadata is fetched for the top-k rows of each search.
+    ``compact()`` merges all segments into one the same way, and runs
+    automatically once there are more than ``max_segments``.
+
+    With ``index="ivf"`` searches probe an ``IVFIndex`` instead of scoring
+    every row. Its centroids and row assignments live in ``index.db`` and are
+    updated after every ``add()``; rows missing from it after a crash are
+    indexed at the next start. Until enough rows exist to train it, searches
+    stay exact.
+    """
 
-    def __init__(self, dim: int, path: str):
+    def __init__(self, dim: int, path: str, max_segments: int = 16,
+                 index: str = "flat", nlist: int = 0, nprobe: int = 8):
+        if index not in ("flat", "ivf"):
+            raise ValueError(f"Unknown vector index '{index}', expected 'flat' or 'ivf'")
         self.dim = dim
         self.path = path
-        self.embeddings: List[List[float]] = []
-        self.metadata: List[Dict] = []
+        self.max_segments = max_segments
+        self._ann = IVFIndex(dim, nlist=nlist, nprobe=nprobe) if index == "ivf" else None
+        self._lock = threading.RLock()
+        # (start row, memory-mapped rows) per live segment, in row order
+        self._segments: List[Tuple[int, np.ndarray]] = []
+        self._segment_names: List[str] = []
+        self._size = 0
+        os.makedirs(self._segments_dir(), exist_ok=True)
+        self._db = sqlite3.connect(self._index_filepath(), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS segments "
+            "(id INTEGER PRIMARY KEY, filename TEXT NOT NULL, start_row INTEGER NOT NULL, rows INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS chunks (row INTEGER PRIMARY KEY, metadata TEXT NOT NULL)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS ivf_centroids (list_id INTEGER PRIMARY KEY, centroid BLOB NOT NULL)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS ivf_assignments (row INTEGER PRIMARY KEY, list_id INTEGER NOT NULL)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS ivf_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
         self._load_if_exists()
+        self._load_ann()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """All stored (normalised) vectors as one array (copies the segments)."""
+        segments = [rows for _, rows in self._segments]
+        return np.concatenate(segments) if segments else np.zeros((0, self.dim), dtype=np.float32)
 
     # ---------------------------------------------------------------------
     # Persistence helpers
     # ---------------------------------------------------------------------
-    def _embeddings_filepath(self) -> str:
+    def _segments_dir(self) -> str:
+        return os.path.join(self.path, "segments")
+
+    def _index_filepath(self) -> str:
+        return os.path.join(self.path, "index.db")
+
+    def _legacy_embeddings_filepath(self) -> str:
         return os.path.join(self.path, "embeddings.pkl")
 
-    def _meta_filepath(self) -> str:
+    def _legacy_meta_filepath(self) -> str:
         return os.path.join(self.path, "meta.json")
 
+    def _open_segment(self, filename: str) -> np.ndarray:
+        rows = np.load(os.path.join(self._segments_dir(), filename), mmap_mode="r")
+        if rows.ndim != 2 or rows.shape[1] != self.dim:
+            raise ValueError(f"Segment {filename} has shape {rows.shape}, expected (*, {self.dim})")
+        return rows
+
     def _load_if_exists(self) -> None:
-        if not os.path.exists(self._embeddings_filepath()):
-            # Nothing to load yet
-            return
+        records = self._db.execute("SELECT filename, start_row, rows FROM segments ORDER BY start_row").fetchall()
+        live = set()
+        for filename, start_row, rows in records:
+            self._segments.append((start_row, self._open_segment(filename)))
+            self._segment_names.append(filename)
+            self._size = start_row + rows
+            live.add(filename)
+
+        # Segment files never committed (crash during add/compact) or already merged away
+        for filename in os.listdir(self._segments_dir()):
+            if filename not in live:
+                os.remove(os.path.join(self._segments_dir(), filename))
+
+        if not records and os.path.exists(self._legacy_embeddings_filepath()):
+            self._migrate_legacy()
+
+    def _migrate_legacy(self) -> None:
+        """One-shot import of the old embeddings.pkl / meta.json files."""
         try:
-            with open(self._embeddings_filepath(), "rb") as fh:
-                self.embeddings = pickle.load(fh)
-            with open(self._meta_filepath(), "r", encoding="utf-8") as fh:
-                self.metadata = json.load(fh)
+            with open(self._legacy_embeddings_filepath(), "rb") as fh:
+                embeddings = pickle.load(fh)
+            with open(self._legacy_meta_filepath(), "r", encoding="utf-8") as fh:
+                metadata = json.load(fh)
+            self.add(embeddings, metadata)
+            print(f"[VectorStore] Migrated {len(embeddings)} vectors to the segment format")
         except Exception as exc:  # noqa: BLE001
             print(f"[VectorStore] Failed to load existing index: {exc}")
 
-    def _save(self) -> None:
-        os.makedirs(self.path, exist_ok=True)
-        with open(self._embeddings_filepath(), "wb") as fh:
-            pickle.dump(self.embeddings, fh)
-        with open(self._meta_filepath(), "w", encoding="utf-8") as fh:
-            json.dump(self.metadata, fh, ensure_ascii=False, indent=2)
+    def _load_ann(self) -> None:
+        if self._ann is None:
+            return
+        centroids = self._db.execute("SELECT centroid FROM ivf_centroids ORDER BY list_id").fetchall()
+        if centroids:
+            trained_rows = self._db.execute("SELECT value FROM ivf_meta WHERE key = 'trained_rows'").fetchone()[0]
+            assignments = self._db.execute(
+                "SELECT list_id FROM ivf_assignments WHERE row < ? ORDER BY row", (self._size,)
+            ).fetchall()
+            self._ann.load(
+                np.stack([np.frombuffer(blob, dtype=np.float32) for (blob,) in centroids]),
+                np.array([list_id for (list_id,) in assignments], dtype=np.int32),
+                trained_rows,
+            )
+        self._update_ann()
+
+    def _update_ann(self) -> None:
+        """Index rows the ANN index has not seen yet (training it when due) and persist it."""
+        ann = self._ann
+        if ann is None or len(ann) == self._size:
+            return
+        retrain = ann.needs_training(self._size)
+        if retrain:
+            start = 0
+            assignments = ann.train(self.vectors)
+        elif ann.is_trained:
+            start = len(ann)
+            assignments = ann.assign(self._gather(np.arange(start, self._size)))
+            ann.extend(assignments)
+        else:
+            return
+        self._db.execute("BEGIN")
+        try:
+            if retrain:
+                self._db.execute("DELETE FROM ivf_centroids")
+                self._db.execute("DELETE FROM ivf_assignments")
+                self._db.executemany(
+                    "INSERT INTO ivf_centroids (list_id, centroid) VALUES (?, ?)",
+                    ((i, centroid.tobytes()) for i, centroid in enumerate(ann.centroids)),
+                )
+                self._db.execute(
+                    "INSERT OR REPLACE INTO ivf_meta (key, value) VALUES ('trained_rows', ?)", (ann.trained_rows,)
+                )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO ivf_assignments (row, list_id) VALUES (?, ?)",
+                ((start + i, int(list_id)) for i, list_id in enumerate(assignments)),
+            )
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+
+    def _write_segment(self, rows: np.ndarray) -> str:
+        """Durably write rows to a new segment file and return its name."""
+        filename = f"seg-{uuid.uuid4().hex}.npy"
+        final_path = os.path.join(self._segments_dir(), filename)
+        tmp_path = final_path + ".tmp"
+        with open(tmp_path, "wb") as fh:
+            np.save(fh, rows)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, final_path)
+        _fsync_dir(self._segments_dir())
+        return filename
 
     # ---------------------------------------------------------------------
-    # Vector math helpers (pure Python)
+    # Vector math helpers (NumPy)
     # ---------------------------------------------------------------------
-    def _dot_product(self, a: List[float], b: List[float]) -> float:
-        """Compute dot product of two vectors."""
-        return sum(x * y for x, y in zip(a, b))
-
-    def _magnitude(self, vector: List[float]) -> float:
-        """Compute magnitude (L2 norm) of a vector."""
-        return math.sqrt(sum(x * x for x in vector))
-
-    def _cosine_similarity(self, a: List[float], b: List[float]) -> float:
-        """Compute cosine similarity between two vectors."""
-        dot_prod = self._dot_product(a, b)
-        mag_a = self._magnitude(a)
-        mag_b = self._magnitude(b)
-        
-        if mag_a == 0 or mag_b == 0:
-            return 0.0
-        
-        return dot_prod / (mag_a * mag_b)
+    def _as_matrix(self, embeddings: Sequence[Sequence[float]]) -> np.ndarray:
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[1] != self.dim:
+            raise ValueError(f"Expected embeddings of dimension {self.dim}, got shape {matrix.shape}")
+        return matrix
+
+    def _scores(self, queries: np.ndarray) -> np.ndarray:
+        """Cosine similarity of each query against every stored row."""
+        scores = np.empty((queries.shape[0], self._size), dtype=np.float32)
+        for start_row, rows in self._segments:
+            scores[:, start_row:start_row + rows.shape[0]] = queries @ rows.T
+        return scores
+
+    def _gather(self, rows: np.ndarray) -> np.ndarray:
+        """Stored vectors of the given ascending row ids."""
+        out = np.empty((rows.shape[0], self.dim), dtype=np.float32)
+        starts = np.array([start_row for start_row, _ in self._segments])
+        owners = np.searchsorted(starts, rows, side="right") - 1
+        for segment in np.unique(owners):
+            start_row, segment_rows = self._segments[segment]
+            mask = owners == segment
+            out[mask] = segment_rows[rows[mask] - start_row]
+        return out
+
+    def _search_ann(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k (rows, scores) among the rows of the probed IVF lists."""
+        candidates = self._ann.candidates(query)
+        if candidates.shape[0] < min(k, self._size):
+            # Probed lists too small to fill k results; score everything instead
+            scores = self._scores(query[None, :])[0]
+            top = _top_k(scores, k)
+            return top, scores[top]
+        scores = self._gather(candidates) @ query
+        top = _top_k(scores, k)
+        return candidates[top], scores[top]
+
+    def get_metadata(self, rows: Sequence[int]) -> List[Dict]:
+        """Metadata of the given rows, in the given order."""
+        rows = [int(row) for row in rows]
+        if not rows:
+            return []
+        with self._lock:
+            found = dict(self._db.execute(
+                f"SELECT row, metadata FROM chunks WHERE row IN ({','.join('?' * len(rows))})", rows
+            ).fetchall())
+        return [json.loads(found[row]) for row in rows]
 
     # ---------------------------------------------------------------------
     # Public API
@@ -73,29 +285,89 @@ class SimpleVectorStore:
     def add(self, embeddings: List[List[float]], metadatas: List[Dict]) -> None:
         if not embeddings:
             return
-        self.embeddings.extend(embeddings)
-        self.metadata.extend(metadatas)
-        self._save()
+        if len(embeddings) != len(metadatas):
+            raise ValueError("embeddings and metadatas must have the same length")
+        rows = _normalize_rows(self._as_matrix(embeddings))
+        with self._lock:
+            filename = self._write_segment(rows)
+            start_row = self._size
+            self._db.execute("BEGIN")
+            try:
+                self._db.execute(
+                    "INSERT INTO segments (filename, start_row, rows) VALUES (?, ?, ?)",
+                    (filename, start_row, rows.shape[0]),
+                )
+                self._db.executemany(
+                    "INSERT INTO chunks (row, metadata) VALUES (?, ?)",
+                    ((start_row + i, json.dumps(meta, ensure_ascii=False)) for i, meta in enumerate(metadatas)),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                os.remove(os.path.join(self._segments_dir(), filename))
+                raise
+            self._segments = self._segments + [(start_row, self._open_segment(filename))]
+            self._segment_names.append(filename)
+            self._size = start_row + rows.shape[0]
+            if len(self._segments) > self.max_segments:
+                self.compact()
+            self._update_ann()
+
+    def compact(self) -> None:
+        """Merge all segments into one; safe to interrupt at any point."""
+        with self._lock:
+            if len(self._segments) <= 1:
+                return
+            merged = self._write_segment(self.vectors)
+            old_names = list(self._segment_names)
+            self._db.execute("BEGIN")
+            try:
+                self._db.execute("DELETE FROM segments")
+                self._db.execute(
+                    "INSERT INTO segments (filename, start_row, rows) VALUES (?, 0, ?)", (merged, self._size)
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                os.remove(os.path.join(self._segments_dir(), merged))
+                raise
+            self._segments = [(0, self._open_segment(merged))]
+            self._segment_names = [merged]
+            # Old files are only removed once the new segment table is committed
+            for filename in old_names:
+                try:
+                    os.remove(os.path.join(self._segments_dir(), filename))
+                except OSError:
+                    pass  # Still mapped on some platforms; removed at next start
+
+    def close(self) -> None:
+        with self._lock:
+            self._segments = []
+            self._db.close()
 
     def search(self, embedding: List[float], k: int = 4) -> List[Tuple[Dict, float]]:
-        if not self.embeddings:
+        return self.search_many([embedding], k=k)[0]
+
+    def search_many(self, embeddings: List[List[float]], k: int = 4) -> List[List[Tuple[Dict, float]]]:
+        """Search several queries at once (one matrix product per segment when exact)."""
+        if self._size == 0:
+            return [[] for _ in embeddings]
+        if len(embeddings) == 0:
             return []
-        
-        # Compute similarities for all stored embeddings
-        similarities = []
-        for i, stored_embedding in enumerate(self.embeddings):
-            sim = self._cosine_similarity(embedding, stored_embedding)
-            similarities.append((i, sim))
-        
-        # Sort by similarity (descending) and take top k
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        top_k = similarities[:k]
-        
-        # Convert to results format (metadata, distance)
-        results: List[Tuple[Dict, float]] = []
-        for idx, similarity in top_k:
+        queries = _normalize_rows(self._as_matrix(embeddings))
+        with self._lock:
+            if self._ann is not None and self._ann.is_trained:
+                hits = [self._search_ann(query, k) for query in queries]
+            else:
+                similarities = self._scores(queries)
+                hits = []
+                for row_scores in similarities:
+                    top = _top_k(row_scores, k)
+                    hits.append((top, row_scores[top]))
+        results: List[List[Tuple[Dict, float]]] = []
+        for top, scores in hits:
             # Convert similarity to distance (lower = better)
-            distance = 1.0 - similarity
-            results.append((self.metadata[idx], distance))
-        
-        return results 
\ No newline at end of file
+            results.append([
+                (meta, 1.0 - float(score)) for score, meta in zip(scores, self.get_metadata(top))
+            ])
+        return results
@@ -0,0 +1,76 @@
+"""
+Recall@k vs latency of the IVF index against exact search.
+
+Builds a throwaway store of N synthetic embeddings (Gaussian clusters around
+random topic centres, which is closer to real document embeddings than
+uniform noise), then runs the same queries through exact search and through
+the IVF index at several nprobe values. Recall@k is the fraction of the exact
+top-k found by the approximate search.
+
+Usage:
+    python benchmark_ann.py [N] [DIM]
+"""
+
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from backend.vector_store import SimpleVectorStore
+
+NUM_QUERIES = 200
+NUM_TOPICS = 1000
+K = 4
+NPROBES = (1, 2, 4, 8, 16, 32, 64)
+ADD_BATCH = 10_000
+
+
+def synthetic_embeddings(rng, centres, count):
+    topics = rng.integers(0, centres.shape[0], count)
+    return centres[topics] + 1.5 * rng.standard_normal((count, centres.shape[1]), dtype=np.float32)
+
+
+def timed_search(store, queries):
+    results = []
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        results.append([meta["row"] for meta, _ in store.search(query, k=K)])
+        latencies.append(time.perf_counter() - start)
+    return results, np.array(latencies) * 1000
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    dim = int(sys.argv[2]) if len(sys.argv) > 2 else 384
+    rng = np.random.default_rng(0)
+    centres = rng.standard_normal((NUM_TOPICS, dim), dtype=np.float32)
+    path = tempfile.mkdtemp()
+
+    store = SimpleVectorStore(dim, path=path, index="ivf")
+    start = time.perf_counter()
+    for offset in range(0, total, ADD_BATCH):
+        count = min(ADD_BATCH, total - offset)
+        store.add(synthetic_embeddings(rng, centres, count).tolist(),
+                  [{"row": offset + i} for i in range(count)])
+    print(f"Indexed {total:,} x {dim} vectors in {time.perf_counter() - start:.1f}s "
+          f"(IVF trained on {store._ann.trained_rows:,} rows, {len(store._ann.centroids)} lists)")
+    store.close()
+
+    queries = synthetic_embeddings(rng, centres, NUM_QUERIES).tolist()
+    exact_results, exact_ms = timed_search(SimpleVectorStore(dim, path=path), queries)
+    print(f"{'mode':>12} {'recall@' + str(K):>10} {'mean ms':>9} {'p95 ms':>8} {'speedup':>8}")
+    print(f"{'exact':>12} {1.0:>10.3f} {exact_ms.mean():>9.2f} {np.percentile(exact_ms, 95):>8.2f} {1.0:>7.1f}x")
+
+    for nprobe in NPROBES:
+        ivf = SimpleVectorStore(dim, path=path, index="ivf", nprobe=nprobe)
+        ivf_results, ivf_ms = timed_search(ivf, queries)
+        recall = np.mean([len(set(a) & set(e)) / len(e) for a, e in zip(ivf_results, exact_results)])
+        print(f"{'ivf/' + str(nprobe):>12} {recall:>10.3f} {ivf_ms.mean():>9.2f} "
+              f"{np.percentile(ivf_ms, 95):>8.2f} {exact_ms.mean() / ivf_ms.mean():>7.1f}x")
+        ivf.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -34,7 +34,24 @@ export default function Home() {
       const response = await axios.post('/api/upload-doc', formData, {
         headers: { 'Content-Type': 'multipart/form-data' }
       })
-      setUploadStatus(`✅ Uploaded successfully! ${response.data.chunks_indexed} chunks indexed.`)
+      // Indexing runs in the background; poll the job until it finishes
+      const jobId = response.data.job_id
+      while (true) {
+        const { data: job } = await axios.get(`/api/upload-doc/jobs/${jobId}`)
+        if (job.status === 'completed') {
+          setUploadStatus(`✅ Uploaded successfully! ${job.chunks_indexed} chunks indexed.`)
+          break
+        }
+        if (job.status === 'failed') {
+          setUploadStatus(`❌ Upload failed: ${job.error}`)
+          break
+        }
+        if (job.stage) {
+          const progress = job.stages[job.stage]
+          setUploadStatus(`Processing (${job.stage}${progress.total ? ` ${progress.done}/${progress.total}` : ''})...`)
+        }
+        await new Promise(resolve => setTimeout(resolve, 1000))
+      }
     } catch (error) {
       console.error('Upload error:', error)
       setUploadStatus('❌ Upload failed. Please try again.')
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Tests for embedding batching, retries and the embedding cache (no network access)."""
+
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+import httpx
+import openai
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from backend.providers import CachedEmbeddingsProvider, EmbeddingCache, FakeProvider, OpenAIProvider
+from backend.providers import openai_provider
+
+# Kept before tests patch asyncio.sleep to skip the retry backoff
+_sleep = asyncio.sleep
+
+
+class FakeEmbeddingsAPI:
+    """Stands in for ``AsyncOpenAI().embeddings``: embeds with FakeProvider, optionally failing first."""
+
+    def __init__(self, failures: int = 0):
+        self.fake = FakeProvider(dim=8)
+        self.failures = failures
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+
+    async def create(self, model, input):
+        self.requests.append(list(input))
+        if self.failures:
+            self.failures -= 1
+            response = httpx.Response(429, request=httpx.Request("POST", "https://api.openai.com/v1/embeddings"))
+            raise openai.RateLimitError("rate limited", response=response, body=None)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await _sleep(0.01)
+        self.active -= 1
+        vectors = self.fake.embed(list(input))
+        # Out of order on purpose: the provider must sort by index
+        data = [type("Embedding", (), {"index": i, "embedding": v}) for i, v in enumerate(vectors)]
+        return type("Response", (), {"data": data[::-1]})
+
+
+class FakeClient:
+    def __init__(self, failures: int = 0):
+        self.embeddings = FakeEmbeddingsAPI(failures)
+
+
+def _provider(**kwargs) -> OpenAIProvider:
+    provider = OpenAIProvider(api_key="test", embedding_model="text-embedding-3-small",
+                              completion_model="gpt-4o-mini", **kwargs)
+    provider._count_tokens = lambda text: len(text)  # One "token" per character
+    return provider
+
+
+def test_batches_respect_token_budget_and_concurrency():
+    provider = _provider(batch_tokens=10, concurrency=2)
+    client = FakeClient()
+    texts = [f"text{i:02d}" for i in range(20)]  # 6 tokens each: one text per batch
+
+    progress = []
+    vectors = asyncio.run(provider._embed(client, texts, progress.append))
+
+    api = client.embeddings
+    assert len(api.requests) == 20
+    assert all(sum(len(t) for t in batch) <= 10 for batch in api.requests)
+    assert api.max_active == 2
+    assert vectors == FakeProvider(dim=8).embed(texts)  # Input order is preserved
+    assert progress == list(range(1, 21))  # Reported as each batch finishes
+
+
+def test_rate_limited_batches_are_retried_with_backoff(monkeypatch):
+    delays = []
+
+    async def no_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(openai_provider.asyncio, "sleep", no_sleep)
+    provider = _provider(max_retries=3)
+    client = FakeClient(failures=2)
+
+    vectors = asyncio.run(provider._embed_batch(client, ["a", "b"]))
+
+    assert len(client.embeddings.requests) == 3
+    assert len(delays) == 2 and delays[0] <= 1.0 and delays[1] <= 2.0
+    assert vectors == FakeProvider(dim=8).embed(["a", "b"])
+
+    client = FakeClient(failures=5)
+    try:
+        asyncio.run(provider._embed_batch(client, ["a"]))
+    except openai.RateLimitError:
+        pass
+    else:
+        raise AssertionError("expected RateLimitError after max_retries")
+    assert len(client.embeddings.requests) == 4
+
+
+def test_cache_embeds_each_new_text_once():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fake = FakeProvider(dim=8)
+        cache = EmbeddingCache(str(Path(tmp_dir) / "embeddings.sqlite"))
+        provider = CachedEmbeddingsProvider(fake, cache, model="fake")
+        try:
+            first = provider.embed(["a", "b", "a"])
+            assert fake.texts_embedded == 2  # Repeated text embedded once
+            assert first[0] == first[2]
+
+            progress = []
+            provider.embed(["a", "d", "b"], progress.append)
+            assert progress == [2, 3]  # Cache hits first, then the embedded rest
+            assert fake.texts_embedded == 3
+
+            second = asyncio.run(provider.aembed(["b", "c", "c"]))
+            assert fake.calls == 3 and fake.texts_embedded == 4  # Only "c" was new
+            assert second[0] == first[1]
+
+            asyncio.run(provider.aembed(["a", "b", "c"]))
+            assert fake.calls == 3  # All cache hits
+        finally:
+            cache.close()
+
+
+def test_cache_persists_across_instances():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = str(Path(tmp_dir) / "embeddings.sqlite")
+        cache = EmbeddingCache(path)
+        vectors = CachedEmbeddingsProvider(FakeProvider(dim=8), cache, model="fake").embed(["a"])
+        cache.close()
+
+        fake = FakeProvider(dim=8)
+        cache = EmbeddingCache(path)
+        try:
+            assert CachedEmbeddingsProvider(fake, cache, model="fake").embed(["a"]) == vectors
+            assert fake.calls == 0
+            # Another model does not share cached vectors
+            CachedEmbeddingsProvider(fake, cache, model="other").embed(["a"])
+            assert fake.calls == 1
+        finally:
+            cache.close()
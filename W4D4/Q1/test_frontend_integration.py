@@ -5,6 +5,7 @@ Test script to verify frontend-backend integration
 import requests
 import json
 import os
+import time
 
 def test_backend_health():
     """Test if backend is healthy"""
@@ -57,13 +58,23 @@ def test_document_upload():
             files = {"file": f}
             response = requests.post("http://localhost:8000/upload-doc", files=files)
         
-        if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Document upload successful: {data['chunks_indexed']} chunks indexed")
-            return True
-        else:
+        if response.status_code != 202:
             print(f"❌ Document upload failed: {response.status_code}")
             return False
+
+        # Indexing runs in the background; poll the job status
+        job_url = f"http://localhost:8000/upload-doc/jobs/{response.json()['job_id']}"
+        for _ in range(60):
+            job = requests.get(job_url).json()
+            if job["status"] == "completed":
+                print(f"✅ Document upload successful: {job['chunks_indexed']} chunks indexed")
+                return True
+            if job["status"] == "failed":
+                print(f"❌ Document indexing failed: {job['error']}")
+                return False
+            time.sleep(1)
+        print("❌ Document indexing timed out")
+        return False
     except Exception as e:
         print(f"❌ Document upload error: {e}")
         return False
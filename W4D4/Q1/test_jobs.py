@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Tests for the background upload pipeline (extract → chunk → embed → index) with FakeProvider."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from backend.jobs import IngestionJobs
+from backend.providers import FakeProvider
+from backend.vector_store import SimpleVectorStore
+
+TEXT = " ".join(f"Sentence number {i} about retrieval augmented generation." for i in range(60))
+
+
+def _upload(tmp_dir: str, text: str = TEXT, name: str = "notes.txt") -> str:
+    path = os.path.join(tmp_dir, name)
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(text)
+    return path
+
+
+def _run(tmp_dir: str, embed, file_path: str):
+    """Run one job to completion; returns (job snapshot, store or None)."""
+    stores = []
+
+    def get_store(dim: int) -> SimpleVectorStore:
+        stores.append(SimpleVectorStore(dim, path=os.path.join(tmp_dir, "store")))
+        return stores[0]
+
+    jobs = IngestionJobs(embed, get_store, workers=1, extract_processes=0)
+    job_id = jobs.submit(file_path, os.path.basename(file_path))["id"]
+    jobs.shutdown()
+    return jobs.get(job_id), (stores[0] if stores else None)
+
+
+def test_job_runs_every_stage_with_one_embed_call():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        provider = FakeProvider(dim=8)
+        file_path = _upload(tmp_dir)
+        job, store = _run(tmp_dir, provider.embed, file_path)
+
+        assert job["status"] == "completed"
+        assert job["error"] is None
+        assert job["finished_at"] is not None
+        assert job["chunks_indexed"] > 1
+        for stage in ("extract", "chunk", "embed", "index"):
+            assert job["stages"][stage]["status"] == "done"
+        assert job["stages"]["embed"]["done"] == job["stages"]["embed"]["total"] == job["chunks_indexed"]
+        # All chunks go to the provider in one call, which does the batching
+        assert provider.calls == 1
+        assert provider.texts_embedded == job["chunks_indexed"]
+        assert len(store) == job["chunks_indexed"]
+        assert not os.path.exists(file_path)
+        store.close()
+
+
+def test_stages_advance_in_order():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        provider = FakeProvider(dim=8)
+        seen = {}
+
+        def embed(texts, progress=None):
+            job = jobs.list()[0]
+            seen["stage"] = job["stage"]
+            seen["stages"] = {name: stage["status"] for name, stage in job["stages"].items()}
+
+            def report(done):
+                seen.setdefault("progress", []).append(done)
+                progress(done)
+
+            return provider.embed(texts, report)
+
+        jobs = IngestionJobs(embed, lambda dim: SimpleVectorStore(dim, path=os.path.join(tmp_dir, "store")),
+                             workers=1, extract_processes=0)
+        jobs.submit(_upload(tmp_dir), "notes.txt")
+        jobs.shutdown()
+
+        assert seen["stage"] == "embed"
+        assert seen["stages"] == {"extract": "done", "chunk": "done", "embed": "running", "index": "pending"}
+        assert seen["progress"] == [jobs.list()[0]["chunks_indexed"]]
+        assert jobs.list()[0]["status"] == "completed"
+
+
+def test_failing_job_records_error_and_stage_and_removes_the_file():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        def embed(texts, progress=None):
+            raise RuntimeError("provider unavailable")
+
+        file_path = _upload(tmp_dir)
+        job, store = _run(tmp_dir, embed, file_path)
+
+        assert job["status"] == "failed"
+        assert job["stage"] == "embed"
+        assert job["stages"]["embed"]["status"] == "failed"
+        assert job["stages"]["index"]["status"] == "pending"
+        assert job["error"] == "provider unavailable"
+        assert job["finished_at"] is not None
+        assert store is None
+        assert not os.path.exists(file_path)
+
+
+def test_unsupported_file_fails_during_extract():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        provider = FakeProvider(dim=8)
+        file_path = _upload(tmp_dir, name="notes.csv")
+        job, _ = _run(tmp_dir, provider.embed, file_path)
+
+        assert job["status"] == "failed"
+        assert job["stage"] == "extract"
+        assert "Unsupported file type" in job["error"]
+        assert provider.calls == 0
+        assert not os.path.exists(file_path)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Tests for the segment-based vector store: persistence, crash recovery, migration, compaction and IVF."""
+
+import json
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from backend.vector_store import SimpleVectorStore
+
+DIM = 8
+
+
+def _vectors(count: int, seed: int = 0) -> list:
+    return np.random.default_rng(seed).standard_normal((count, DIM)).tolist()
+
+
+def _metas(start: int, count: int) -> list:
+    return [{"row": start + i} for i in range(count)]
+
+
+def _top_rows(store: SimpleVectorStore, query, k: int = 4) -> list:
+    return [meta["row"] for meta, _ in store.search(query, k=k)]
+
+
+def _segment_files(path: str) -> list:
+    return sorted(os.listdir(os.path.join(path, "segments")))
+
+
+def test_added_rows_survive_reopen():
+    with tempfile.TemporaryDirectory() as path:
+        vectors = _vectors(30)
+        store = SimpleVectorStore(DIM, path=path)
+        store.add(vectors[:20], _metas(0, 20))
+        store.add(vectors[20:], _metas(20, 10))
+        assert len(store) == 30
+        store.close()
+
+        store = SimpleVectorStore(DIM, path=path)
+        try:
+            assert len(store) == 30
+            assert len(_segment_files(path)) == 2
+            # Each stored vector is its own nearest neighbour
+            assert _top_rows(store, vectors[25], k=1) == [25]
+            meta, distance = store.search(vectors[3], k=1)[0]
+            assert meta == {"row": 3}
+            assert abs(distance) < 1e-5
+        finally:
+            store.close()
+
+
+def test_torn_segment_write_is_discarded_on_reopen():
+    with tempfile.TemporaryDirectory() as path:
+        vectors = _vectors(10)
+        store = SimpleVectorStore(DIM, path=path)
+        store.add(vectors, _metas(0, 10))
+        store.close()
+
+        # A crash mid-add leaves a partial temp file or a segment never committed to index.db
+        segments_dir = os.path.join(path, "segments")
+        with open(os.path.join(segments_dir, "seg-torn.npy.tmp"), "wb") as fh:
+            fh.write(b"\x93NUMPY\x01\x00partial")
+        np.save(os.path.join(segments_dir, "seg-uncommitted.npy"), np.ones((3, DIM), dtype=np.float32))
+
+        store = SimpleVectorStore(DIM, path=path)
+        try:
+            assert len(store) == 10
+            assert len(_segment_files(path)) == 1
+            assert _top_rows(store, vectors[7], k=1) == [7]
+            store.add(_vectors(5, seed=1), _metas(10, 5))
+            assert len(store) == 15
+        finally:
+            store.close()
+
+
+def test_legacy_pickle_store_is_migrated_once():
+    with tempfile.TemporaryDirectory() as path:
+        vectors = _vectors(12)
+        with open(os.path.join(path, "embeddings.pkl"), "wb") as fh:
+            pickle.dump(vectors, fh)
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as fh:
+            json.dump(_metas(0, 12), fh)
+
+        store = SimpleVectorStore(DIM, path=path)
+        assert len(store) == 12
+        assert _top_rows(store, vectors[5], k=1) == [5]
+        store.close()
+
+        store = SimpleVectorStore(DIM, path=path)
+        try:
+            assert len(store) == 12
+            assert len(_segment_files(path)) == 1
+        finally:
+            store.close()
+
+
+def test_compaction_merges_segments_without_changing_results():
+    with tempfile.TemporaryDirectory() as path:
+        vectors = _vectors(40)
+        queries = _vectors(5, seed=1)
+        store = SimpleVectorStore(DIM, path=path, max_segments=100)
+        for start in range(0, 40, 10):
+            store.add(vectors[start:start + 10], _metas(start, 10))
+        assert len(_segment_files(path)) == 4
+        before = [_top_rows(store, query) for query in queries]
+
+        store.compact()
+        assert len(_segment_files(path)) == 1
+        assert [_top_rows(store, query) for query in queries] == before
+        store.close()
+
+        store = SimpleVectorStore(DIM, path=path, max_segments=2)
+        try:
+            assert len(store) == 40
+            assert [_top_rows(store, query) for query in queries] == before
+            # Going over max_segments compacts automatically
+            store.add(_vectors(5, seed=2), _metas(40, 5))
+            store.add(_vectors(5, seed=3), _metas(45, 5))
+            assert len(_segment_files(path)) == 1
+            assert len(store) == 50
+        finally:
+            store.close()
+
+
+def test_ivf_recall_matches_exact_search_and_survives_reopen():
+    rng = np.random.default_rng(0)
+    centres = rng.standard_normal((40, DIM)).astype(np.float32) * 4
+    vectors = (centres[rng.integers(0, 40, 2000)] + rng.standard_normal((2000, DIM))).tolist()
+    queries = (centres[rng.integers(0, 40, 50)] + rng.standard_normal((50, DIM))).tolist()
+
+    with tempfile.TemporaryDirectory() as path:
+        store = SimpleVectorStore(DIM, path=path, index="ivf", nlist=16, nprobe=4)
+        for start in range(0, 2000, 500):
+            store.add(vectors[start:start + 500], _metas(start, 500))
+        assert store._ann.is_trained
+        trained_rows = store._ann.trained_rows
+        ivf_results = [_top_rows(store, query) for query in queries]
+        store.close()
+
+        exact = SimpleVectorStore(DIM, path=path)
+        exact_results = [_top_rows(exact, query) for query in queries]
+        exact.close()
+        recall = np.mean([len(set(a) & set(e)) / len(e) for a, e in zip(ivf_results, exact_results)])
+        assert recall >= 0.9
+
+        # The trained index is loaded from index.db, not retrained
+        store = SimpleVectorStore(DIM, path=path, index="ivf", nlist=16, nprobe=4)
+        try:
+            assert len(store._ann) == 2000
+            assert store._ann.trained_rows == trained_rows < 2000
+            assert [_top_rows(store, query) for query in queries] == ivf_results
+        finally:
+            store.close()
@@ -8,9 +8,21 @@ POST /predict
         "text": "<article text>"
     }
 Returns JSON with predictions from BERT and Sentence-BERT models.
+
+POST /predict_batch
+    {
+        "texts": ["<article text>", ...]
+    }
+Returns {"predictions": [...]} with one /predict-style result per text.
+
+Concurrent requests are coalesced by a micro-batcher: texts that arrive within
+BATCH_MAX_WAIT_MS of each other (at most BATCH_MAX_SIZE) are embedded in one
+forward pass per model.
 """
 from __future__ import annotations
 
+import asyncio
+import os
 from pathlib import Path
 from typing import Dict, List
 
@@ -20,6 +32,7 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
+from batching import MicroBatcher
 from embedding_models import BertEmbedder, SentenceBERTEmbedder
 
 # --------------------
@@ -38,6 +51,15 @@ class ArticleRequest(BaseModel):
     text: str = Field(..., description="News article content")
 
 
+# Upper bound on texts per /predict_batch request, so one request cannot queue
+# an unbounded amount of work in front of every other caller
+MAX_BATCH_TEXTS = int(os.getenv("MAX_BATCH_TEXTS", "128"))
+
+
+class BatchRequest(BaseModel):
+    texts: List[str] = Field(..., max_length=MAX_BATCH_TEXTS, description="News article contents")
+
+
 # --------------------
 # Load models & embedders at startup
 # --------------------
@@ -51,9 +73,17 @@ except FileNotFoundError as e:
 
 CATEGORIES: List[str] = bert_clf.classes_.tolist()
 
-# Embedders (heavy models) are loaded once
-bert_embedder = BertEmbedder()
-sbert_embedder = SentenceBERTEmbedder()
+# Embedders (heavy models) are loaded once. No on-disk vector cache: it would
+# grow with every request text and fsync on the serving path.
+bert_embedder = BertEmbedder(use_cache=False)
+sbert_embedder = SentenceBERTEmbedder(use_cache=False)
+
+# Requests are coalesced for up to BATCH_MAX_WAIT_MS or BATCH_MAX_SIZE texts
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "32"))
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "10"))
+
+bert_batcher = MicroBatcher(bert_embedder.encode, BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS, name="bert")
+sbert_batcher = MicroBatcher(sbert_embedder.encode, BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS, name="sbert")
 
 
 # --------------------
@@ -64,31 +94,60 @@ def probs_to_dict(probs: np.ndarray) -> Dict[str, float]:
     return {cat: float(p) for cat, p in zip(CATEGORIES, probs)}
 
 
+def format_predictions(bert_probs: np.ndarray, sbert_probs: np.ndarray) -> List[Dict]:
+    return [
+        {
+            "bert": {
+                "label": CATEGORIES[int(np.argmax(b))],
+                "probs": probs_to_dict(b),
+            },
+            "sentencebert": {
+                "label": CATEGORIES[int(np.argmax(s))],
+                "probs": probs_to_dict(s),
+            },
+        }
+        for b, s in zip(bert_probs, sbert_probs)
+    ]
+
+
+async def classify(texts: List[str]) -> List[Dict]:
+    # Both models run concurrently, each batched with other in-flight requests
+    bert_vecs, sbert_vecs = await asyncio.gather(
+        bert_batcher.submit_many(texts), sbert_batcher.submit_many(texts)
+    )
+    return format_predictions(bert_clf.predict_proba(bert_vecs), sbert_clf.predict_proba(sbert_vecs))
+
+
 # --------------------
 # Routes
 # --------------------
 
 @app.post("/predict")
-def predict(req: ArticleRequest):
+async def predict(req: ArticleRequest):
     text = req.text.strip()
     if not text:
         raise HTTPException(status_code=400, detail="Text cannot be empty.")
 
-    # Encode
-    bert_vec = bert_embedder.encode([text])
-    sbert_vec = sbert_embedder.encode([text])
-
-    # Predict
-    bert_probs = bert_clf.predict_proba(bert_vec)[0]
-    sbert_probs = sbert_clf.predict_proba(sbert_vec)[0]
-
-    return {
-        "bert": {
-            "label": CATEGORIES[int(np.argmax(bert_probs))],
-            "probs": probs_to_dict(bert_probs),
-        },
-        "sentencebert": {
-            "label": CATEGORIES[int(np.argmax(sbert_probs))],
-            "probs": probs_to_dict(sbert_probs),
-        },
-    } 
\ No newline at end of file
+    return (await classify([text]))[0]
+
+
+@app.post("/predict_batch")
+async def predict_batch(req: BatchRequest):
+    texts = [t.strip() for t in req.texts]
+    if not texts:
+        raise HTTPException(status_code=400, detail="Texts cannot be empty.")
+    if not all(texts):
+        raise HTTPException(status_code=400, detail="Text cannot be empty.")
+
+    return {"predictions": await classify(texts)}
+
+
+@app.get("/batching_stats")
+def batching_stats():
+    return {"bert": bert_batcher.stats(), "sentencebert": sbert_batcher.stats()}
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    await bert_batcher.close()
+    await sbert_batcher.close()
@@ -0,0 +1,111 @@
+"""Dynamic micro-batching for embedding inference.
+
+Concurrent requests each submit one text; a background task collects them
+for up to ``max_wait_ms`` (or until ``max_batch_size`` texts are waiting),
+runs a single batched ``encode`` on a worker thread and hands each caller its
+own row. While one batch runs, the next one fills up.
+
+Usage:
+    batcher = MicroBatcher(embedder.encode, max_batch_size=32, max_wait_ms=10)
+    vector = await batcher.submit("some text")
+"""
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np  # type: ignore
+
+__all__ = ["MicroBatcher"]
+
+
+class MicroBatcher:
+    """Coalesces single-text requests into batched calls of ``encode``."""
+
+    def __init__(self, encode: Callable[[List[str]], np.ndarray], max_batch_size: int = 32,
+                 max_wait_ms: float = 10.0, name: str = "batcher"):
+        self.encode = encode
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+        # One thread per model: batches of the same model run one after another
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        self._queue: asyncio.Queue[Tuple[str, asyncio.Future]] | None = None
+        self._task: asyncio.Task | None = None
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_started(self) -> asyncio.Queue:
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._queue  # type: ignore[return-value]
+
+    async def submit(self, text: str) -> np.ndarray:
+        """Embedding of one text, computed as part of a batch."""
+        future = asyncio.get_running_loop().create_future()
+        self._ensure_started().put_nowait((text, future))
+        return await future
+
+    async def submit_many(self, texts: List[str]) -> np.ndarray:
+        """Embeddings of several texts (batched together with other callers)."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack(await asyncio.gather(*(self.submit(t) for t in texts)))
+
+    async def _collect(self) -> List[Tuple[str, asyncio.Future]]:
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        batch = [await queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Callers that gave up (e.g. client disconnected) are skipped
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if not batch:
+                continue
+            try:
+                vectors = await loop.run_in_executor(self._executor, self.encode, [text for text, _ in batch])
+            except Exception as exc:  # noqa: BLE001
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            for row, (_, future) in zip(vectors, batch):
+                if not future.done():
+                    future.set_result(row)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,93 @@
+"""Throughput / latency benchmark for the categorizer API.
+
+Fires requests at a running backend from many concurrent clients and reports
+requests per second plus latency percentiles, then the micro-batcher's
+average batch size.
+
+Run (with the API started as in api.py):
+    PYTHONPATH=src python src/benchmark_api.py --requests 500 --concurrency 32
+    PYTHONPATH=src python src/benchmark_api.py --endpoint predict_batch --batch-size 16
+
+Restart the server with BATCH_MAX_SIZE=1 to compare against unbatched inference.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+import requests  # type: ignore
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+FALLBACK_TEXTS = [
+    "The central bank raised interest rates by a quarter point to curb inflation.",
+    "The striker scored twice as the home side won the championship final.",
+    "A new smartphone chip promises faster on-device machine learning.",
+    "Lawmakers debated the budget bill late into the night before the vote.",
+    "Researchers found that the vaccine reduced hospital admissions by half.",
+    "The studio's latest film topped the box office on its opening weekend.",
+]
+
+
+def load_texts(n: int) -> List[str]:
+    """Sample article texts from the test split (or built-in examples if it is missing)."""
+    path = DATA_DIR / "test.csv"
+    if path.exists():
+        texts = pd.read_csv(path)["text"].dropna().astype(str).tolist()
+    else:
+        texts = FALLBACK_TEXTS
+    rng = random.Random(0)
+    # Distinct strings, as real traffic would be
+    return [f"{rng.choice(texts)} [{i}]" for i in range(n)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the categorizer API")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--endpoint", choices=["predict", "predict_batch"], default="predict")
+    parser.add_argument("--requests", type=int, default=200, help="Number of HTTP requests")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--batch-size", type=int, default=8, help="Texts per /predict_batch request")
+    args = parser.parse_args()
+
+    per_request = args.batch_size if args.endpoint == "predict_batch" else 1
+    texts = load_texts(args.requests * per_request)
+    session = requests.Session()
+    session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=args.concurrency))
+
+    def call(i: int) -> float:
+        chunk = texts[i * per_request:(i + 1) * per_request]
+        body = {"texts": chunk} if args.endpoint == "predict_batch" else {"text": chunk[0]}
+        start = time.perf_counter()
+        resp = session.post(f"{args.url}/{args.endpoint}", json=body, timeout=300)
+        resp.raise_for_status()
+        return time.perf_counter() - start
+
+    # Warm up with a text outside the timed set
+    warm_up = ["Warm-up request."] * per_request
+    body = {"texts": warm_up} if args.endpoint == "predict_batch" else {"text": warm_up[0]}
+    session.post(f"{args.url}/{args.endpoint}", json=body, timeout=300).raise_for_status()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        latencies = np.array(list(pool.map(call, range(args.requests)))) * 1000
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.endpoint}: {args.requests} requests, {args.requests * per_request} texts, "
+          f"concurrency {args.concurrency}")
+    print(f"  throughput: {args.requests / elapsed:.1f} req/s, {args.requests * per_request / elapsed:.1f} texts/s")
+    print(f"  latency ms: p50 {np.percentile(latencies, 50):.1f}  p95 {np.percentile(latencies, 95):.1f}  "
+          f"p99 {np.percentile(latencies, 99):.1f}  max {latencies.max():.1f}")
+    stats = session.get(f"{args.url}/batching_stats", timeout=10)
+    if stats.ok:
+        for model, s in stats.json().items():
+            print(f"  {model}: {s['batches']} batches, avg batch size {s['avg_batch_size']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,9 @@
 Each class exposes:
     encode(texts: List[str]) -> np.ndarray  # shape (len(texts), dim)
 
+Vectors are cached on disk per model (see vector_cache.py), so texts that were
+embedded before are not recomputed; pass use_cache=False to bypass the cache.
+
 Usage:
     from embedding_models import Word2VecEmbedder, BertEmbedder, SentenceBERTEmbedder, OpenAIEmbedder
     embedder = SentenceBERTEmbedder()
@@ -10,19 +13,19 @@ Usage:
 """
 from __future__ import annotations
 
-import hashlib
 import json
 import os
 import re
-import shelve
 import time
 from pathlib import Path
-from typing import Dict, List
+from typing import List
 
 import numpy as np  # type: ignore
 from tqdm import tqdm  # type: ignore
 import torch  # type: ignore
 
+from vector_cache import VectorCache
+
 __all__ = [
     "Word2VecEmbedder",
     "BertEmbedder",
@@ -34,10 +37,29 @@ CACHE_DIR = Path(__file__).resolve().parent.parent / "cache"
 CACHE_DIR.mkdir(exist_ok=True)
 
 
-class Word2VecEmbedder:
+class _CachedEmbedder:
+    """Serves encode() from the shared vector cache; subclasses implement _encode()."""
+
+    model_name: str
+    dim: int
+    cache: VectorCache | None = None
+
+    def _init_cache(self, use_cache: bool) -> None:
+        self.cache = VectorCache(self.model_name, self.dim, CACHE_DIR / "vectors") if use_cache else None
+
+    def _encode(self, texts: List[str], **kwargs) -> np.ndarray:
+        raise NotImplementedError
+
+    def encode(self, texts: List[str], **kwargs) -> np.ndarray:
+        if self.cache is None:
+            return self._encode(list(texts), **kwargs)
+        return self.cache.get_or_compute(list(texts), lambda missing: self._encode(missing, **kwargs))
+
+
+class Word2VecEmbedder(_CachedEmbedder):
     """Average pre-trained Word2Vec vectors (GoogleNews 300d)."""
 
-    def __init__(self):
+    def __init__(self, model_name: str = "word2vec-google-news-300", use_cache: bool = True):
         try:
             import gensim.downloader as api  # type: ignore
         except ModuleNotFoundError as e:
@@ -45,35 +67,52 @@ class Word2VecEmbedder:
                 "gensim is not installed (or incompatible with Python 3.13). "
                 "Word2Vec embedding is disabled for now."
             ) from e
+        from scipy import sparse  # type: ignore
 
-        self.model = api.load("word2vec-google-news-300")
+        self.sparse = sparse
+        self.model_name = model_name
+        self.model = api.load(model_name)
         self.dim = self.model.vector_size
+        self.vocab = self.model.key_to_index
         self.token_re = re.compile(r"[A-Za-z]+")
+        self._init_cache(use_cache)
 
     def _tokenize(self, text: str) -> List[str]:
         return self.token_re.findall(text.lower())
 
-    def encode(self, texts: List[str]) -> np.ndarray:
-        out = np.zeros((len(texts), self.dim), dtype=np.float32)
-        for i, txt in enumerate(texts):
-            toks = [t for t in self._tokenize(txt) if t in self.model]
-            if toks:
-                vecs = [self.model[t] for t in toks]
-                out[i] = np.mean(vecs, axis=0)
-        return out
-
-
-class BertEmbedder:
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        # Row i of the sparse weight matrix holds 1/n for each of the n in-vocabulary
+        # tokens of text i (repeats add up), so one product with the embedding
+        # table averages every text at once.
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        for txt in texts:
+            ids = [self.vocab[t] for t in self._tokenize(txt) if t in self.vocab]
+            indices.extend(ids)
+            if ids:
+                data.extend([1.0 / len(ids)] * len(ids))
+            indptr.append(len(indices))
+        weights = self.sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(texts), len(self.vocab)),
+        )
+        return np.asarray(weights @ self.model.vectors, dtype=np.float32)
+
+
+class BertEmbedder(_CachedEmbedder):
     """CLS-token embedding from bert-base-uncased."""
 
-    def __init__(self, model_name: str = "bert-base-uncased", device: str | None = None):
+    def __init__(self, model_name: str = "bert-base-uncased", device: str | None = None, use_cache: bool = True):
         from transformers import AutoModel, AutoTokenizer  # type: ignore
 
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")  # type: ignore[attr-defined]
+        self.model_name = model_name
         self.tokenizer = AutoTokenizer.from_pretrained(model_name)
         self.model = AutoModel.from_pretrained(model_name).to(self.device)
         self.model.eval()
         self.dim = self.model.config.hidden_size
+        self._init_cache(use_cache)
 
     @staticmethod
     def _batch(iterable, n=32):
@@ -81,7 +120,7 @@ class BertEmbedder:
             yield iterable[i : i + n]
 
     @torch.no_grad()  # type: ignore
-    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+    def _encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
         all_vecs: List[np.ndarray] = []
         for batch in self._batch(texts, batch_size):
             inputs = self.tokenizer(batch, padding=True, truncation=True, return_tensors="pt").to(self.device)
@@ -91,25 +130,27 @@ class BertEmbedder:
         return np.vstack(all_vecs)
 
 
-class SentenceBERTEmbedder:
+class SentenceBERTEmbedder(_CachedEmbedder):
     """SentenceTransformer all-MiniLM-L6-v2 (384-d)."""
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2", device: str | None = None):
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", device: str | None = None, use_cache: bool = True):
         from sentence_transformers import SentenceTransformer  # type: ignore
 
         self.device = device
+        self.model_name = model_name
         self.model = SentenceTransformer(model_name, device=device)
         self.dim = self.model.get_sentence_embedding_dimension()
+        self._init_cache(use_cache)
 
-    def encode(self, texts: List[str], batch_size: int = 64) -> np.ndarray:  # type: ignore[override]
+    def _encode(self, texts: List[str], batch_size: int = 64) -> np.ndarray:  # type: ignore[override]
         vecs = self.model.encode(texts, batch_size=batch_size, convert_to_numpy=True, show_progress_bar=True)
         return vecs.astype(np.float32)
 
 
-class OpenAIEmbedder:
-    """OpenAI ada-002 embeddings with local caching to respect budget limits."""
+class OpenAIEmbedder(_CachedEmbedder):
+    """OpenAI ada-002 embeddings; the vector cache keeps re-runs within budget."""
 
-    def __init__(self, model_name: str = "text-embedding-ada-002", cache_path: Path | None = None):
+    def __init__(self, model_name: str = "text-embedding-ada-002", use_cache: bool = True):
         import openai  # type: ignore
 
         self.openai = openai
@@ -118,53 +159,22 @@ class OpenAIEmbedder:
             raise RuntimeError("OPENAI_API_KEY environment variable not set.")
         self.model_name = model_name
         self.dim = 1536  # ada-002 output size
-        self.cache_path = cache_path or CACHE_DIR / "openai_embeddings.db"
-        # Use shelve for a simple key-value store (persistent dict)
-        self._store = shelve.open(str(self.cache_path))
-
-    def _hash(self, text: str) -> str:
-        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+        self._init_cache(use_cache)
 
     def _query_api(self, batch: List[str]) -> List[List[float]]:
         response = self.openai.Embedding.create(model=self.model_name, input=batch)  # type: ignore[attr-defined]
         # API returns list of dicts in order
         return [d["embedding"] for d in sorted(response.data, key=lambda x: x["index"])]
 
-    def encode(self, texts: List[str], batch_size: int = 100) -> np.ndarray:  # type: ignore[override]
-        vectors: List[np.ndarray] = []
-        uncached_indices: Dict[int, str] = {}
-        for idx, t in enumerate(texts):
-            h = self._hash(t)
-            if h in self._store:
-                vectors.append(np.array(self._store[h], dtype=np.float32))
-            else:
-                vectors.append(None)  # placeholder
-                uncached_indices[idx] = h
-
-        # Fetch uncached texts in batches
-        pending_texts = [texts[i] for i in uncached_indices]
-        for i in tqdm(range(0, len(pending_texts), batch_size), desc="OpenAI batches"):
-            batch_texts = pending_texts[i : i + batch_size]
+    def _encode(self, texts: List[str], batch_size: int = 100) -> np.ndarray:  # type: ignore[override]
+        vectors: List[List[float]] = []
+        for i in tqdm(range(0, len(texts), batch_size), desc="OpenAI batches"):
+            batch_texts = texts[i : i + batch_size]
             try:
                 batch_vecs = self._query_api(batch_texts)
             except Exception as e:
                 print("OpenAI API error, sleeping 5s…", e)
                 time.sleep(5)
                 batch_vecs = self._query_api(batch_texts)
-            for txt, vec in zip(batch_texts, batch_vecs):
-                h = self._hash(txt)
-                self._store[h] = vec  # cache
-
-        # Now build final matrix
-        for i, v in enumerate(vectors):
-            if v is None:
-                h = uncached_indices[i]
-                v = np.array(self._store[h], dtype=np.float32)
-                vectors[i] = v
-        return np.vstack(vectors)
-
-    def __del__(self):
-        try:
-            self._store.close()
-        except Exception:
-            pass 
\ No newline at end of file
+            vectors.extend(batch_vecs)
+        return np.asarray(vectors, dtype=np.float32).reshape(len(texts), self.dim)
@@ -0,0 +1,128 @@
+"""Content-addressed on-disk cache of embedding vectors.
+
+Vectors for each model are appended to one raw float32 file
+(``cache/vectors/<model>.f32``) and read back through ``np.memmap``; a SQLite
+table maps (model name, SHA-256 of the text) to the row holding its vector.
+Re-running an embedder over texts it has already seen costs one index lookup
+instead of a forward pass.
+
+Usage:
+    from vector_cache import VectorCache
+    cache = VectorCache("all-MiniLM-L6-v2", dim=384)
+    X = cache.get_or_compute(texts, embedder_fn)   # embedder_fn(missing_texts) -> np.ndarray
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np  # type: ignore
+
+__all__ = ["VectorCache", "DEFAULT_CACHE_DIR"]
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / "cache" / "vectors"
+
+
+def _text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class VectorCache:
+    """Append-only float32 vector file plus a (model, text hash) -> row index."""
+
+    def __init__(self, model_name: str, dim: int, cache_dir: Path | None = None):
+        self.model_name = model_name
+        self.dim = int(dim)
+        cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.vectors_path = cache_dir / f"{safe_name}.f32"
+        self.vectors_path.touch(exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(cache_dir / "index.db"), timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS vectors "
+            "(model TEXT NOT NULL, key TEXT NOT NULL, row INTEGER NOT NULL, PRIMARY KEY (model, key))"
+        )
+        self._db.commit()
+        self._memmap: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM vectors WHERE model = ?", (self.model_name,)).fetchone()[0]
+
+    def _rows_on_disk(self) -> int:
+        return os.path.getsize(self.vectors_path) // (4 * self.dim)
+
+    def _matrix(self) -> np.ndarray:
+        rows = self._rows_on_disk()
+        if self._memmap is None or self._memmap.shape[0] != rows:
+            self._memmap = (
+                np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+                if rows else np.zeros((0, self.dim), dtype=np.float32)
+            )
+        return self._memmap
+
+    def lookup(self, keys: Sequence[str]) -> Dict[str, int]:
+        found: Dict[str, int] = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            batch = list(keys[start:start + 500])
+            found.update(self._db.execute(
+                f"SELECT key, row FROM vectors WHERE model = ? AND key IN ({','.join('?' * len(batch))})",
+                [self.model_name, *batch],
+            ).fetchall())
+        return found
+
+    def _append(self, keys: List[str], vectors: np.ndarray) -> Dict[str, int]:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.shape != (len(keys), self.dim):
+            raise ValueError(f"Expected vectors of shape {(len(keys), self.dim)}, got {vectors.shape}")
+        # The write lock on the index also serialises appends from other processes
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            with open(self.vectors_path, "r+b") as fh:
+                # Drop a partial row left by an interrupted write
+                start = self._rows_on_disk()
+                fh.truncate(start * 4 * self.dim)
+                fh.seek(0, os.SEEK_END)
+                fh.write(vectors.tobytes())
+                fh.flush()
+                os.fsync(fh.fileno())
+            # Rows are only referenced once their bytes are on disk
+            rows = {key: start + i for i, key in enumerate(keys)}
+            self._db.executemany(
+                "INSERT OR IGNORE INTO vectors (model, key, row) VALUES (?, ?, ?)",
+                [(self.model_name, key, row) for key, row in rows.items()],
+            )
+            self._db.commit()
+        except BaseException:
+            self._db.rollback()
+            raise
+        return rows
+
+    def get_or_compute(self, texts: Sequence[str], compute: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """Vectors for ``texts``; only texts missing from the cache are passed to ``compute`` (once each)."""
+        keys = [_text_key(t) for t in texts]
+        with self._lock:
+            rows = self.lookup(list(dict.fromkeys(keys)))
+            missing: Dict[str, str] = {}
+            for key, text in zip(keys, texts):
+                if key not in rows:
+                    missing.setdefault(key, text)
+            if missing:
+                computed = compute(list(missing.values()))
+                rows.update(self._append(list(missing), computed))
+            if not keys:
+                return np.zeros((0, self.dim), dtype=np.float32)
+            return np.asarray(self._matrix()[[rows[k] for k in keys]], dtype=np.float32)
+
+    def close(self) -> None:
+        with self._lock:
+            self._memmap = None
+            self._db.close()
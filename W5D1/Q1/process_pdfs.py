@@ -47,7 +47,8 @@ def main():
     # Process all PDF files
     print("\n📖 Processing PDF files...")
     try:
-        total_chunks = processor.process_documents(pdf_files)
+        # The documents directory is the source of truth: an edited PDF replaces its previous version
+        total_chunks = processor.process_documents(pdf_files, replace=True)
         print(f"\n✅ Successfully processed {total_chunks} chunks from {len(pdf_files)} PDF files")
         print("🎉 Documents are now ready for querying!")
         
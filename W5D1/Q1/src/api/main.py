@@ -50,7 +50,7 @@ class DocumentProcessingStatus(BaseModel):
     chunks_processed: int
     error_message: str | None = None
 
-def process_document_background(document_id: str, file_path: str, filename: str):
+def process_document_background(document_id: str, file_path: str, filename: str, replace: bool = True):
     """Background task to process uploaded document."""
     try:
         processing_status[document_id] = {
@@ -60,8 +60,13 @@ def process_document_background(document_id: str, file_path: str, filename: str)
             "error_message": None
         }
         
+        def report_progress(progress: dict):
+            processing_status[document_id]["chunks_processed"] = progress["chunks_written"]
+
         # Process the document
-        chunks_processed = doc_processor.process_documents([file_path])
+        chunks_processed = doc_processor.process_documents(
+            [file_path], progress_callback=report_progress, document_names=[filename], replace=replace
+        )
         
         # Update status
         processing_status[document_id] = {
@@ -89,9 +94,17 @@ def process_document_background(document_id: str, file_path: str, filename: str)
 @app.post("/api/v1/documents/upload", response_model=DocumentUploadResponse)
 async def upload_document(
     background_tasks: BackgroundTasks,
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    replace: bool = True
 ):
-    """Upload a PDF document for processing."""
+    """Upload a PDF document for processing.
+
+    By default the file is the new version of the document with the same
+    filename: only its changed chunks are embedded and the ones it no longer
+    has are removed. With ``replace=false`` a different file under a taken
+    filename is indexed as a separate document instead. A file whose content
+    is already indexed is skipped either way.
+    """
     
     # Validate file type
     if not file.filename or not file.filename.lower().endswith('.pdf'):
@@ -126,7 +139,8 @@ async def upload_document(
             process_document_background,
             document_id,
             temp_file_path,
-            file.filename or "unknown.pdf"
+            file.filename or "unknown.pdf",
+            replace
         )
         
         return DocumentUploadResponse(
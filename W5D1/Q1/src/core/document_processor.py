@@ -1,55 +1,596 @@
+import hashlib
 import os
-from typing import List
+import queue
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 from langchain_community.document_loaders import PyPDFLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import Chroma
+from langchain_core.documents import Document
 
 from .embeddings import CustomSentenceTransformerEmbeddings
 
+# Chunk manifests are recorded on the Document table when the database layer is importable
+try:
+    from ..database.database import SessionLocal, create_tables
+    from ..database.models import Document as DocumentRecord
+    DATABASE_AVAILABLE = True
+except ImportError:
+    DATABASE_AVAILABLE = False
+
 # Fix tokenizers parallelism warning
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
+CHUNK_SIZE = 512
+CHUNK_OVERLAP = 50
+SEPARATORS = ["\n\n", "\n", ".", "!", "?", ",", " ", ""]
+
+# Pipeline tuning (override through the environment)
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", str(os.cpu_count() or 1)))
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "1024"))
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+CHROMA_WRITE_BATCH_SIZE = int(os.getenv("CHROMA_WRITE_BATCH_SIZE", "256"))
+
+_DONE = object()
+
+
+def hash_text(text: str) -> str:
+    """SHA-256 of a chunk's text, used as its content key."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def hash_file(path: str) -> str:
+    """SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_id(document_name: str, chunk_hash: str) -> str:
+    """Chroma ID of a chunk: scoped to its document so shared text is not cross-deleted."""
+    return f"{hashlib.sha256(document_name.encode('utf-8')).hexdigest()[:16]}-{chunk_hash}"
+
+
+def versioned_name(name: str, file_hash: str) -> str:
+    """Name a document is tracked under when its own name is taken by a different file."""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}-{file_hash[:8]}{ext}"
+
+
+# Uploads are saved as "<uuid>_<filename>" before they are parsed
+_UPLOAD_PREFIX = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}_")
+
+
+def legacy_document_name(metadata: Optional[dict]) -> str:
+    """Document name of a chunk indexed before chunks were keyed by content (from its source path)."""
+    source = (metadata or {}).get("source") or "unknown.pdf"
+    return _UPLOAD_PREFIX.sub("", os.path.basename(source))
+
+
+def load_and_split_pdf(pdf_file: str) -> Tuple[int, List[Document]]:
+    """Parse one PDF and split it into chunks (runs in a worker process).
+
+    Returns
+    -------
+    tuple
+        Number of pages and the chunk documents.
+    """
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE,
+        chunk_overlap=CHUNK_OVERLAP,
+        separators=SEPARATORS,
+    )
+    pages = PyPDFLoader(pdf_file).load()
+    return len(pages), text_splitter.split_documents(pages)
+
+
+@dataclass
+class IngestionProgress:
+    """Counters for one ingestion run, safe to read from other threads."""
+
+    files_total: int = 0
+    files_parsed: int = 0
+    files_failed: int = 0
+    files_unchanged: int = 0
+    pages_parsed: int = 0
+    chunks_queued: int = 0
+    chunks_unchanged: int = 0
+    chunks_embedded: int = 0
+    chunks_written: int = 0
+    chunks_deleted: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+    errors: Dict[str, str] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, **counts: int):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def fail(self, path: str, error: BaseException):
+        """Record a file that could not be ingested."""
+        print(f"  - Failed to process {path}: {error}")
+        with self._lock:
+            self.errors[path] = str(error)
+            self.files_failed += 1
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    @property
+    def pages_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.pages_parsed / elapsed if elapsed > 0 else 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "files_total": self.files_total,
+                "files_parsed": self.files_parsed,
+                "files_failed": self.files_failed,
+                "files_unchanged": self.files_unchanged,
+                "pages_parsed": self.pages_parsed,
+                "chunks_queued": self.chunks_queued,
+                "chunks_unchanged": self.chunks_unchanged,
+                "chunks_embedded": self.chunks_embedded,
+                "chunks_written": self.chunks_written,
+                "chunks_deleted": self.chunks_deleted,
+                "elapsed_seconds": round(self.elapsed_seconds, 2),
+                "pages_per_second": round(self.pages_per_second, 2),
+            }
+
+
+class IngestionError(RuntimeError):
+    """Raised after a run in which some PDFs could not be parsed."""
+
+    def __init__(self, errors: Dict[str, str]):
+        self.errors = errors
+        super().__init__(
+            f"Failed to process {len(errors)} file(s): "
+            + "; ".join(f"{path}: {message}" for path, message in errors.items())
+        )
+
+
+@dataclass
+class DocumentManifest:
+    """What is indexed for one document: its file hash and chunk hashes."""
+
+    name: str
+    file_hash: Optional[str]
+    chunk_hashes: List[str]
+    page_count: int = 0
+    file_size: int = 0
+
+
+class ChunkManifestStore:
+    """Chunk-hash manifests per document, recorded on the Document table.
+
+    When the database is unavailable, the manifest of a document is rebuilt
+    from the chunk metadata stored in Chroma instead. Such manifests carry no
+    file hash, so without the database documents are matched by name alone.
+    """
+
+    def __init__(self, vector_store: Chroma):
+        self.vector_store = vector_store
+        self.use_database = DATABASE_AVAILABLE
+        if self.use_database:
+            try:
+                create_tables()
+            except Exception as e:
+                print(f"Warning: chunk manifests not stored in the database: {e}")
+                self.use_database = False
+
+    def load(self, name: str) -> Optional[DocumentManifest]:
+        if self.use_database:
+            try:
+                with SessionLocal() as session:
+                    record = session.query(DocumentRecord).filter_by(filename=name).first()
+                    if record is not None and record.chunk_hashes is not None:
+                        return DocumentManifest(name, record.content_hash, list(record.chunk_hashes))
+            except Exception as e:
+                print(f"Warning: could not read manifest for {name}: {e}")
+
+        result = self.vector_store._collection.get(where={"document": name}, include=["metadatas"])
+        hashes = [metadata["chunk_hash"] for metadata in result["metadatas"] if metadata and "chunk_hash" in metadata]
+        return DocumentManifest(name, None, hashes) if hashes else None
+
+    def find_by_hash(self, file_hash: str) -> Optional[DocumentManifest]:
+        """The indexed document with exactly this file content, if any (needs the database)."""
+        if not self.use_database:
+            return None
+        try:
+            with SessionLocal() as session:
+                record = session.query(DocumentRecord).filter_by(content_hash=file_hash).first()
+                if record is not None and record.chunk_hashes is not None:
+                    return DocumentManifest(record.filename, record.content_hash, list(record.chunk_hashes))
+        except Exception as e:
+            print(f"Warning: could not look up file hash {file_hash}: {e}")
+        return None
+
+    def save(self, manifest: DocumentManifest):
+        if not self.use_database:
+            return
+        with SessionLocal() as session:
+            record = session.query(DocumentRecord).filter_by(filename=manifest.name).first()
+            if record is None:
+                record = DocumentRecord(filename=manifest.name, title=os.path.splitext(manifest.name)[0],
+                                        content_type="application/pdf")
+                session.add(record)
+            record.file_size = manifest.file_size
+            record.processed_date = datetime.utcnow()
+            record.chunk_count = len(manifest.chunk_hashes)
+            record.status = "processed"
+            record.error_message = None
+            record.doc_metadata = {"pages": manifest.page_count}
+            record.content_hash = manifest.file_hash
+            record.chunk_hashes = manifest.chunk_hashes
+            session.commit()
+
 
 class MedicalDocumentProcessor:
-    """Load PDFs, split them into chunks, embed and store in ChromaDB."""
+    """Load PDFs, split them into chunks, embed and store in ChromaDB.
+
+    Ingestion is a streaming pipeline:
+
+    1. a process pool parses and splits PDFs in parallel,
+    2. chunks flow through a bounded queue (parsing pauses while it is full),
+    3. chunks are embedded in fixed-size batches,
+    4. a writer thread upserts the vectors into Chroma in batches.
 
-    def __init__(self, persist_directory: str = None):
+    Only a bounded number of chunks is in memory at any time. Chunks are keyed
+    by the SHA-256 of their text, and documents by name plus file hash: a file
+    whose content is already indexed is skipped, and a different file under a
+    name that is already taken is indexed as its own document (see
+    ``versioned_name``). Only with ``replace=True`` is a file a new version of
+    the document with its name: then only chunks missing from the manifest
+    are embedded and chunks that vanished from it are deleted.
+
+    Chunks indexed before chunks were keyed by content (random IDs, no hash
+    metadata) are re-keyed once when the processor starts, so they are reused
+    rather than duplicated on re-ingest.
+    """
+
+    def __init__(self, persist_directory: str = None, max_workers: Optional[int] = None,
+                 queue_size: int = INGEST_QUEUE_SIZE, embed_batch_size: int = EMBED_BATCH_SIZE,
+                 write_batch_size: int = CHROMA_WRITE_BATCH_SIZE):
         # Use environment variable or default
         if persist_directory is None:
             persist_directory = os.getenv("CHROMA_PERSIST_DIRECTORY", "./medical_vector_db")
-        
+
         embedding_model = os.getenv("EMBEDDING_MODEL", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
-        
+
         self.embeddings = CustomSentenceTransformerEmbeddings(embedding_model)
         self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=512,
-            chunk_overlap=50,
-            separators=["\n\n", "\n", ".", "!", "?", ",", " ", ""],
+            chunk_size=CHUNK_SIZE,
+            chunk_overlap=CHUNK_OVERLAP,
+            separators=SEPARATORS,
         )
         self.vector_store = Chroma(
-            embedding_function=self.embeddings, 
+            embedding_function=self.embeddings,
             persist_directory=persist_directory
         )
 
-    def process_documents(self, pdf_files: List[str]) -> int:
+        self.max_workers = max_workers or INGEST_WORKERS
+        self.queue_size = queue_size
+        self.embed_batch_size = embed_batch_size
+        self.write_batch_size = write_batch_size
+        self.manifests = ChunkManifestStore(self.vector_store)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.last_progress: Optional[IngestionProgress] = None
+        self._migrated_marker = os.path.join(persist_directory, ".chunks_keyed_by_content")
+        if not os.path.exists(self._migrated_marker):
+            self.migrate_legacy_chunks()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # Created lazily and reused across runs; "spawn" keeps the embedding
+        # model and its threads out of the worker processes.
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=get_context("spawn"))
+        return self._pool
+
+    def migrate_legacy_chunks(self, batch_size: int = 1000) -> int:
+        """Re-key chunks stored under random IDs by document name and content hash.
+
+        Their vectors are kept (nothing is re-embedded); repeated texts within
+        a document collapse into one chunk. Returns the number of legacy
+        chunks migrated.
+        """
+        collection = self.vector_store._collection
+        legacy_ids: List[str] = []
+        offset = 0
+        while True:
+            page = collection.get(include=["metadatas"], limit=batch_size, offset=offset)
+            if not page["ids"]:
+                break
+            legacy_ids.extend(
+                chunk for chunk, metadata in zip(page["ids"], page["metadatas"])
+                if not metadata or "chunk_hash" not in metadata
+            )
+            offset += len(page["ids"])
+
+        for start in range(0, len(legacy_ids), batch_size):
+            old_ids = legacy_ids[start:start + batch_size]
+            page = collection.get(ids=old_ids, include=["metadatas", "documents", "embeddings"])
+            rekeyed: Dict[str, Tuple[List[float], str, dict]] = {}
+            for text, vector, metadata in zip(page["documents"], page["embeddings"], page["metadatas"]):
+                name = legacy_document_name(metadata)
+                chunk_hash = hash_text(text)
+                rekeyed[chunk_id(name, chunk_hash)] = (
+                    list(vector), text, {**(metadata or {}), "document": name, "chunk_hash": chunk_hash}
+                )
+            if rekeyed:
+                vectors, texts, metadatas = (list(column) for column in zip(*rekeyed.values()))
+                collection.upsert(ids=list(rekeyed), embeddings=vectors, documents=texts, metadatas=metadatas)
+            collection.delete(ids=[chunk for chunk in page["ids"] if chunk not in rekeyed])
+
+        if legacy_ids:
+            print(f"Re-keyed {len(legacy_ids)} chunks indexed before content hashing")
+        try:
+            os.makedirs(os.path.dirname(self._migrated_marker) or ".", exist_ok=True)
+            with open(self._migrated_marker, "w") as f:
+                f.write(datetime.utcnow().isoformat())
+        except OSError as e:
+            print(f"Warning: could not record the chunk migration: {e}")
+        return len(legacy_ids)
+
+    def close(self):
+        """Shut down the parser process pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    # ===== PIPELINE STAGES =====
+
+    def _diff_chunks(self, name: str, split_docs: List[Document],
+                     previous: Optional[DocumentManifest]) -> Tuple[List[Document], List[str], Set[str]]:
+        """Split a parsed document into chunks to embed, its new manifest and vanished hashes."""
+        indexed = set(previous.chunk_hashes) if previous else set()
+        chunk_hashes: List[str] = []
+        seen: Set[str] = set()
+        to_embed: List[Document] = []
+        for doc in split_docs:
+            chunk_hash = hash_text(doc.page_content)
+            if chunk_hash in seen:
+                continue
+            seen.add(chunk_hash)
+            chunk_hashes.append(chunk_hash)
+            if chunk_hash not in indexed:
+                doc.metadata = {**doc.metadata, "document": name, "chunk_hash": chunk_hash}
+                to_embed.append(doc)
+        return to_embed, chunk_hashes, indexed - seen
+
+    def _resolve_document(self, pdf_file: str, name: str, file_hash: str, replace: bool,
+                          claimed: Dict[str, str]) -> Tuple[Optional[str], Optional[DocumentManifest]]:
+        """The name to index a file under and the manifest to diff it against (no name: already indexed).
+
+        ``claimed`` maps names taken earlier in this run to their file hash.
+        """
+        indexed = self.manifests.find_by_hash(file_hash)
+        if indexed is None and claimed.get(name) == file_hash:
+            indexed = DocumentManifest(name, file_hash, [])  # Same file twice in one run
+        if indexed is not None and (indexed.name == name or not replace):
+            print(f"Unchanged: {pdf_file}" if indexed.name == name else
+                  f"Already indexed as {indexed.name}: {pdf_file}")
+            return None, indexed
+        previous = self.manifests.load(name)
+        # A manifest without a file hash predates hashing (or there is no
+        # database); the file is taken as its new version
+        taken = name in claimed or (previous is not None and previous.file_hash is not None and not replace)
+        if taken:
+            name = versioned_name(name, file_hash)
+            print(f"Name taken by a different file, indexing {pdf_file} as {name}")
+            previous = self.manifests.load(name)
+        claimed[name] = file_hash
+        return name, previous
+
+    def _parse_stage(self, pdf_files: List[str], names: List[str], replace: bool, chunks: "queue.Queue",
+                     progress: IngestionProgress, updates: List[Tuple[DocumentManifest, Set[str]]],
+                     stop: threading.Event, errors: List[BaseException]):
+        """Submit new or changed PDFs to the process pool and feed their new chunks into the queue.
+
+        Files that cannot be read or parsed are recorded in ``progress``; any
+        other error stops the stage and is handed to the caller in ``errors``.
+        """
+        pool = self._get_pool()
+        # At most two PDFs per worker are parsed ahead of the embedding stage
+        max_in_flight = self.max_workers * 2
+        pending: Dict[Future, Tuple[str, str, str, Optional[DocumentManifest]]] = {}
+        remaining = iter(zip(pdf_files, names))
+        claimed: Dict[str, str] = {}
+        try:
+            while not stop.is_set():
+                for pdf_file, name in remaining:
+                    try:
+                        file_hash = hash_file(pdf_file)
+                    except OSError as e:
+                        progress.fail(pdf_file, e)
+                        continue
+                    name, previous = self._resolve_document(pdf_file, name, file_hash, replace, claimed)
+                    if name is None:
+                        progress.add(files_unchanged=1, chunks_unchanged=len(previous.chunk_hashes))
+                        continue
+                    future = pool.submit(load_and_split_pdf, pdf_file)
+                    pending[future] = (pdf_file, name, file_hash, previous)
+                    if len(pending) >= max_in_flight:
+                        break
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pdf_file, name, file_hash, previous = pending.pop(future)
+                    try:
+                        page_count, split_docs = future.result()
+                        file_size = os.path.getsize(pdf_file)
+                    except Exception as e:
+                        progress.fail(pdf_file, e)
+                        continue
+                    to_embed, chunk_hashes, vanished = self._diff_chunks(name, split_docs, previous)
+                    print(f"Processed: {pdf_file} ({page_count} pages, {len(chunk_hashes)} chunks, "
+                          f"{len(to_embed)} new, {len(vanished)} removed)")
+                    progress.add(files_parsed=1, pages_parsed=page_count,
+                                 chunks_unchanged=len(chunk_hashes) - len(to_embed))
+                    updates.append((
+                        DocumentManifest(name, file_hash, chunk_hashes, page_count, file_size),
+                        vanished,
+                    ))
+                    for doc in to_embed:
+                        # Blocks while the queue is full: backpressure on parsing
+                        while not stop.is_set():
+                            try:
+                                chunks.put(doc, timeout=0.5)
+                                break
+                            except queue.Full:
+                                continue
+                    progress.add(chunks_queued=len(to_embed))
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            for future in pending:
+                future.cancel()
+            chunks.put(_DONE)
+
+    def _write_stage(self, batches: "queue.Queue", progress: IngestionProgress, errors: List[BaseException]):
+        """Upsert embedded batches into Chroma (IDs are content hashes, so retries are idempotent)."""
+        while True:
+            batch = batches.get()
+            if batch is _DONE:
+                return
+            if errors:
+                continue  # Drain so the embedding stage never blocks after a failure
+            ids, vectors, texts, metadatas = batch
+            try:
+                self.vector_store._collection.upsert(
+                    ids=ids, embeddings=vectors, documents=texts, metadatas=metadatas
+                )
+                progress.add(chunks_written=len(ids))
+            except BaseException as e:
+                errors.append(e)
+
+    def _apply_updates(self, updates: List[Tuple[DocumentManifest, Set[str]]], progress: IngestionProgress):
+        """Delete vanished chunks and record the new manifests once their chunks are written."""
+        for manifest, vanished in updates:
+            if vanished:
+                self.vector_store._collection.delete(ids=[chunk_id(manifest.name, h) for h in vanished])
+                progress.add(chunks_deleted=len(vanished))
+            self.manifests.save(manifest)
+
+    def process_documents(self, pdf_files: List[str],
+                          progress_callback: Optional[Callable[[Dict[str, float]], None]] = None,
+                          document_names: Optional[List[str]] = None, replace: bool = False) -> int:
         """Ingest the list of PDF file paths into the vector store.
 
+        Parameters
+        ----------
+        pdf_files:
+            Paths of the PDFs to ingest.
+        progress_callback:
+            Called with a progress snapshot after every written batch.
+        document_names:
+            Names the documents are tracked under (defaults to the file names).
+            A different file under a name that is already taken is tracked
+            under ``versioned_name`` instead, unless ``replace`` is set.
+        replace:
+            Treat each file as the new version of the document with its name:
+            only its new or changed chunks are embedded and vanished ones deleted.
+
         Returns
         -------
         int
-            Total number of chunks indexed.
+            Number of chunks embedded and written (unchanged chunks are not counted).
         """
-        documents = []
-        for pdf_file in pdf_files:
-            print(f"Processing: {pdf_file}")
-            loader = PyPDFLoader(pdf_file)
-            docs = loader.load()
-            split_docs = self.text_splitter.split_documents(docs)
-            documents.extend(split_docs)
-            print(f"  - Added {len(split_docs)} chunks")
-
-        if documents:
-            self.vector_store.add_documents(documents)
-            print(f"Total chunks indexed: {len(documents)}")
-        return len(documents) 
\ No newline at end of file
+        progress = IngestionProgress(files_total=len(pdf_files))
+        self.last_progress = progress
+        if not pdf_files:
+            return 0
+        names = document_names or [os.path.basename(pdf_file) for pdf_file in pdf_files]
+        updates: List[Tuple[DocumentManifest, Set[str]]] = []
+
+        chunks: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        # Room for a couple of write batches so embedding overlaps with the Chroma writes
+        batches: "queue.Queue" = queue.Queue(
+            maxsize=max(2, 2 * self.write_batch_size // self.embed_batch_size)
+        )
+        stop = threading.Event()
+        parse_errors: List[BaseException] = []
+        write_errors: List[BaseException] = []
+
+        parser = threading.Thread(
+            target=self._parse_stage,
+            args=(pdf_files, names, replace, chunks, progress, updates, stop, parse_errors),
+            daemon=True
+        )
+        writer = threading.Thread(
+            target=self._write_stage, args=(batches, progress, write_errors), daemon=True
+        )
+        parser.start()
+        writer.start()
+
+        pending_write: List[Tuple[str, List[float], str, dict]] = []
+
+        def flush_writes():
+            if pending_write:
+                ids, vectors, texts, metadatas = (list(column) for column in zip(*pending_write))
+                batches.put((ids, vectors, texts, metadatas))
+                pending_write.clear()
+                if progress_callback is not None:
+                    progress_callback(progress.snapshot())
+
+        def embed(batch: List[Document]):
+            vectors = self.embeddings.embed_documents([doc.page_content for doc in batch])
+            progress.add(chunks_embedded=len(batch))
+            for doc, vector in zip(batch, vectors):
+                chunk_key = chunk_id(doc.metadata["document"], doc.metadata["chunk_hash"])
+                pending_write.append((chunk_key, vector, doc.page_content, doc.metadata))
+            if len(pending_write) >= self.write_batch_size:
+                flush_writes()
+
+        try:
+            batch: List[Document] = []
+            while True:
+                doc = chunks.get()
+                if doc is _DONE:
+                    break
+                batch.append(doc)
+                if len(batch) >= self.embed_batch_size:
+                    embed(batch)
+                    batch = []
+                if write_errors:
+                    raise write_errors[0]
+            if parse_errors:
+                raise parse_errors[0]
+            if batch:
+                embed(batch)
+            flush_writes()
+        finally:
+            stop.set()
+            # Unblock the parser if it is waiting on a full queue
+            while parser.is_alive():
+                try:
+                    chunks.get_nowait()
+                except queue.Empty:
+                    parser.join(timeout=0.1)
+            batches.put(_DONE)
+            writer.join()
+
+        if write_errors:
+            raise write_errors[0]
+        self._apply_updates(updates, progress)
+
+        stats = progress.snapshot()
+        print(f"Total chunks indexed: {progress.chunks_written} "
+              f"({stats['chunks_unchanged']} unchanged, {stats['chunks_deleted']} removed; "
+              f"{stats['pages_parsed']} pages in {stats['elapsed_seconds']}s, "
+              f"{stats['pages_per_second']} pages/sec)")
+        if progress.errors:
+            raise IngestionError(progress.errors)
+        return progress.chunks_written
@@ -3,7 +3,7 @@
 import os
 from typing import Generator
 # External dependencies (may lack type stubs)
-from sqlalchemy import create_engine, text  # type: ignore
+from sqlalchemy import create_engine, inspect, text  # type: ignore
 from sqlalchemy.orm import sessionmaker, Session  # type: ignore
 from sqlalchemy.pool import StaticPool  # type: ignore
 
@@ -47,9 +47,30 @@ else:
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+# Columns added to existing tables after their first release: table -> {column: DDL type}
+ADDED_COLUMNS = {
+    "documents": {"content_hash": "VARCHAR(64)", "chunk_hashes": "JSON"},
+}
+
+
+def migrate_added_columns(bind=None):
+    """Add columns introduced after a table was first created (create_all never alters tables)."""
+    bind = bind or engine
+    inspector = inspect(bind)
+    with bind.begin() as connection:
+        for table, columns in ADDED_COLUMNS.items():
+            if not inspector.has_table(table):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table)}
+            for column, ddl_type in columns.items():
+                if column not in existing:
+                    connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+
+
 def create_tables():
     """Create all database tables."""
     Base.metadata.create_all(bind=engine)
+    migrate_added_columns(engine)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -71,6 +92,7 @@ class DatabaseManager:
     def create_tables(self):
         """Create all database tables."""
         Base.metadata.create_all(bind=self.engine)
+        migrate_added_columns(self.engine)
     
     def drop_tables(self):
         """Drop all database tables."""
@@ -1,7 +1,7 @@
 """Database models for medical AI assistant."""
 
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, Boolean, Text, ForeignKey
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -26,6 +26,10 @@ class Document(Base):
     error_message = Column(Text)
     doc_metadata = Column(JSON)
     
+    # Incremental indexing
+    content_hash = Column(String(64), index=True)  # SHA-256 of the source file
+    chunk_hashes = Column(JSON)  # Manifest: SHA-256 of every indexed chunk, in document order
+    
     # Relationships
     query_logs = relationship("QueryLog", back_populates="document")
 
@@ -133,6 +137,8 @@ class DocumentResponse(BaseModel):
     status: str
     error_message: Optional[str]
     doc_metadata: Optional[Dict[str, Any]]
+    content_hash: Optional[str] = None
+    chunk_hashes: Optional[List[str]] = None
     
     class Config:
         from_attributes = True
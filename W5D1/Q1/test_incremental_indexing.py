@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Tests for content-hash deduplication and incremental re-indexing of documents.
+
+Runs against a real (temporary) ChromaDB and SQLite manifest table, with a
+fake embedding model and plain-text "PDFs" (pages separated by form feeds).
+"""
+
+import hashlib
+import os
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from langchain_core.documents import Document
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.core import document_processor
+from src.core.document_processor import MedicalDocumentProcessor, versioned_name
+from src.database.models import Base, Document as DocumentRecord
+
+
+class FakeEmbeddings:
+    """Deterministic embeddings that count how many texts were embedded."""
+
+    embedded = 0
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def embed_documents(self, texts):
+        FakeEmbeddings.embedded += len(texts)
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [byte / 255 for byte in digest[:8]]
+
+
+def fake_load_and_split_pdf(pdf_file):
+    pages = Path(pdf_file).read_text().split("\f")
+    return len(pages), [
+        Document(page_content=page, metadata={"source": pdf_file, "page": i}) for i, page in enumerate(pages)
+    ]
+
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'manifests.db'}")
+    monkeypatch.setattr(document_processor, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(document_processor, "create_tables", lambda: Base.metadata.create_all(bind=engine))
+    monkeypatch.setattr(document_processor, "CustomSentenceTransformerEmbeddings", FakeEmbeddings)
+    monkeypatch.setattr(document_processor, "load_and_split_pdf", fake_load_and_split_pdf)
+    FakeEmbeddings.embedded = 0
+
+    def make():
+        proc = MedicalDocumentProcessor(persist_directory=str(tmp_path / "chroma"), embed_batch_size=2,
+                                        write_batch_size=2)
+        # Threads instead of spawned processes so the fake parser is used
+        proc._pool = ThreadPoolExecutor(max_workers=2)
+        made.append(proc)
+        return proc
+
+    made = []
+    yield make
+    for proc in made:
+        proc.close()
+
+
+def write_pdf(directory, name, *pages):
+    path = directory / uuid.uuid4().hex / name
+    path.parent.mkdir()
+    path.write_text("\f".join(pages))
+    return str(path)
+
+
+def chunk_texts(proc, document):
+    result = proc.vector_store._collection.get(where={"document": document}, include=["documents"])
+    return sorted(result["documents"])
+
+
+def test_unchanged_file_is_skipped(processor, tmp_path):
+    proc = processor()
+    pdf = write_pdf(tmp_path, "guide.pdf", "intro", "dosage", "side effects")
+
+    assert proc.process_documents([pdf]) == 3
+    assert proc.process_documents([pdf]) == 0
+    assert proc.last_progress.files_unchanged == 1
+    assert FakeEmbeddings.embedded == 3
+
+
+def test_replace_embeds_only_changed_chunks(processor, tmp_path):
+    proc = processor()
+    proc.process_documents([write_pdf(tmp_path, "guide.pdf", "intro", "dosage", "side effects")])
+
+    edited = write_pdf(tmp_path, "guide.pdf", "intro", "dosage", "interactions")
+    assert proc.process_documents([edited], replace=True) == 1
+    assert proc.last_progress.chunks_deleted == 1
+    assert FakeEmbeddings.embedded == 4
+    assert chunk_texts(proc, "guide.pdf") == ["dosage", "interactions", "intro"]
+
+
+def test_different_file_under_taken_name_is_kept_separately(processor, tmp_path):
+    proc = processor()
+    first = write_pdf(tmp_path, "report.pdf", "cardiology", "shared page")
+    other = write_pdf(tmp_path, "report.pdf", "oncology", "shared page")
+    proc.process_documents([first])
+
+    assert proc.process_documents([other]) == 2
+    other_name = versioned_name("report.pdf", document_processor.hash_file(other))
+    assert chunk_texts(proc, "report.pdf") == ["cardiology", "shared page"]
+    assert chunk_texts(proc, other_name) == ["oncology", "shared page"]
+
+    with document_processor.SessionLocal() as session:
+        assert sorted(r.filename for r in session.query(DocumentRecord)) == sorted(["report.pdf", other_name])
+
+
+def test_same_content_under_another_name_is_not_reindexed(processor, tmp_path):
+    proc = processor()
+    proc.process_documents([write_pdf(tmp_path, "a.pdf", "one", "two")])
+
+    assert proc.process_documents([write_pdf(tmp_path, "copy-of-a.pdf", "one", "two")]) == 0
+    assert proc.last_progress.files_unchanged == 1
+    assert chunk_texts(proc, "copy-of-a.pdf") == []
+
+
+def test_two_files_with_one_name_in_a_run(processor, tmp_path):
+    proc = processor()
+    first = write_pdf(tmp_path, "notes.pdf", "alpha")
+    second = write_pdf(tmp_path, "notes.pdf", "beta")
+
+    assert proc.process_documents([first, second]) == 2
+    assert chunk_texts(proc, "notes.pdf") == ["alpha"]
+    assert chunk_texts(proc, versioned_name("notes.pdf", document_processor.hash_file(second))) == ["beta"]
+
+
+def test_legacy_chunks_are_rekeyed_and_reused(processor, tmp_path):
+    proc = processor()
+    collection = proc.vector_store._collection
+    legacy_texts = ["intro", "dosage", "dosage"]
+    collection.add(
+        ids=[str(uuid.uuid4()) for _ in legacy_texts],
+        embeddings=[FakeEmbeddings("legacy").embed_query(text) for text in legacy_texts],
+        documents=legacy_texts,
+        metadatas=[{"source": f"/tmp/{uuid.uuid4()}_guide.pdf", "page": i} for i in range(3)],
+    )
+
+    # A store written before chunks were keyed by content has no marker
+    os.remove(proc._migrated_marker)
+    proc = processor()
+    assert chunk_texts(proc, "guide.pdf") == ["dosage", "intro"]
+    assert collection.count() == 2
+    assert proc.migrate_legacy_chunks() == 0
+
+    # Re-uploading the document reuses the migrated chunks
+    assert proc.process_documents([write_pdf(tmp_path, "guide.pdf", "intro", "dosage", "warnings")]) == 1
+    assert FakeEmbeddings.embedded == 1
+    assert chunk_texts(proc, "guide.pdf") == ["dosage", "intro", "warnings"]
+
+
+def test_unreadable_file_is_recorded_and_the_rest_indexed(processor, tmp_path):
+    proc = processor()
+    missing = str(tmp_path / "missing.pdf")
+    present = write_pdf(tmp_path, "present.pdf", "one", "two")
+
+    with pytest.raises(document_processor.IngestionError) as excinfo:
+        proc.process_documents([missing, present])
+    assert list(excinfo.value.errors) == [missing]
+    assert proc.last_progress.files_failed == 1
+    assert chunk_texts(proc, "present.pdf") == ["one", "two"]
+
+
+def test_unexpected_parse_stage_error_is_raised(processor, tmp_path, monkeypatch):
+    proc = processor()
+
+    def broken_lookup(file_hash):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(proc.manifests, "find_by_hash", broken_lookup)
+    with pytest.raises(RuntimeError, match="database is locked"):
+        proc.process_documents([write_pdf(tmp_path, "a.pdf", "one")])